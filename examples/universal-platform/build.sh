@@ -8,16 +8,16 @@ set -euo pipefail
 
 DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 OUT="${DIR}/data"
+CUE_EXPORT="${DIR}/../../tools/cue_export.py"
 
 mkdir -p "$OUT"
 
 cd "$DIR"
 
+# Tiers export in parallel through the shared cue export cache: a rebuild
+# with no .cue changes skips evaluation entirely.
 echo "Building tier data..."
-for tier in desktop node cluster enterprise; do
-    echo "  ${tier}..."
-    cue export ./ -e "${tier}" --out json > "${OUT}/${tier}.json"
-done
+python3 "$CUE_EXPORT" ./ -e desktop -e node -e cluster -e enterprise --out-dir "$OUT"
 
 echo ""
 echo "Done. $(ls "${OUT}"/*.json | wc -l) files in ${OUT}/"
@@ -25,4 +25,4 @@ ls -lh "${OUT}"/*.json
 
 echo ""
 echo "Topology (shared across all tiers):"
-cue export ./ -e desktop.vizData.metrics --out json
+python3 "$CUE_EXPORT" ./ -e desktop.vizData.metrics
@@ -11,6 +11,7 @@ is interpolated at runtime.
 Patterns:
   - Async subprocess with timeout for live execution
   - Append-only JSONL audit log
+  - Tier documents parsed once per file change, with derived indexes
 
 Usage:
   python3 serve.py                    # mock mode (default, safe)
@@ -28,7 +29,7 @@ from typing import AsyncIterator, Optional
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -72,6 +73,12 @@ class BatchRequest(BaseModel):
     commands: list[BatchItem] = []
 
 
+class CabBatchRequest(BaseModel):
+    tier: str = "desktop"
+    changes: list[str] = []
+    include_resources: bool = False
+
+
 # ── Helpers ─────────────────────────────────────────────────────────
 
 def _validate_tier(tier: str) -> None:
@@ -151,17 +158,149 @@ def _append_log(entry: dict) -> None:
         log.error("Failed to write log: %s", exc)
 
 
-def _read_tier_json(tier: str) -> dict:
-    """Read and parse a tier's JSON data file."""
-    _validate_tier(tier)
-    path = DATA / f"{tier}.json"
-    if not path.exists():
-        raise HTTPException(404, f"Tier '{tier}' not found")
-    try:
-        return json.loads(path.read_text())
-    except json.JSONDecodeError as exc:
-        log.error("Corrupt tier data %s: %s", path, exc)
-        raise HTTPException(500, f"Corrupt data for tier '{tier}'")
+# ── Tier cache ──────────────────────────────────────────────────────
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class TierData:
+    """One parsed tier document plus the indexes the read endpoints use.
+
+    Everything a read endpoint returns is derived here, once per load:
+    pre-serialized /api/tier and /api/tier/{tier}/commands bodies, one
+    /api/impact body per resource, blast-radius bitsets for CAB checks,
+    the SPOF name set and the risk ranking by affected_count.
+
+    Blast radii are Python ints used as bitsets over a per-tier resource
+    ordinal (names in sorted order), so overlaps are one AND and counts
+    one popcount, each a word-at-a-time loop in C.
+    """
+
+    def __init__(self, tier: str, raw: bytes, stamp: tuple[int, int]) -> None:
+        data = json.loads(raw)
+        self.stamp = stamp
+        self.body = raw
+        self.commands_body = _json_bytes({"tier": tier, "commands": data.get("commands", {})})
+
+        impact_data = data.get("impact", {})
+        spof_data = data.get("spof", [])
+        self.spof_names = frozenset(s["name"] for s in spof_data)
+        self.spof_count = len(spof_data)
+        self.names = sorted(set(impact_data).union(
+            *(entry.get("affected", {}) for entry in impact_data.values())))
+        ordinal = {name: i for i, name in enumerate(self.names)}
+        self.blast: dict[str, int] = {}
+        self.impact_body: dict[str, bytes] = {}
+        self.summary: dict[str, dict] = {}
+        ranked = []
+        for name, entry in impact_data.items():
+            affected = list(entry.get("affected", {}).keys())
+            bits = 0
+            for a in affected:
+                bits |= 1 << ordinal[a]
+            self.blast[name] = bits
+            self.impact_body[name] = _json_bytes({
+                "resource": name,
+                "tier": tier,
+                "depth": entry.get("depth", 0),
+                "impact": {
+                    "affected": affected,
+                    "affected_count": entry.get("affected_count", 0),
+                },
+                "ancestors": list(entry.get("ancestors", {}).keys()),
+                "ancestor_count": entry.get("ancestor_count", 0),
+            })
+            self.summary[name] = {
+                "affected_count": entry.get("affected_count", 0),
+                "depth": entry.get("depth", 0),
+            }
+            ranked.append({
+                "resource": name,
+                "affected_count": entry.get("affected_count", 0),
+                "ancestor_count": entry.get("ancestor_count", 0),
+                "depth": entry.get("depth", 0),
+                "is_spof": name in self.spof_names,
+            })
+        ranked.sort(key=lambda x: x["affected_count"], reverse=True)
+        self.ranked = ranked
+
+    def resource_names(self, bits: int) -> list[str]:
+        """Names of the set bits, in sorted order."""
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def cab_check(self, changes: list[str], include_resources: bool = True) -> dict:
+        """Overlap of the blast radii of simultaneous changes.
+
+        One AND and popcount per pair; the union and the conflicted set
+        (resources in two or more blast radii) are folded in one pass.
+        "conflict_degree" counts the other changes each change overlaps.
+        """
+        bits = [self.blast[name] for name in changes]
+        overlap_matrix = {}
+        degree = [0] * len(changes)
+        union = conflicted = 0
+        for i, a in enumerate(changes):
+            conflicted |= union & bits[i]
+            union |= bits[i]
+            for j in range(i + 1, len(changes)):
+                overlap = bits[i] & bits[j]
+                if overlap:
+                    cell = {"count": overlap.bit_count()}
+                    if include_resources:
+                        cell["resources"] = self.resource_names(overlap)
+                    overlap_matrix[f"{a} / {changes[j]}"] = cell
+                    degree[i] += 1
+                    degree[j] += 1
+        return {
+            "resources": {name: self.summary[name] for name in changes},
+            "overlap_matrix": overlap_matrix,
+            "conflicts": self.resource_names(conflicted),
+            "conflict_degree": dict(zip(changes, degree)),
+            "total_conflicted": conflicted.bit_count(),
+            "total_in_blast_radius": union.bit_count(),
+        }
+
+
+class TierCache:
+    """Tier documents loaded once and reloaded when the file changes.
+
+    Each lookup stats data/<tier>.json; a changed (mtime, size) pair or
+    a new file triggers a reparse, so `build.sh` output is picked up
+    without a restart. Requests otherwise never touch JSON parsing.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self._tiers: dict[str, TierData] = {}
+
+    def get(self, tier: str) -> TierData:
+        _validate_tier(tier)
+        path = self.data_dir / f"{tier}.json"
+        try:
+            st = path.stat()
+        except OSError:
+            self._tiers.pop(tier, None)
+            raise HTTPException(404, f"Tier '{tier}' not found")
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._tiers.get(tier)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        try:
+            loaded = TierData(tier, path.read_bytes(), stamp)
+        except OSError:
+            raise HTTPException(404, f"Tier '{tier}' not found")
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError,
+                KeyError, TypeError) as exc:
+            log.error("Corrupt tier data %s: %s", path, exc)
+            raise HTTPException(500, f"Corrupt data for tier '{tier}'")
+        self._tiers[tier] = loaded
+        return loaded
 
 
 # ── App factory ─────────────────────────────────────────────────────
@@ -169,6 +308,7 @@ def _read_tier_json(tier: str) -> dict:
 def create_app(live: bool = False) -> FastAPI:
     mode = "live" if live else "mock"
     allowlist = _build_allowlist()
+    tiers = TierCache(DATA)
 
     app = FastAPI(
         title="Universal Platform Demo",
@@ -202,13 +342,12 @@ def create_app(live: bool = False) -> FastAPI:
     @app.get("/api/tier/{tier}")
     async def get_tier(tier: str):
         """Return full tier JSON (vizData + commands + analysis)."""
-        return _read_tier_json(tier)
+        return Response(tiers.get(tier).body, media_type="application/json")
 
     @app.get("/api/tier/{tier}/commands")
     async def tier_commands(tier: str):
         """List all compile-time resolved commands for a tier."""
-        data = _read_tier_json(tier)
-        return {"tier": tier, "commands": data.get("commands", {})}
+        return Response(tiers.get(tier).commands_body, media_type="application/json")
 
     @app.get("/api/impact/{resource}")
     async def impact(resource: str, tier: str = "desktop"):
@@ -216,23 +355,10 @@ def create_app(live: bool = False) -> FastAPI:
 
         Returns blast radius, ancestors, and depth from pre-computed closure.
         """
-        _validate_tier(tier)
-        data = _read_tier_json(tier)
-        impact_data = data.get("impact", {})
-        if resource not in impact_data:
+        body = tiers.get(tier).impact_body.get(resource)
+        if body is None:
             raise HTTPException(404, f"Resource '{resource}' not found in {tier}")
-        entry = impact_data[resource]
-        return {
-            "resource": resource,
-            "tier": tier,
-            "depth": entry.get("depth", 0),
-            "impact": {
-                "affected": list(entry.get("affected", {}).keys()),
-                "affected_count": entry.get("affected_count", 0),
-            },
-            "ancestors": list(entry.get("ancestors", {}).keys()),
-            "ancestor_count": entry.get("ancestor_count", 0),
-        }
+        return Response(body, media_type="application/json")
 
     @app.get("/api/cab-check")
     async def cab_check(r: list[str] = Query(default=[]), tier: str = "desktop"):
@@ -243,48 +369,44 @@ def create_app(live: bool = False) -> FastAPI:
         """
         if len(r) < 2:
             raise HTTPException(400, "Need at least 2 resources: ?r=X&r=Y")
-        _validate_tier(tier)
-        data = _read_tier_json(tier)
-        impact_data = data.get("impact", {})
+        data = tiers.get(tier)
 
         # Validate all resources exist
         for name in r:
-            if name not in impact_data:
+            if name not in data.blast:
                 raise HTTPException(404, f"Resource '{name}' not found in {tier}")
 
-        # Build blast radius per resource
-        resources_result = {}
-        blast_sets: dict[str, set[str]] = {}
-        for name in r:
-            entry = impact_data[name]
-            affected = set(entry.get("affected", {}).keys())
-            blast_sets[name] = affected
-            resources_result[name] = {
-                "affected_count": entry.get("affected_count", 0),
-                "depth": entry.get("depth", 0),
-            }
+        result = data.cab_check(r)
+        return {
+            "tier": tier,
+            "resources": result["resources"],
+            "overlap_matrix": result["overlap_matrix"],
+            "total_conflicted": result["total_conflicted"],
+            "total_in_blast_radius": result["total_in_blast_radius"],
+        }
 
-        # Overlap matrix
-        overlap_matrix = {}
-        conflicts = set()
-        for i, a in enumerate(r):
-            for b in r[i + 1 :]:
-                overlap = blast_sets[a] & blast_sets[b]
-                if overlap:
-                    overlap_matrix[f"{a} / {b}"] = {
-                        "count": len(overlap),
-                        "resources": sorted(overlap),
-                    }
-                    conflicts |= overlap
+    @app.post("/api/cab-check/batch")
+    async def cab_check_batch(body: CabBatchRequest):
+        """CAB conflict check for a full change set.
+
+        Expects: {"tier": "desktop", "changes": ["dns", "database", ...]}
+        Overlap cells carry counts only unless include_resources is set;
+        "conflicts" lists every resource in two or more blast radii and
+        "conflict_degree" how many other changes each change overlaps.
+        Duplicate changes are counted once.
+        """
+        changes = list(dict.fromkeys(body.changes))
+        if len(changes) < 2:
+            raise HTTPException(400, "Need at least 2 distinct changes")
+        data = tiers.get(body.tier)
+        missing = [name for name in changes if name not in data.blast]
+        if missing:
+            raise HTTPException(404, f"Resources not found in {body.tier}: {', '.join(missing)}")
 
         return {
-            "tier": tier,
-            "resources": resources_result,
-            "overlap_matrix": overlap_matrix,
-            "total_conflicted": len(conflicts),
-            "total_in_blast_radius": len(
-                set().union(*blast_sets.values())
-            ),
+            "tier": body.tier,
+            "change_count": len(changes),
+            **data.cab_check(changes, body.include_resources),
         }
 
     @app.get("/api/risk")
@@ -293,31 +415,14 @@ def create_app(live: bool = False) -> FastAPI:
 
         Sorted by affected_count descending.
         """
-        _validate_tier(tier)
-        data = _read_tier_json(tier)
-        impact_data = data.get("impact", {})
-        spof_data = data.get("spof", [])
-
-        # Build ranked list from impact data
-        ranked = []
-        spof_names = {s["name"] for s in spof_data}
-        for name, entry in impact_data.items():
-            ranked.append({
-                "resource": name,
-                "affected_count": entry.get("affected_count", 0),
-                "ancestor_count": entry.get("ancestor_count", 0),
-                "depth": entry.get("depth", 0),
-                "is_spof": name in spof_names,
-            })
-
-        ranked.sort(key=lambda x: x["affected_count"], reverse=True)
+        data = tiers.get(tier)
         limit = max(1, min(limit, 100))
 
         return {
             "tier": tier,
-            "total_resources": len(ranked),
-            "spof_count": len(spof_data),
-            "top_risk": ranked[:limit],
+            "total_resources": len(data.ranked),
+            "spof_count": data.spof_count,
+            "top_risk": data.ranked[:limit],
         }
 
     @app.get("/api/status")
@@ -285,6 +285,35 @@ cab_no=$(curl -sf "${BASE}/api/cab-check?r=cache&r=dns" 2>/dev/null)
 cab_no_count=$(echo "$cab_no" | python3 -c "import json,sys; print(json.load(sys.stdin)['total_conflicted'])" 2>/dev/null || echo "?")
 [ "$cab_no_count" = "0" ] && pass "cab-check cache+dns: 0 overlap" || fail "cab-check cache+dns: $cab_no_count"
 
+# Batch: dns+database+cache (cache repeated) on every tier — same topology,
+# so the same 5 conflicts and the same per-change degrees everywhere
+for tier in desktop node cluster enterprise; do
+    cab_batch=$(curl -sf -X POST "${BASE}/api/cab-check/batch" \
+        -H "Content-Type: application/json" \
+        -d "{\"tier\": \"${tier}\", \"changes\": [\"dns\", \"database\", \"cache\", \"cache\"]}" 2>/dev/null)
+    cab_batch_check=$(echo "$cab_batch" | python3 -c "
+import json, sys
+d = json.load(sys.stdin)
+errors = []
+if d['change_count'] != 3: errors.append(f'change_count={d[\"change_count\"]}')
+if d['conflicts'] != ['admin', 'api', 'frontend', 'monitoring', 'scheduler']: errors.append(f'conflicts={d[\"conflicts\"]}')
+if d['conflict_degree'] != {'dns': 1, 'database': 1, 'cache': 0}: errors.append(f'conflict_degree={d[\"conflict_degree\"]}')
+if d['overlap_matrix'] != {'dns / database': {'count': 5}}: errors.append(f'overlap_matrix={d[\"overlap_matrix\"]}')
+print('; '.join(errors) if errors else 'OK')
+" 2>/dev/null || echo "bad response")
+    [ "$cab_batch_check" = "OK" ] && pass "cab-check batch ${tier}: conflicts + degrees" || fail "cab-check batch ${tier}: $cab_batch_check"
+done
+
+# Batch: fewer than 2 distinct changes
+cab_batch_few=$(curl -s -o /dev/null -w "%{http_code}" -X POST "${BASE}/api/cab-check/batch" \
+    -H "Content-Type: application/json" -d '{"changes": ["dns", "dns"]}' 2>/dev/null)
+[ "$cab_batch_few" = "400" ] && pass "cab-check batch <2 distinct -> 400" || fail "cab-check batch few: $cab_batch_few"
+
+# Batch: unknown resource
+cab_batch_404=$(curl -s -o /dev/null -w "%{http_code}" -X POST "${BASE}/api/cab-check/batch" \
+    -H "Content-Type: application/json" -d '{"changes": ["dns", "nonexistent"]}' 2>/dev/null)
+[ "$cab_batch_404" = "404" ] && pass "cab-check batch unknown resource -> 404" || fail "cab-check batch unknown: $cab_batch_404"
+
 # ─── 16. Risk endpoint ───
 echo "16. Risk endpoint"
 risk_result=$(curl -sf "${BASE}/api/risk" 2>/dev/null)
@@ -17,12 +17,10 @@ BULK_TMP="/tmp/quicue-bulk-$$.json"
 
 cd "$ROOT_DIR"
 
-# Clean generated files — preserve hand-crafted HTML views (browse, graph, planner, explore)
-rm -f "$PUBLIC_DIR"/{plan.json,cluster-summary.json,.bound_commands.json,.build-stats.json}
-rm -f "$PUBLIC_DIR"/{notebook.ipynb,rundeck-jobs.yaml,deploy.sh,ops.json}
-rm -f "$PUBLIC_DIR"/{graph.jsonld,hydra.jsonld,interaction.json}
-rm -f "$PUBLIC_DIR"/index.html
-rm -rf "$PUBLIC_DIR"/wiki
+# No pre-clean: split_bulk.py only rewrites files whose content changed
+# and prunes wiki pages that are gone, so unchanged files keep their
+# mtimes. Hand-crafted HTML views (browse, graph, planner, explore) are
+# never touched.
 mkdir -p "$PUBLIC_DIR/wiki"
 
 GENERATED_AT=$(date -u +"%Y-%m-%d %H:%M UTC")
@@ -35,10 +33,12 @@ echo ""
 # ============================================================================
 echo "--- Exporting all data (single evaluation) ---"
 
-if ! cue export ./examples/datacenter/ -e _bulk --out json \
-    -t timestamp="$GENERATED_AT" > "$BULK_TMP" 2>&1; then
+# Cached by the package's transitive .cue inputs and the tags
+# (tools/cue_export.py), so a rebuild within the same minute with no
+# changes skips evaluation.
+if ! python3 tools/cue_export.py ./examples/datacenter/ -e _bulk \
+    -t timestamp="$GENERATED_AT" -o "$BULK_TMP"; then
     echo "ERROR: CUE export failed"
-    cat "$BULK_TMP"
     rm -f "$BULK_TMP"
     exit 1
 fi
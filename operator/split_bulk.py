@@ -5,12 +5,22 @@ One CUE evaluation produces all data as JSON. This script splits it
 into the individual files that operator/public/ expects, including
 YAML (rundeck) and text (deploy script, index HTML) conversions.
 
+Writes are incremental: a file whose content hash matches what is
+already on disk is left alone (mtime included), so rsync and CDN caches
+only see real changes. Changed files are written to a temporary name
+and renamed into place from a thread pool. Wiki pages that were written
+by the previous run but are no longer in wiki.files are removed; the
+list of generated files is kept in .split-manifest.json. Without that
+manifest, every file already under wiki/ counts as generated.
+
 Usage: python3 operator/split_bulk.py /tmp/bulk.json operator/public/
 """
 
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import yaml
@@ -18,15 +28,20 @@ try:
 except ImportError:
     HAS_YAML = False
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+from lib.syncdir import load_manifest, prune, write_atomic  # noqa: E402
+
+MANIFEST = ".split-manifest.json"
 
-def write_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
 
+def json_bytes(data):
+    return json.dumps(data, indent=2).encode("utf-8")
 
-def write_text(path, text):
-    with open(path, "w") as f:
-        f.write(text)
+
+def text_bytes(text):
+    return text.encode("utf-8")
 
 
 def json_to_yaml(data):
@@ -37,6 +52,47 @@ def json_to_yaml(data):
     return json.dumps(data, indent=2)
 
 
+def file_sha256(path):
+    """SHA-256 of the file at path, or None if it does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def sync_file(path, content, mode=None):
+    """Write content to path unless it is already there. Returns (sha, changed).
+
+    The new content goes to a temporary file in the same directory and is
+    renamed over path, so readers never see a partial file.
+    """
+    sha = hashlib.sha256(content).hexdigest()
+    if file_sha256(path) == sha:
+        if mode is not None and os.stat(path).st_mode & 0o777 != mode:
+            os.chmod(path, mode)
+        return sha, False
+    write_atomic(path, content, mode if mode is not None else 0o644)
+    return sha, True
+
+
+def existing_wiki_files(out_dir):
+    """Every file under out_dir/wiki, relative to out_dir.
+
+    Without a manifest (first run, or one written before manifests
+    existed) there is no record of what was generated, so everything
+    under wiki/ is treated as generated and pruned unless rewritten.
+    """
+    found = []
+    for root, _, files in os.walk(os.path.join(out_dir, "wiki")):
+        for name in files:
+            found.append(os.path.relpath(os.path.join(root, name), out_dir))
+    return found
+
+
 def main():
     if len(sys.argv) < 3:
         print(f"Usage: {sys.argv[0]} <bulk.json> <output_dir>", file=sys.stderr)
@@ -51,6 +107,9 @@ def main():
     os.makedirs(out_dir, exist_ok=True)
     os.makedirs(os.path.join(out_dir, "wiki"), exist_ok=True)
 
+    # relative path -> (bytes, mode or None)
+    outputs = {}
+
     # JSON files
     json_files = {
         "plan.json": bulk["plan"],
@@ -63,29 +122,43 @@ def main():
         "interaction.json": bulk["interaction"],
     }
     for fname, data in json_files.items():
-        write_json(os.path.join(out_dir, fname), data)
+        outputs[fname] = (json_bytes(data), None)
 
     # Rundeck: YAML
-    write_text(os.path.join(out_dir, "rundeck-jobs.yaml"),
-               json_to_yaml(bulk["rundeck"]))
+    outputs["rundeck-jobs.yaml"] = (text_bytes(json_to_yaml(bulk["rundeck"])), None)
 
     # Deploy script: text
-    script_path = os.path.join(out_dir, "deploy.sh")
-    write_text(script_path, bulk["script"])
-    os.chmod(script_path, 0o755)
+    outputs["deploy.sh"] = (text_bytes(bulk["script"]), 0o755)
 
     # Index page: HTML generated by CUE
-    write_text(os.path.join(out_dir, "index.html"), bulk["index_html"])
+    outputs["index.html"] = (text_bytes(bulk["index_html"]), None)
 
     # Build stats: computed by CUE, written for reference
-    write_json(os.path.join(out_dir, ".build-stats.json"), bulk["stats"])
+    outputs[".build-stats.json"] = (json_bytes(bulk["stats"]), None)
 
     # Wiki: extract nested file structure
     wiki_files = bulk.get("wiki", {}).get("files", {})
     for fpath, content in wiki_files.items():
-        full = os.path.join(out_dir, "wiki", fpath)
-        os.makedirs(os.path.dirname(full), exist_ok=True)
-        write_text(full, content)
+        outputs[os.path.join("wiki", fpath)] = (text_bytes(content), None)
+
+    def write(item):
+        rel, (content, mode) = item
+        return rel, sync_file(os.path.join(out_dir, rel), content, mode)
+
+    with ThreadPoolExecutor() as pool:
+        results = dict(pool.map(write, outputs.items()))
+
+    previous = load_manifest(os.path.join(out_dir, MANIFEST))
+    if previous is None:
+        previous = existing_wiki_files(out_dir)
+    stale = [rel for rel in previous
+             if rel not in outputs and rel.startswith("wiki" + os.sep)]
+    removed = prune(out_dir, stale, root=os.path.join(out_dir, "wiki"))
+
+    manifest = {rel: sha for rel, (sha, _) in sorted(results.items())}
+    sync_file(os.path.join(out_dir, MANIFEST), json_bytes(manifest))
+
+    changed = sum(1 for _, was_written in results.values() if was_written)
 
     # Print stats (from CUE-computed values)
     s = bulk["stats"]
@@ -98,6 +171,8 @@ def main():
     print(f"  Ops: {s['ops_tasks']} tasks ({s['ops_destructive']} destructive)")
     print(f"  JSON-LD: {s['jsonld_nodes']} resources")
     print(f"  Index: CUE-generated HTML")
+    print(f"  Files: {changed} changed, {len(results) - changed} unchanged, "
+          f"{removed} removed")
 
 
 if __name__ == "__main__":
@@ -35,11 +35,30 @@ class Settings(BaseSettings):
     # Deployment state
     deploy_log_path: Path = Path("/app/data/deploy.jsonl")
     deploy_lock_path: Path = Path("/app/data/deploy.lock.json")
+    deploy_index_enabled: bool = False  # SQLite mirror of the JSONL log
+    deploy_index_path: Path = Path("/app/data/deploy.sqlite")
+    stream_buffer_size: int = 256  # per-subscriber events before drop
+    stream_heartbeat: int = 15  # seconds between SSE keepalives
+    stream_replay_batch: int = 500  # log lines read per Last-Event-ID replay step
 
     # Execution
     ssh_key_path: Path = Path("/app/secrets/id_ed25519")
     default_timeout: int = 30
     admin_timeout: int = 120
+    spawner: str = "direct"  # direct | forkserver
+    spawner_workers: int = 4
+
+    # Request tracing — every response carries X-Trace-Id; a sampled
+    # subset of traces is written to a local rotating JSONL file.
+    trace_sample_rate: float = 0.1
+    trace_path: Path = Path("/app/data/traces.jsonl")
+    trace_max_bytes: int = 10_000_000
+    trace_backup_count: int = 3
+
+    # Event-loop watchdog
+    loop_watchdog_enabled: bool = True
+    loop_watchdog_interval_ms: int = 100
+    loop_lag_threshold_ms: int = 250  # log a stack snapshot past this stall
 
     @property
     def guacamole_enabled(self) -> bool:
@@ -0,0 +1,251 @@
+"""Optional SQLite index over the deployment log.
+
+The JSONL file stays the source of truth. This index mirrors it into a
+WAL-mode SQLite database so history queries can filter and paginate
+without scanning the whole log. Each row is keyed by the byte offset of
+its line in the JSONL file; the index remembers how far it has read,
+and in which file (by inode), and catches up from there, so it can be
+rebuilt or re-synced at any time. Every call does blocking file and
+SQLite I/O; async callers run it with ``asyncio.to_thread``.
+
+Enable with QUICUE_DEPLOY_INDEX_ENABLED=true. Import an existing log with:
+
+    python -m app.deploy.index [--rebuild] [--log PATH] [--db PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    pos         INTEGER PRIMARY KEY,
+    timestamp   REAL NOT NULL,
+    resource    TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    action      TEXT NOT NULL,
+    mode        TEXT NOT NULL,
+    operator    TEXT,
+    doc         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_resource ON entries (resource, timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_provider_action
+    ON entries (provider, action, timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_operator ON entries (operator, timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_mode ON entries (mode, timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_conn: sqlite3.Connection | None = None
+_conn_path: Path | None = None
+_mutex = threading.Lock()
+
+
+def enabled() -> bool:
+    return settings.deploy_index_enabled
+
+
+def _index_path() -> Path:
+    return settings.deploy_index_path
+
+
+def _log_path() -> Path:
+    return settings.deploy_log_path
+
+
+def _connect() -> sqlite3.Connection:
+    """Open (or reuse) the index connection in WAL mode."""
+    global _conn, _conn_path
+    path = _index_path()
+    if _conn is not None and _conn_path == path:
+        return _conn
+    if _conn is not None:
+        _conn.close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _conn, _conn_path = conn, path
+    return conn
+
+
+def close() -> None:
+    """Close the cached connection (tests, shutdown)."""
+    global _conn, _conn_path
+    with _mutex:
+        if _conn is not None:
+            _conn.close()
+        _conn, _conn_path = None, None
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> int | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def sync(log_path: Path | None = None) -> int:
+    """Index any JSONL lines appended since the last sync.
+
+    Returns the number of rows added. If the log was replaced (a new
+    inode, e.g. rotated, even to a file larger than the old offset) or
+    shrank (truncated), the index is cleared and rebuilt from the start.
+    Partial trailing lines are left for the next sync.
+    """
+    path = log_path or _log_path()
+    with _mutex:
+        conn = _connect()
+        offset = _get_meta(conn, "offset") or 0
+        known_inode = _get_meta(conn, "inode")
+        try:
+            st = path.stat()
+            size, inode = st.st_size, st.st_ino
+        except FileNotFoundError:
+            size, inode = 0, None
+        # An index written before inodes were recorded adopts the current file.
+        if size < offset or (known_inode is not None and inode != known_inode):
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM meta")
+            offset = 0
+        if size == offset:
+            return 0
+
+        rows: list[tuple] = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                line_offset = offset
+                offset += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                rows.append((
+                    line_offset,
+                    entry.get("timestamp", 0),
+                    entry.get("resource", ""),
+                    entry.get("provider", ""),
+                    entry.get("action", ""),
+                    entry.get("mode", ""),
+                    entry.get("operator"),
+                    raw.decode("utf-8", errors="replace").strip(),
+                ))
+
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("offset", offset), ("inode", inode)],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+
+def rebuild(log_path: Path | None = None) -> int:
+    """Drop the index contents and re-import the whole log."""
+    with _mutex:
+        conn = _connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM meta")
+    return sync(log_path)
+
+
+def query(
+    limit: int = 100,
+    resource: str | None = None,
+    since: float | None = None,
+    provider: str | None = None,
+    action: str | None = None,
+    operator: str | None = None,
+    mode: str | None = None,
+    cursor: int | None = None,
+    log_path: Path | None = None,
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Return (entries newest first, next cursor or None).
+
+    The cursor is the JSONL byte offset of the last entry returned;
+    pass it back to fetch the next (older) page. Entries are ordered by
+    that offset, the order they were appended in, so pages never skip
+    or repeat entries.
+    """
+    if limit < 1:
+        return [], None
+    sync(log_path)
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, value in (
+        ("resource", resource),
+        ("provider", provider),
+        ("action", action),
+        ("operator", operator),
+        ("mode", mode),
+    ):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if cursor is not None:
+        clauses.append("pos < ?")
+        params.append(cursor)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (
+        f"SELECT pos, doc FROM entries {where} "
+        "ORDER BY pos DESC LIMIT ?"
+    )
+    params.append(limit)
+
+    with _mutex:
+        rows = _connect().execute(sql, params).fetchall()
+
+    entries = [json.loads(doc) for _, doc in rows]
+    next_cursor = rows[-1][0] if rows and len(rows) == limit else None
+    return entries, next_cursor
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Import the deploy JSONL log into the SQLite index"
+    )
+    parser.add_argument("--log", type=Path, default=None, help="JSONL log path")
+    parser.add_argument("--db", type=Path, default=None, help="SQLite index path")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="discard the index and re-import"
+    )
+    args = parser.parse_args(argv)
+
+    if args.log:
+        settings.deploy_log_path = args.log
+    if args.db:
+        settings.deploy_index_path = args.db
+
+    count = rebuild() if args.rebuild else sync()
+    print(f"Indexed {count} entries into {_index_path()}")
+
+
+if __name__ == "__main__":
+    main()
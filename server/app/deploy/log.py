@@ -1,7 +1,12 @@
 """Append-only deployment log backed by a JSONL file.
 
 Each line is a JSON object recording one action execution.
-No external dependencies — uses stdlib json + file I/O.
+No external dependencies — uses stdlib json + file I/O. When the optional
+SQLite index is enabled (see ``app.deploy.index``), every append is
+mirrored into it and history queries are answered from it instead.
+Appends are also published to ``app.deploy.stream`` for live SSE tailing.
+Everything here does blocking file (and index) I/O, so async handlers
+call it through ``asyncio.to_thread``.
 """
 
 from __future__ import annotations
@@ -14,6 +19,7 @@ from pathlib import Path
 from typing import Any
 
 from app.config import settings
+from app.deploy import index, stream
 
 
 @dataclass(frozen=True, slots=True)
@@ -40,8 +46,13 @@ def append(entry: LogEntry) -> None:
     """Append a log entry to the JSONL file."""
     path = _log_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "a") as f:
-        f.write(json.dumps(asdict(entry)) + "\n")
+    data = asdict(entry)
+    with open(path, "ab") as f:
+        offset = f.tell()
+        f.write(json.dumps(data).encode() + b"\n")
+    if index.enabled():
+        index.sync(path)
+    stream.hub.publish(offset, data)
 
 
 def read_history(
@@ -49,20 +60,56 @@ def read_history(
     resource: str | None = None,
     since: float | None = None,
 ) -> list[dict[str, Any]]:
-    """Read recent log entries, newest first.
+    """Read recent log entries, newest first."""
+    entries, _ = read_page(limit=limit, resource=resource, since=since)
+    return entries
+
 
-    Reads the file in reverse for efficiency on large logs.
+def read_page(
+    limit: int = 100,
+    resource: str | None = None,
+    since: float | None = None,
+    provider: str | None = None,
+    action: str | None = None,
+    operator: str | None = None,
+    mode: str | None = None,
+    cursor: int | None = None,
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Read one page of log entries, newest first.
+
+    Returns (entries, next_cursor). The cursor is the byte offset of the
+    last returned line; pass it back to continue with older entries.
+    Uses the SQLite index when enabled, otherwise scans the file in reverse.
     """
+    if limit < 1:
+        return [], None
     path = _log_path()
+    if index.enabled():
+        return index.query(
+            limit=limit, resource=resource, since=since, provider=provider,
+            action=action, operator=operator, mode=mode, cursor=cursor,
+            log_path=path,
+        )
     if not path.exists():
-        return []
-
+        return [], None
+
+    with open(path, "rb") as f:
+        data = f.read() if cursor is None else f.read(cursor)
+
+    filters = {
+        "resource": resource,
+        "provider": provider,
+        "action": action,
+        "operator": operator,
+        "mode": mode,
+    }
     entries: list[dict[str, Any]] = []
-    with open(path) as f:
-        lines = f.readlines()
-
-    for line in reversed(lines):
-        line = line.strip()
+    end = len(data)
+    next_cursor: int | None = None
+    while end > 0:
+        start = data.rfind(b"\n", 0, end - 1) + 1
+        line = data[start:end].strip()
+        line_offset, end = start, start
         if not line:
             continue
         try:
@@ -70,16 +117,17 @@ def read_history(
         except json.JSONDecodeError:
             continue
 
-        if resource and entry.get("resource") != resource:
+        if any(v and entry.get(k) != v for k, v in filters.items()):
             continue
         if since and entry.get("timestamp", 0) < since:
             break  # entries are chronological, stop early
 
         entries.append(entry)
         if len(entries) >= limit:
+            next_cursor = line_offset
             break
 
-    return entries
+    return entries, next_cursor
 
 
 def record_execution(
@@ -0,0 +1,187 @@
+"""In-process broadcast hub for live deployment log tailing (SSE).
+
+``log.append`` publishes every new entry here once; each SSE subscriber
+gets its own bounded queue. A subscriber that falls behind by more than
+the buffer size is dropped rather than allowed to slow the write path —
+its client reconnects with ``Last-Event-ID`` and replays the gap from the
+JSONL file. Event IDs are JSONL byte offsets, the same values used as
+history cursors.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+Event = tuple[int, dict[str, Any]]  # (byte offset, entry)
+
+
+class Subscriber:
+    """One SSE client: a bounded queue plus the loop that owns it."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = False
+
+    def _offer(self, event: Event) -> bool:
+        """Enqueue without blocking; on overflow, end the stream."""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class Hub:
+    """Fan-out of appended log entries to live subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscriber] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, maxsize: int | None = None) -> Subscriber:
+        sub = Subscriber(maxsize or settings.stream_buffer_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+
+    def publish(self, offset: int, entry: dict[str, Any]) -> None:
+        """Deliver an entry to every subscriber. Never blocks."""
+        if not self._subscribers:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        event = (offset, entry)
+        for sub in list(self._subscribers):
+            if sub.loop is current:
+                delivered = sub._offer(event)
+            else:
+                sub.loop.call_soon_threadsafe(sub._offer, event)
+                continue
+            if not delivered:
+                log.info("Dropping slow history stream subscriber")
+                self._subscribers.discard(sub)
+
+
+hub = Hub()
+
+
+def _skip_line(path: Path, after: int) -> int | None:
+    """Offset of the line after the one starting at ``after``; None if no log."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(after)
+            return after + len(f.readline())
+    except FileNotFoundError:
+        return None
+
+
+def _read_batch(path: Path, offset: int, limit: int) -> tuple[list[Event], int | None]:
+    """Up to ``limit`` complete entries from byte ``offset`` on.
+
+    Returns the entries and the offset to continue from, or None once
+    the end of the log (or a line still being written) is reached.
+    """
+    events: list[Event] = []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return events, None
+    with f:
+        f.seek(offset)
+        for _ in range(limit):
+            raw = f.readline()
+            if not raw.endswith(b"\n"):
+                return events, None
+            line_offset = offset
+            offset += len(raw)
+            try:
+                events.append((line_offset, json.loads(raw)))
+            except json.JSONDecodeError:
+                continue
+    return events, offset
+
+
+async def _replay(path: Path, after: int) -> AsyncIterator[Event]:
+    """Entries that follow the line starting at byte offset ``after``.
+
+    The log is read off the event loop, ``stream_replay_batch`` lines at
+    a time, so a replay from offset 0 neither blocks other requests nor
+    holds the whole gap in memory.
+    """
+    offset = await asyncio.to_thread(_skip_line, path, after)
+    while offset is not None:
+        events, offset = await asyncio.to_thread(
+            _read_batch, path, offset, settings.stream_replay_batch
+        )
+        for event in events:
+            yield event
+
+
+def _format(offset: int, entry: dict[str, Any]) -> str:
+    return f"id: {offset}\nevent: entry\ndata: {json.dumps(entry)}\n\n"
+
+
+async def event_stream(
+    path: Path,
+    last_event_id: int | None = None,
+    resource: str | None = None,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    heartbeat: float | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames: replay after ``last_event_id``, then live entries.
+
+    Subscribes before replaying so nothing appended in between is lost;
+    live events already covered by the replay are skipped by offset.
+    """
+    sub = hub.subscribe()
+    interval = heartbeat or settings.stream_heartbeat
+    seen = -1
+    try:
+        yield "retry: 3000\n\n"
+        if last_event_id is not None:
+            async for offset, entry in _replay(path, last_event_id):
+                seen = offset
+                if resource and entry.get("resource") != resource:
+                    continue
+                yield _format(offset, entry)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                if is_disconnected and await is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return  # dropped as a slow consumer
+            offset, entry = event
+            if offset <= seen:
+                continue
+            if resource and entry.get("resource") != resource:
+                continue
+            yield _format(offset, entry)
+    finally:
+        hub.unsubscribe(sub)
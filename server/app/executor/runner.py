@@ -1,14 +1,31 @@
-"""Async subprocess command execution."""
+"""Async subprocess command execution.
+
+Commands are classified once when the spec is loaded: anything free of
+shell metacharacters is pre-split into an argv tuple and exec'd directly,
+skipping the ``/bin/sh`` fork. Everything else still goes through the shell.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import re
+import shlex
 import time
 from dataclasses import dataclass
 
 log = logging.getLogger(__name__)
 
+# Characters that need a real shell: pipes, lists, redirects, substitution,
+# globs, escapes, comments, history expansion, brace/tilde expansion.
+_SHELL_META_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+
+# Builtins have no binary to exec; an env assignment prefix needs sh too.
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "alias", "cd", "eval", "exec", "export", "set", "source",
+    "trap", "ulimit", "umask", "unset", "wait",
+})
+
 
 @dataclass(frozen=True, slots=True)
 class CommandResult:
@@ -18,27 +35,72 @@ class CommandResult:
     duration_ms: int
 
 
-async def run_command(command: str, timeout: int = 30) -> CommandResult:
-    """Execute a shell command asynchronously with timeout.
+def split_command(command: str) -> tuple[str, ...] | None:
+    """Return a pre-split argv if the command can skip the shell, else None.
+
+    Conservative: any metacharacter anywhere (even inside quotes) keeps
+    the command on the shell path, so exec and sh always agree.
+    """
+    if not command.strip() or _SHELL_META_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return tuple(argv)
+
+
+async def run_command(
+    command: str,
+    timeout: int = 30,
+    argv: tuple[str, ...] | None = None,
+) -> CommandResult:
+    """Execute a command asynchronously with timeout.
 
     All commands come from the CUE-generated openapi.json spec,
     which resolves templates at build time. No user input is interpolated
-    at runtime.
+    at runtime. Pass ``argv`` (see ``RouteEntry.argv``) to exec directly;
+    without it the command runs under ``/bin/sh``. When the forkserver
+    spawner is running, the fork happens there instead of in this process.
     """
+    from app.executor import spawner
+
+    if spawner.is_running():
+        return await spawner.submit(command, timeout, argv)
+
     start = time.monotonic()
     try:
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        if argv is not None:
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        else:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+    except OSError as e:
+        # exec path only: missing binary, permission denied
+        return CommandResult(
+            stdout="",
+            stderr=str(e),
+            returncode=127,
+            duration_ms=int((time.monotonic() - start) * 1000),
         )
+
+    try:
         stdout_bytes, stderr_bytes = await asyncio.wait_for(
             proc.communicate(), timeout=timeout
         )
         returncode = proc.returncode or 0
     except asyncio.TimeoutError:
-        proc.kill()  # type: ignore[union-attr]
-        await proc.wait()  # type: ignore[union-attr]
+        proc.kill()
+        await proc.wait()
         elapsed = int((time.monotonic() - start) * 1000)
         return CommandResult(
             stdout="",
@@ -0,0 +1,93 @@
+"""Optional forkserver-backed spawner for command execution.
+
+Forking the API worker for every command copies its page tables and
+churns copy-on-write memory under concurrent load. When enabled
+(QUICUE_SPAWNER=forkserver), a small pool of helper processes is started
+from a clean forkserver; they run the subprocess and hand back the result,
+so the API worker never forks on the hot path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.executor.runner import CommandResult
+
+log = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _spawn(
+    command: str, timeout: int, argv: tuple[str, ...] | None
+) -> CommandResult:
+    """Run one command inside a helper process (blocking)."""
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(
+            list(argv) if argv is not None else command,
+            shell=argv is None,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return CommandResult(
+            stdout="",
+            stderr=f"Command timed out after {timeout}s",
+            returncode=-1,
+            duration_ms=int((time.monotonic() - start) * 1000),
+        )
+    except OSError as e:
+        return CommandResult(
+            stdout="",
+            stderr=str(e),
+            returncode=127,
+            duration_ms=int((time.monotonic() - start) * 1000),
+        )
+
+    return CommandResult(
+        stdout=proc.stdout.decode("utf-8", errors="replace"),
+        stderr=proc.stderr.decode("utf-8", errors="replace"),
+        returncode=proc.returncode,
+        duration_ms=int((time.monotonic() - start) * 1000),
+    )
+
+
+def start(workers: int = 4) -> None:
+    """Start the helper pool. No-op if already running."""
+    global _pool
+    if _pool is not None:
+        return
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["app.executor.spawner"])
+    _pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    log.info("Started forkserver spawner with %d workers", workers)
+
+
+def stop() -> None:
+    """Shut down the helper pool, waiting for in-flight commands."""
+    global _pool
+    if _pool is None:
+        return
+    _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = None
+    log.info("Stopped forkserver spawner")
+
+
+def is_running() -> bool:
+    return _pool is not None
+
+
+async def submit(
+    command: str, timeout: int, argv: tuple[str, ...] | None
+) -> CommandResult:
+    """Run a command in the helper pool and await its result."""
+    if _pool is None:
+        raise RuntimeError("spawner not started")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool, _spawn, command, timeout, argv)
@@ -0,0 +1,122 @@
+"""Event-loop lag watchdog.
+
+A blocking call inside an async handler (file I/O, JSON parsing of a big
+document) stalls every in-flight request. Two pieces catch that:
+
+- a ticker task sleeps a fixed interval and records how late it woke up
+  (scheduling lag), kept in a ring buffer for percentiles on /readyz;
+- a daemon thread watches the ticker's heartbeat; when the loop has not
+  ticked for longer than the threshold it snapshots the loop thread's
+  stack, so the log names the code that was blocking.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        samples: int = 1024,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self._samples: deque[float] = deque(maxlen=samples)
+        self._heartbeat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            self._samples.append(max(lag, 0.0))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.interval):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            self.stalls += 1
+            log.warning(
+                "Event loop blocked for %.0f ms%s\n%s",
+                stalled * 1000,
+                self._task_label(),
+                self._loop_stack(),
+            )
+
+    def _task_label(self) -> str:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return ""
+        return f" in {task.get_name()} ({task.get_coro()!r})" if task else ""
+
+    def _loop_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread)  # type: ignore[arg-type]
+        if frame is None:
+            return "(no stack available)"
+        return "".join(traceback.format_stack(frame))
+
+    def start(self) -> None:
+        """Start ticking on the running loop and spawn the watcher thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop-watchdog")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def percentiles(self) -> dict[str, float]:
+        """Lag percentiles in milliseconds over the recent sample window."""
+        if not self._samples:
+            return {}
+        ordered = sorted(self._samples)
+        n = len(ordered)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(n - 1, int(p * n))] * 1000, 2)
+
+        return {
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": round(ordered[-1] * 1000, 2),
+        }
@@ -10,8 +10,12 @@ from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import tracing
 from app.config import settings
+from app.executor import spawner
+from app.loop_monitor import LoopWatchdog
 from app.middleware.access import AccessMiddleware
+from app.middleware.tracing import TRACE_HEADER, TracingMiddleware
 from app.routers import actions, deploy, health, hydra
 from app.spec_loader import SpecState, load_spec
 
@@ -46,6 +50,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         log.warning("Spec file not found at startup: %s", settings.spec_path)
         app.state.spec = SpecState()
 
+    if settings.spawner == "forkserver":
+        spawner.start(settings.spawner_workers)
+
+    app.state.loop_watchdog = None
+    if settings.loop_watchdog_enabled:
+        app.state.loop_watchdog = LoopWatchdog(
+            interval=settings.loop_watchdog_interval_ms / 1000,
+            threshold=settings.loop_lag_threshold_ms / 1000,
+        )
+        app.state.loop_watchdog.start()
+
     reload_task = asyncio.create_task(_reload_loop(app))
     try:
         yield
@@ -55,6 +70,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             await reload_task
         except asyncio.CancelledError:
             pass
+        if app.state.loop_watchdog is not None:
+            await app.state.loop_watchdog.stop()
+        spawner.stop()
+        tracing.shutdown()
 
 
 def create_app() -> FastAPI:
@@ -83,8 +102,12 @@ def create_app() -> FastAPI:
             allow_origins=settings.cors_origins,
             allow_methods=["GET", "POST", "OPTIONS"],
             allow_headers=["Authorization", "Content-Type", "X-Confirm-Destructive"],
+            expose_headers=[TRACE_HEADER],
         )
 
+    # Outermost, so the trace covers auth and CORS handling too.
+    app.add_middleware(TracingMiddleware)
+
     app.include_router(health.router, prefix="/api/v1")
     app.include_router(actions.router, prefix="/api/v1")
     app.include_router(deploy.router, prefix="/api/v1")
@@ -0,0 +1,53 @@
+"""Tracing middleware: assigns a trace ID and exports sampled traces."""
+
+from __future__ import annotations
+
+import re
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app import tracing
+
+TRACE_HEADER = "X-Trace-Id"
+
+_TRACE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """Starts a trace per request and returns its ID in X-Trace-Id.
+
+    A well-formed incoming X-Trace-Id is reused so callers can correlate.
+    The trace is exported once the response headers are ready. For an
+    event stream that is long before the body ends, so its trace is
+    marked ``"streaming": true`` and its duration_ms is time to headers,
+    not the life of the stream.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        incoming = request.headers.get(TRACE_HEADER, "").lower()
+        trace = tracing.begin(
+            f"{request.method} {request.url.path}",
+            trace_id=incoming if _TRACE_ID_RE.match(incoming) else None,
+        )
+        status = 500
+        streaming = False
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            streaming = response.headers.get("content-type", "").startswith(
+                "text/event-stream"
+            )
+            response.headers[TRACE_HEADER] = trace.trace_id
+            return response
+        finally:
+            if tracing.sampled():
+                tracing.export(
+                    trace,
+                    status=status,
+                    mode=getattr(request.state, "execution_mode", None),
+                    **({"streaming": True} if streaming else {}),
+                )
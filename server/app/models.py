@@ -36,6 +36,8 @@ class HealthResponse(BaseModel):
     spec_loaded: bool
     route_count: int
     spec_mtime: str | None = None
+    loop_lag_ms: dict[str, float] | None = None  # readyz only
+    loop_stalls: int | None = None
 
 
 class SpecInfo(BaseModel):
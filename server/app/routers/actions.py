@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from app import tracing
 from app.config import settings
 from app.deploy import lock
 from app.deploy import log as deploy_log
@@ -45,7 +47,10 @@ async def _handle_connect(
 
     # Ping: execute directly
     if params.protocol == "ping":
-        result = await run_command(entry.command, timeout=settings.default_timeout)
+        with tracing.span("execute", argv=entry.argv is not None):
+            result = await run_command(
+                entry.command, timeout=settings.default_timeout, argv=entry.argv
+            )
         return ConnectResponse(
             mode="live",
             path=entry.path,
@@ -83,7 +88,8 @@ async def _handle_connect(
 
     client = get_guacamole_client()
     try:
-        conn_id, client_url = await client.create_connection(params)
+        with tracing.span("guacamole"):
+            conn_id, client_url = await client.create_connection(params)
         return ConnectResponse(
             mode="connect",
             path=entry.path,
@@ -106,9 +112,10 @@ async def dispatch_action(
     request: Request,
 ) -> JSONResponse:
     """Route lookup → mock / live / connect dispatch."""
-    key = build_route_key(resource, provider, action)
-    spec = request.app.state.spec
-    entry = spec.routes.get(key)
+    with tracing.span("route_lookup"):
+        key = build_route_key(resource, provider, action)
+        spec = request.app.state.spec
+        entry = spec.routes.get(key)
 
     if not entry:
         raise HTTPException(404, f"Unknown action: {key}")
@@ -125,11 +132,13 @@ async def dispatch_action(
 
     # Mock mode: return command string without executing
     if execution_mode == "mock":
-        deploy_log.record_execution(
-            resource=resource, provider=provider, action=action,
-            command=entry.command, mode="mock", operator=operator,
-            category=entry.category, destructive=entry.destructive,
-        )
+        with tracing.span("record_execution"):
+            await asyncio.to_thread(
+                deploy_log.record_execution,
+                resource=resource, provider=provider, action=action,
+                command=entry.command, mode="mock", operator=operator,
+                category=entry.category, destructive=entry.destructive,
+            )
         return JSONResponse(
             ActionResponse(
                 mode="mock",
@@ -143,7 +152,9 @@ async def dispatch_action(
         )
 
     # Lock check: if lock is held by someone else, block non-idempotent actions
-    if not entry.idempotent and lock.is_locked_by_other(operator):
+    with tracing.span("lock_check"):
+        locked = not entry.idempotent and lock.is_locked_by_other(operator)
+    if locked:
         lock_state = lock.status()
         return JSONResponse(
             ActionResponse(
@@ -161,13 +172,17 @@ async def dispatch_action(
 
     # Destructive gate
     if entry.destructive:
-        confirm = request.headers.get("x-confirm-destructive", "")
-        if confirm.lower() != "yes":
-            deploy_log.record_execution(
-                resource=resource, provider=provider, action=action,
-                command=entry.command, mode="blocked", operator=operator,
-                category=entry.category, destructive=True,
-            )
+        with tracing.span("destructive_gate"):
+            confirm = request.headers.get("x-confirm-destructive", "")
+            blocked = confirm.lower() != "yes"
+            if blocked:
+                await asyncio.to_thread(
+                    deploy_log.record_execution,
+                    resource=resource, provider=provider, action=action,
+                    command=entry.command, mode="blocked", operator=operator,
+                    category=entry.category, destructive=True,
+                )
+        if blocked:
             return JSONResponse(
                 ActionResponse(
                     mode="blocked",
@@ -184,16 +199,19 @@ async def dispatch_action(
 
     # Live execution
     timeout = _timeout_for(entry)
-    result = await run_command(entry.command, timeout=timeout)
-
-    deploy_log.record_execution(
-        resource=resource, provider=provider, action=action,
-        command=entry.command, mode="live", operator=operator,
-        category=entry.category, destructive=entry.destructive,
-        returncode=result.returncode,
-        duration_ms=result.duration_ms,
-        output=result.stdout or result.stderr,
-    )
+    with tracing.span("execute", argv=entry.argv is not None):
+        result = await run_command(entry.command, timeout=timeout, argv=entry.argv)
+
+    with tracing.span("record_execution"):
+        await asyncio.to_thread(
+            deploy_log.record_execution,
+            resource=resource, provider=provider, action=action,
+            command=entry.command, mode="live", operator=operator,
+            category=entry.category, destructive=entry.destructive,
+            returncode=result.returncode,
+            duration_ms=result.duration_ms,
+            output=result.stdout or result.stderr,
+        )
 
     return JSONResponse(
         ActionResponse(
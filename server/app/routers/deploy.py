@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from dataclasses import asdict
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+from app import tracing
 from app.config import settings
-from app.deploy import lock, log
+from app.deploy import lock, log, stream
 from app.executor.runner import run_command
 from app.spec_loader import build_route_key
 
@@ -29,6 +31,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/deploy", tags=["deploy"])
 
+# Upper bound on one /deploy/history page.
+MAX_HISTORY_LIMIT = 1000
+
 
 # -- Models --
 
@@ -55,13 +60,60 @@ class DriftCheckRequest(BaseModel):
 
 @router.get("/history")
 async def get_history(
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_HISTORY_LIMIT),
     resource: str | None = None,
     since: float | None = None,
+    provider: str | None = None,
+    action: str | None = None,
+    operator: str | None = None,
+    mode: str | None = None,
+    cursor: int | None = None,
 ) -> JSONResponse:
-    """Get deployment execution history."""
-    entries = log.read_history(limit=limit, resource=resource, since=since)
-    return JSONResponse({"entries": entries, "count": len(entries)})
+    """Get deployment execution history, newest first.
+
+    Pass ``next_cursor`` from a previous response as ``cursor`` to page
+    back through older entries.
+    """
+    entries, next_cursor = await asyncio.to_thread(
+        log.read_page,
+        limit=limit, resource=resource, since=since, provider=provider,
+        action=action, operator=operator, mode=mode, cursor=cursor,
+    )
+    return JSONResponse({
+        "entries": entries,
+        "count": len(entries),
+        "next_cursor": next_cursor,
+    })
+
+
+@router.get("/history/stream")
+async def stream_history(
+    request: Request,
+    resource: str | None = None,
+    last_event_id: int | None = None,
+) -> StreamingResponse:
+    """Tail new deployment log entries as Server-Sent Events.
+
+    Resumes after the ``Last-Event-ID`` header (or ``last_event_id``
+    query parameter) by replaying from that byte offset in the log.
+    """
+    header = request.headers.get("last-event-id")
+    if header:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(400, "Last-Event-ID must be a byte offset")
+
+    return StreamingResponse(
+        stream.event_stream(
+            settings.deploy_log_path,
+            last_event_id=last_event_id,
+            resource=resource,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # -- Deployment Lock --
@@ -131,7 +183,10 @@ async def gate_check(body: GateCheckRequest, request: Request) -> JSONResponse:
                 continue
 
             try:
-                result = await run_command(entry.command, timeout=15)
+                with tracing.span("execute", path=entry.path):
+                    result = await run_command(
+                        entry.command, timeout=15, argv=entry.argv
+                    )
                 resource_results[f"{entry.provider}/{entry.path.split('/')[-1]}"] = {
                     "status": "pass" if result.returncode == 0 else "fail",
                     "returncode": result.returncode,
@@ -194,8 +249,8 @@ async def drift_check(body: DriftCheckRequest, request: Request) -> JSONResponse
             action_key = f"{entry.provider}/{action_name}"
 
             # Get last known good output from log
-            history = log.read_history(
-                limit=1, resource=resource_name
+            history = await asyncio.to_thread(
+                log.read_history, limit=1, resource=resource_name
             )
             last_output = None
             for h in history:
@@ -209,7 +264,10 @@ async def drift_check(body: DriftCheckRequest, request: Request) -> JSONResponse
 
             # Run current check
             try:
-                result = await run_command(entry.command, timeout=15)
+                with tracing.span("execute", path=entry.path):
+                    result = await run_command(
+                        entry.command, timeout=15, argv=entry.argv
+                    )
                 current_output = (result.stdout or result.stderr)[:500]
                 current_ok = result.returncode == 0
             except Exception as e:
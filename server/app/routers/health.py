@@ -24,11 +24,14 @@ async def healthz(request: Request) -> HealthResponse:
 async def readyz(request: Request) -> HealthResponse:
     spec = request.app.state.spec
     loaded = len(spec.routes) > 0
+    watchdog = getattr(request.app.state, "loop_watchdog", None)
     return HealthResponse(
         status="ok" if loaded else "not_ready",
         spec_loaded=loaded,
         route_count=len(spec.routes),
         spec_mtime=str(spec.mtime) if spec.mtime else None,
+        loop_lag_ms=watchdog.percentiles() if watchdog else None,
+        loop_stalls=watchdog.stalls if watchdog else None,
     )
 
 
@@ -7,6 +7,8 @@ import logging
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from app.executor.runner import split_command
+
 log = logging.getLogger(__name__)
 
 
@@ -21,6 +23,7 @@ class RouteEntry:
     description: str
     idempotent: bool = False
     destructive: bool = False
+    argv: tuple[str, ...] | None = None  # pre-split when no shell is needed
 
 
 # path string → RouteEntry
@@ -67,16 +70,18 @@ def load_spec(spec_path: Path) -> SpecState:
         category = tags[0] if tags else "info"
         destructive = bool(op.get("x-destructive", False))
 
+        command = op.get("x-command", "")
         entry = RouteEntry(
             path=path_str,
             resource=resource,
             provider=provider,
             action=action,
-            command=op.get("x-command", ""),
+            command=command,
             category=category,
             description=op.get("description", ""),
             idempotent=bool(op.get("x-idempotent", False)),
             destructive=destructive,
+            argv=split_command(command),
         )
         routes[path_str] = entry
 
@@ -0,0 +1,159 @@
+"""Lightweight in-process request tracing.
+
+Every request gets a trace ID (returned as ``X-Trace-Id``). Handlers wrap
+their phases in ``span("name")``; the spans collect on the request's
+``Trace``. A sampled subset of traces is written as one JSON line each to
+a local size-rotated file, so latency can be attributed to a phase
+without running a collector. Requests only enqueue the line; a listener
+thread does the file write and rollover, off the event loop.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    start: float  # time.monotonic()
+    end: float | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    start: float = field(default_factory=time.monotonic)
+    wall_start: float = field(default_factory=time.time)
+    spans: list[Span] = field(default_factory=list)
+
+    def to_dict(self, end: float, **extra: Any) -> dict[str, Any]:
+        def ms(t: float) -> float:
+            return round((t - self.start) * 1000, 3)
+
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "timestamp": self.wall_start,
+            "duration_ms": ms(end),
+            **extra,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ms": ms(s.start),
+                    "duration_ms": round(((s.end or end) - s.start) * 1000, 3),
+                    **({"attrs": s.attrs} if s.attrs else {}),
+                }
+                for s in self.spans
+            ],
+        }
+
+
+_current: ContextVar[Trace | None] = ContextVar("quicue_trace", default=None)
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def current() -> Trace | None:
+    return _current.get()
+
+
+def begin(name: str, trace_id: str | None = None) -> Trace:
+    """Start a trace and make it current for this context."""
+    trace = Trace(trace_id=trace_id or new_trace_id(), name=name)
+    _current.set(trace)
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span | None]:
+    """Time a phase of the current request. No-op outside a trace."""
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+    s = Span(name=name, start=time.monotonic(), attrs=attrs)
+    trace.spans.append(s)
+    try:
+        yield s
+    finally:
+        s.end = time.monotonic()
+
+
+def sampled() -> bool:
+    rate = settings.trace_sample_rate
+    return rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+
+_writer: logging.Logger | None = None
+_writer_path: Path | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _get_writer() -> logging.Logger:
+    """A dedicated logger queueing to a rotating handler on the trace file."""
+    global _writer, _writer_path, _listener
+    path = settings.trace_path
+    if _writer is not None and _writer_path == path:
+        return _writer
+    shutdown()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = logging.getLogger(f"{__name__}.export")
+    writer.propagate = False
+    writer.setLevel(logging.INFO)
+    handler = logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=settings.trace_max_bytes,
+        backupCount=settings.trace_backup_count,
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = logging.handlers.QueueListener(queue.SimpleQueue(), handler)
+    _listener.start()
+    writer.addHandler(logging.handlers.QueueHandler(_listener.queue))
+    _writer, _writer_path = writer, path
+    return writer
+
+
+def shutdown() -> None:
+    """Write out queued traces and stop the writer thread.
+
+    The next export starts a new one.
+    """
+    global _writer, _writer_path, _listener
+    writer = logging.getLogger(f"{__name__}.export")
+    for h in list(writer.handlers):
+        writer.removeHandler(h)
+        h.close()
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+    _writer = _writer_path = _listener = None
+
+
+def export(trace: Trace, **extra: Any) -> None:
+    """Queue a finished trace to be written as one JSON line."""
+    record = trace.to_dict(time.monotonic(), **extra)
+    try:
+        _get_writer().info(json.dumps(record))
+    except OSError:
+        log.warning("Could not write trace %s", trace.trace_id, exc_info=True)
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""Build the static API tree from the datacenter CUE exports.
+
+All answers are already known — this shapes the `_bulk` and
+`openapi_spec` exports of examples/datacenter/ as HTTP responses: the
+Hydra and JSON-LD endpoints, health and spec info, one detail and one
+commands file per resource, one mock response per resource/provider/
+action route, the patched OpenAPI spec with Swagger UI, and the
+Cloudflare Pages _headers and _redirects.
+
+Builds are incremental. Files whose bytes are unchanged are not
+rewritten (mtimes and CDN caches stay put); changed files are written to
+a temporary name and renamed into place. Every served file gets
+precompressed .gz and .br siblings (.br needs the brotli package) for
+gzip_static / brotli_static style serving, and _etags.json maps each
+path to its strong ETag, size and available encodings; siblings are
+written before their file and checked against that ETag, so a build
+that dies halfway leaves nothing stale behind. Files listed in
+the previous _etags.json that are no longer produced are removed.
+Responses are rendered, compared and compressed from a thread pool.
+
+Both exports go through the shared cue export cache (tools/lib/cuexport.py),
+concurrently; pass --bulk and --openapi to build from files instead.
+
+Usage: python3 server/build_static_api.py [output_dir]
+       python3 server/build_static_api.py /tmp/static-api --bulk bulk.json --openapi openapi.json
+"""
+
+import argparse
+import copy
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+from lib.cuexport import Target, default_cache, export_all  # noqa: E402
+from lib.syncdir import load_manifest, prune, read_bytes, remove, write_atomic  # noqa: E402
+
+DATACENTER_DIR = os.path.join(REPO_ROOT, "examples", "datacenter")
+MANIFEST = "_etags.json"
+
+# Smaller responses fit in one packet either way; compressing them only
+# adds work for the server.
+COMPRESS_MIN_BYTES = 256
+COMPRESSIBLE = (".json", ".jsonld", ".html")
+
+ROOT_INDEX = {
+    "service": "quicue-api",
+    "version": "0.1.0",
+    "mode": "static (pre-computed from CUE)",
+    "data_source": "examples/datacenter/ (RFC 5737 TEST-NET)",
+    "explorer": "https://demo.quicue.ca",
+    "docs": "/docs/index.html",
+    "health": "/api/v1/healthz",
+    "spec": "/api/v1/spec-info",
+    "hydra": "/api/v1/hydra",
+    "graph": "/api/v1/graph.jsonld",
+}
+
+SWAGGER_HTML = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>Datacenter Operations API</title>
+  <link rel="stylesheet" href="https://unpkg.com/swagger-ui-dist@5/swagger-ui.css">
+  <style>
+    body { margin: 0; background: #fafafa; }
+    #swagger-ui .topbar { display: none; }
+  </style>
+</head>
+<body>
+  <div id="swagger-ui"></div>
+  <script src="https://unpkg.com/swagger-ui-dist@5/swagger-ui-bundle.js"></script>
+  <script>
+    SwaggerUIBundle({
+      url: '/openapi.json',
+      dom_id: '#swagger-ui',
+      presets: [SwaggerUIBundle.presets.apis, SwaggerUIBundle.SwaggerUIStandalonePreset],
+      layout: 'BaseLayout',
+      deepLinking: true,
+    });
+  </script>
+</body>
+</html>
+"""
+
+HYDRA_LINK = '  Link: </api/v1/hydra>; rel="http://www.w3.org/ns/hydra/core#apiDocumentation"'
+
+HEADERS = f"""\
+/*
+  Access-Control-Allow-Origin: *
+  Access-Control-Allow-Methods: GET, OPTIONS
+  Access-Control-Allow-Headers: Content-Type
+
+/*.json
+  Content-Type: application/json
+
+/
+{HYDRA_LINK}
+
+/index.json
+{HYDRA_LINK}
+
+/api/v1/hydra.json
+  Content-Type: application/ld+json
+
+/api/v1/hydra
+  Content-Type: application/ld+json
+
+/api/v1/graph.jsonld.json
+  Content-Type: application/ld+json
+
+/api/v1/graph.jsonld
+  Content-Type: application/ld+json
+
+/api/v1/types.json
+  Content-Type: application/ld+json
+
+/api/v1/types
+  Content-Type: application/ld+json
+
+/api/v1/index.json
+  Content-Type: application/ld+json
+{HYDRA_LINK}
+
+/api/v1/
+  Content-Type: application/ld+json
+{HYDRA_LINK}
+
+/api/v1
+  Content-Type: application/ld+json
+{HYDRA_LINK}
+
+/api/v1/resources/index.json
+  Content-Type: application/ld+json
+{HYDRA_LINK}
+  Link: <http://www.w3.org/ns/ldp#BasicContainer>; rel="type"
+
+/api/v1/resources
+  Content-Type: application/ld+json
+{HYDRA_LINK}
+  Link: <http://www.w3.org/ns/ldp#BasicContainer>; rel="type"
+
+/api/v1/resources/*/index.json
+  Content-Type: application/json
+{HYDRA_LINK}
+  Link: <http://www.w3.org/ns/ldp#Resource>; rel="type"
+
+/api/v1/resources/*
+  Content-Type: application/json
+{HYDRA_LINK}
+  Link: <http://www.w3.org/ns/ldp#Resource>; rel="type"
+"""
+
+REDIRECTS = """\
+# Root → index.json
+/ /index.json 200
+
+# API version index
+/api/v1 /api/v1/index.json 200
+/api/v1/ /api/v1/index.json 200
+
+# API endpoints → pre-computed JSON
+/api/v1/healthz /api/v1/healthz.json 200
+/api/v1/readyz /api/v1/readyz.json 200
+/api/v1/spec-info /api/v1/spec-info.json 200
+/api/v1/hydra /api/v1/hydra.json 200
+/api/v1/graph.jsonld /api/v1/graph.jsonld.json 200
+/api/v1/types /api/v1/types.json 200
+/api/v1/deploy/history /api/v1/deploy/history.json 200
+/api/v1/deploy/lock /api/v1/deploy/lock.json 200
+/docs /docs/index.html 200
+
+# Resource listing
+/api/v1/resources /api/v1/resources/index.json 200
+
+# Per-resource endpoints — with /api/v1/ prefix
+/api/v1/resources/:resource /api/v1/resources/:resource/index.json 200
+/api/v1/resources/:resource/commands /api/v1/resources/:resource/commands.json 200
+/api/v1/resources/:resource/:provider/:action /api/v1/resources/:resource/:provider/:action.json 200
+
+# Non-prefixed aliases (Swagger compat)
+/resources/:resource /api/v1/resources/:resource/index.json 200
+/resources/:resource/commands /api/v1/resources/:resource/commands.json 200
+/resources/:resource/:provider/:action /api/v1/resources/:resource/:provider/:action.json 200
+"""
+
+
+def json_bytes(data):
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Responses
+# ---------------------------------------------------------------------------
+
+def operations(spec):
+    """(path, method, op) for every operation in an OpenAPI spec."""
+    for path, methods in spec.get("paths", {}).items():
+        for method, op in methods.items():
+            yield path, method, op
+
+
+def health(bulk):
+    route_count = sum(len(cmds) for cmds in bulk.get("bound_commands", {}).values())
+    return {"status": "ok", "spec_loaded": True, "route_count": route_count, "spec_mtime": None}
+
+
+def spec_info(spec):
+    """Route counts by category (tag) and provider from the OpenAPI spec."""
+    categories = {}
+    providers = {}
+    destructive = 0
+    for _, _, op in operations(spec):
+        for tag in op.get("tags", []):
+            categories[tag] = categories.get(tag, 0) + 1
+        prov = op.get("x-provider", "unknown")
+        providers[prov] = providers.get(prov, 0) + 1
+        if op.get("x-destructive", False):
+            destructive += 1
+    return {
+        "route_count": sum(categories.values()),
+        "spec_mtime": None,
+        "last_reload": None,
+        "categories": categories,
+        "providers": providers,
+        "destructive_count": destructive,
+    }
+
+
+def action_responses(spec):
+    """(relative path, mock response) per resource--provider--action operation."""
+    for _, _, op in operations(spec):
+        parts = op.get("operationId", "").split("--")
+        if len(parts) != 3:
+            continue
+        resource, provider, action = parts
+        tags = op.get("tags")
+        yield f"api/v1/resources/{resource}/{provider}/{action}.json", {
+            "mode": "mock",
+            "path": f"/resources/{resource}/{provider}/{action}",
+            "command": op.get("x-command", ""),
+            "provider": provider,
+            "category": tags[0] if tags else "info",
+            "output": None,
+            "returncode": None,
+            "duration_ms": None,
+            "destructive": op.get("x-destructive", False),
+            "idempotent": op.get("x-idempotent", True),
+        }
+
+
+def static_openapi(spec):
+    """The spec as served statically: POST → GET, paths under /api/v1."""
+    spec = copy.deepcopy(spec)
+    new_paths = {}
+    for path, methods in spec.get("paths", {}).items():
+        new_methods = {}
+        for method, op in methods.items():
+            op["description"] = op.get("description", "") or op.get("summary", "")
+            if method.lower() == "post":
+                op["description"] += " (static mock response)"
+            new_methods["get" if method.lower() == "post" else method.lower()] = op
+        new_paths[f"/api/v1{path}"] = new_methods
+    spec["paths"] = new_paths
+    spec["servers"] = [{"url": "https://api.quicue.ca",
+                        "description": "Static API (pre-computed from CUE)"}]
+    spec.setdefault("info", {})["description"] = (
+        "654 pre-computed mock responses from the representative datacenter example. "
+        "All data uses RFC 5737 TEST-NET IPs. Every response was generated at build time by CUE."
+    )
+    return spec
+
+
+def resource_files(bulk):
+    """(relative path, body) for each resource's detail and commands listing."""
+    graph = bulk.get("plan", {}).get("Graph", {})
+    bound = bulk.get("bound_commands", {})
+    for name, res in graph.get("resources", graph.get("Input", {})).items():
+        detail = {
+            "@id": res.get("@id", f"https://infra.example.com/resources/{name}"),
+            "name": name,
+            "@type": list(res.get("@type", {}).keys()),
+            "depends_on": list(res.get("depends_on", {}).keys()),
+            "commands_url": f"/api/v1/resources/{name}/commands",
+        }
+        # Include all non-internal fields
+        for k, v in res.items():
+            if k not in ("@type", "depends_on", "@id", "name") and not k.startswith("_"):
+                detail[k] = v
+        cmds = bound.get(name, {})
+        yield f"api/v1/resources/{name}/index.json", detail
+        yield f"api/v1/resources/{name}/commands.json", {
+            "resource": name, "commands": cmds, "count": len(cmds)}
+
+
+def build_outputs(bulk, spec):
+    """{relative path: JSON-serializable body or bytes} for the whole tree."""
+    status = health(bulk)
+    outputs = {
+        "index.json": ROOT_INDEX,
+        "api/v1/healthz.json": status,
+        "api/v1/readyz.json": status,
+        "api/v1/spec-info.json": spec_info(spec),
+        "api/v1/hydra.json": bulk["hydra"],
+        "api/v1/index.json": bulk["hydra_entrypoint"],
+        "api/v1/resources/index.json": bulk["hydra_collection"],
+        "api/v1/graph.jsonld.json": bulk["graph_jsonld"],
+        "api/v1/types.json": bulk["skos_types"],
+        "api/v1/deploy/history.json": {"entries": [], "count": 0},
+        "api/v1/deploy/lock.json": {"locked": False, "operator": None,
+                                    "acquired_at": None, "expires_at": None},
+        "openapi.json": static_openapi(spec),
+        "docs/index.html": SWAGGER_HTML.encode("utf-8"),
+        "_headers": HEADERS.encode("utf-8"),
+        "_redirects": REDIRECTS.encode("utf-8"),
+    }
+    outputs.update(resource_files(bulk))
+    outputs.update(action_responses(spec))
+    return outputs
+
+
+# ---------------------------------------------------------------------------
+# Incremental writes
+# ---------------------------------------------------------------------------
+
+ENCODINGS = (("gzip", ".gz"), ("br", ".br"))
+
+
+def _encoders():
+    """{encoding: compress function} for the encodings available here."""
+    # mtime=0 keeps .gz bytes stable across builds.
+    encoders = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if HAS_BROTLI:
+        encoders["br"] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+def sync_response(out_dir, rel, body, encoders, previous=None):
+    """Write one response and its compressed siblings if they changed.
+
+    previous is rel's entry in the last build's manifest. Siblings are
+    written before the response itself, and are only trusted when that
+    entry has the same ETag: a build interrupted after some writes
+    leaves no sibling that the next build takes for current.
+
+    Returns (manifest entry, changed).
+    """
+    content = body if isinstance(body, bytes) else json_bytes(body)
+    path = os.path.join(out_dir, rel)
+    changed = read_bytes(path) != content
+    sha = hashlib.sha256(content).hexdigest()
+    etag = f'"{sha[:32]}"'
+    previous = previous or {}
+
+    encodings = []
+    compress = rel.endswith(COMPRESSIBLE) and len(content) >= COMPRESS_MIN_BYTES
+    for name, suffix in ENCODINGS:
+        sibling = path + suffix
+        if compress and name in encoders:
+            current = (not changed and previous.get("etag") == etag
+                       and name in previous.get("encodings", ())
+                       and os.path.exists(sibling))
+            if not current:
+                write_atomic(sibling, encoders[name](content))
+            encodings.append(name)
+        else:
+            remove(sibling)
+
+    if changed:
+        write_atomic(path, content)
+    return {"etag": etag, "size": len(content), "encodings": encodings}, changed
+
+
+def build(out_dir, bulk, spec, jobs=None):
+    """Sync out_dir to the responses for bulk and spec.
+
+    Returns (outputs written or unchanged, changed count, removed count).
+    """
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = build_outputs(bulk, spec)
+    encoders = _encoders()
+    previous = load_manifest(os.path.join(out_dir, MANIFEST)) or {}
+
+    def sync(item):
+        rel, body = item
+        return rel, sync_response(out_dir, rel, body, encoders, previous.get(rel))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = dict(pool.map(sync, outputs.items()))
+
+    removed = prune(out_dir, [rel for rel in previous if rel not in outputs],
+                    suffixes=(suffix for _, suffix in ENCODINGS))
+
+    manifest = {rel: entry for rel, (entry, _) in sorted(results.items())}
+    content = json_bytes(manifest)
+    if read_bytes(os.path.join(out_dir, MANIFEST)) != content:
+        write_atomic(os.path.join(out_dir, MANIFEST), content)
+
+    changed = sum(1 for _, was_written in results.values() if was_written)
+    return len(results), changed, removed
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def load_exports(args):
+    """(bulk, spec) from --bulk/--openapi files or cached cue exports."""
+    if args.bulk and args.openapi:
+        with open(args.bulk) as f:
+            bulk = json.load(f)
+        with open(args.openapi) as f:
+            spec = json.load(f)
+        return bulk, spec
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    cache = None if args.no_cache else default_cache()
+    bulk, spec = export_all([
+        Target(args.datacenter, "_bulk", (f"timestamp={timestamp}",)),
+        Target(args.datacenter, "openapi_spec"),
+    ], cache)
+    if bulk is None or spec is None:
+        sys.exit(1)
+    return bulk, spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static API from CUE exports")
+    parser.add_argument("output_dir", nargs="?", default="/tmp/static-api")
+    parser.add_argument("--datacenter", default=DATACENTER_DIR,
+                        help="CUE package to export (default: examples/datacenter)")
+    parser.add_argument("--bulk", help="Pre-exported _bulk JSON (with --openapi)")
+    parser.add_argument("--openapi", help="Pre-exported openapi_spec JSON (with --bulk)")
+    parser.add_argument("-j", "--jobs", type=int, help="Writer threads")
+    parser.add_argument("--no-cache", action="store_true", help="Always run cue export")
+    args = parser.parse_args()
+    if bool(args.bulk) != bool(args.openapi):
+        parser.error("--bulk and --openapi go together")
+
+    print(f"Building static API → {args.output_dir}")
+    bulk, spec = load_exports(args)
+    if not HAS_BROTLI:
+        print("  brotli not installed: writing .gz siblings only", file=sys.stderr)
+
+    total, changed, removed = build(args.output_dir, bulk, spec, args.jobs)
+
+    actions = sum(1 for _ in action_responses(spec))
+    graph = bulk.get("plan", {}).get("Graph", {})
+    print(f"  Actions: {actions} mock responses")
+    print(f"  Resources: {len(graph.get('resources', graph.get('Input', {})))} detail + commands")
+    print(f"  Files: {changed} changed, {total - changed} unchanged, {removed} removed")
+    print(f"Deploy with: wrangler pages deploy {args.output_dir} --project-name quicue-api")
+
+
+if __name__ == "__main__":
+    main()
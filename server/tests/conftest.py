@@ -107,6 +107,8 @@ def app_client(spec_file: Path, tmp_path: Path) -> TestClient:
     """Create a test client with the sample spec loaded."""
     deploy_log = tmp_path / "deploy.jsonl"
     deploy_lock = tmp_path / "deploy.lock.json"
+    deploy_index = tmp_path / "deploy.sqlite"
+    traces = tmp_path / "traces.jsonl"
     with patch.dict(
         "os.environ",
         {
@@ -115,6 +117,9 @@ def app_client(spec_file: Path, tmp_path: Path) -> TestClient:
             "QUICUE_TRUSTED_SUBNET": "127.0.0.0/8",
             "QUICUE_DEPLOY_LOG_PATH": str(deploy_log),
             "QUICUE_DEPLOY_LOCK_PATH": str(deploy_lock),
+            "QUICUE_DEPLOY_INDEX_PATH": str(deploy_index),
+            "QUICUE_TRACE_PATH": str(traces),
+            "QUICUE_TRACE_SAMPLE_RATE": "1.0",
         },
     ):
         # Reload modules so they pick up patched env vars.
@@ -128,9 +133,21 @@ def app_client(spec_file: Path, tmp_path: Path) -> TestClient:
         import app.middleware.access
         importlib.reload(app.middleware.access)
 
+        import app.tracing
+        importlib.reload(app.tracing)
+
+        import app.middleware.tracing
+        importlib.reload(app.middleware.tracing)
+
         import app.deploy.lock
         importlib.reload(app.deploy.lock)
 
+        import app.deploy.index
+        importlib.reload(app.deploy.index)
+
+        import app.deploy.stream
+        importlib.reload(app.deploy.stream)
+
         import app.deploy.log
         importlib.reload(app.deploy.log)
 
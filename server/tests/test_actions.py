@@ -136,6 +136,7 @@ def test_readyz(app_client: TestClient) -> None:
     resp = app_client.get("/api/v1/readyz")
     assert resp.status_code == 200
     assert resp.json()["status"] == "ok"
+    assert isinstance(resp.json()["loop_stalls"], int)
 
 
 def test_spec_info(app_client: TestClient) -> None:
@@ -0,0 +1,162 @@
+"""Tests for the SQLite deployment log index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.deploy import index, log
+from app.deploy.log import LogEntry
+
+
+@pytest.fixture(autouse=True)
+def indexed_log(tmp_path: Path):
+    """Point log + index at temp files with the index enabled."""
+    log_path = tmp_path / "deploy.jsonl"
+    db_path = tmp_path / "deploy.sqlite"
+    with (
+        patch.object(log, "_log_path", return_value=log_path),
+        patch.object(index, "_log_path", return_value=log_path),
+        patch.object(index, "_index_path", return_value=db_path),
+        patch.object(index, "enabled", return_value=True),
+    ):
+        yield log_path
+    index.close()
+
+
+def _entry(i: int, **kw) -> LogEntry:
+    fields = dict(
+        timestamp=1000.0 + i,
+        resource=f"res-{i % 3}",
+        provider="vyos",
+        action="show",
+        command="cmd",
+        mode="mock",
+    )
+    fields.update(kw)
+    return LogEntry(**fields)
+
+
+def test_append_mirrors_into_index():
+    log.append(_entry(0))
+    log.append(_entry(1, provider="govc", operator="alice"))
+    entries, cursor = index.query()
+    assert [e["timestamp"] for e in entries] == [1001.0, 1000.0]
+    assert entries[0]["operator"] == "alice"
+    assert cursor is None
+
+
+def test_query_matches_jsonl_scan():
+    for i in range(20):
+        log.append(_entry(i, mode="live" if i % 2 else "mock"))
+    for kwargs in (
+        {"resource": "res-1"},
+        {"mode": "live", "limit": 4},
+        {"since": 1015.0},
+        {"resource": "res-2", "mode": "mock"},
+    ):
+        indexed, _ = log.read_page(**kwargs)
+        with patch.object(index, "enabled", return_value=False):
+            scanned, _ = log.read_page(**kwargs)
+        assert indexed == scanned, kwargs
+
+
+def test_cursor_pagination_agrees_with_jsonl():
+    for i in range(9):
+        log.append(_entry(i))
+    indexed = log.read_page(limit=4)
+    with patch.object(index, "enabled", return_value=False):
+        scanned = log.read_page(limit=4)
+    assert indexed == scanned
+    _, cursor = indexed
+    older, _ = log.read_page(limit=4, cursor=cursor)
+    assert [e["timestamp"] for e in older] == [1004.0, 1003.0, 1002.0, 1001.0]
+
+
+def test_sync_picks_up_external_writes(indexed_log: Path):
+    log.append(_entry(0))
+    with open(indexed_log, "a") as f:
+        f.write(json.dumps({
+            "timestamp": 1001.0, "resource": "ext", "provider": "p",
+            "action": "a", "command": "c", "mode": "live",
+        }) + "\n")
+    entries, _ = index.query(resource="ext")
+    assert len(entries) == 1
+
+
+def test_sync_skips_partial_line(indexed_log: Path):
+    log.append(_entry(0))
+    with open(indexed_log, "a") as f:
+        f.write('{"timestamp": 1001.0, "resou')
+    assert index.sync() == 0
+    with open(indexed_log, "a") as f:
+        f.write('rce": "late", "provider": "p", "action": "a", "mode": "m"}\n')
+    assert index.sync() == 1
+
+
+def test_truncated_log_rebuilds(indexed_log: Path):
+    for i in range(5):
+        log.append(_entry(i))
+    indexed_log.write_text("")
+    log.append(_entry(99))
+    entries, _ = index.query()
+    assert [e["timestamp"] for e in entries] == [1099.0]
+
+
+def test_rotated_log_rebuilds_even_when_larger(indexed_log: Path):
+    for i in range(2):
+        log.append(_entry(i))
+    indexed_log.rename(indexed_log.with_suffix(".1"))
+    with open(indexed_log, "w") as f:
+        for i in range(10, 15):
+            f.write(json.dumps({"timestamp": 1000.0 + i, "output": "x" * 200}) + "\n")
+    assert indexed_log.stat().st_size > indexed_log.with_suffix(".1").stat().st_size
+    entries, _ = index.query()
+    assert [e["timestamp"] for e in entries] == [1014.0, 1013.0, 1012.0, 1011.0, 1010.0]
+
+
+def test_index_without_inode_adopts_the_current_log(indexed_log: Path):
+    log.append(_entry(0))
+    index._connect().execute("DELETE FROM meta WHERE key = 'inode'")
+    assert index.sync() == 0
+    log.append(_entry(1))
+    entries, _ = index.query()
+    assert len(entries) == 2
+
+
+def test_importer_rebuild():
+    with patch.object(index, "enabled", return_value=False):
+        for i in range(6):
+            log.append(_entry(i))
+    assert index.rebuild() == 6
+    assert index.rebuild() == 6  # idempotent
+    entries, _ = index.query(limit=100)
+    assert len(entries) == 6
+
+
+def test_nonpositive_limit_returns_nothing_on_both_backends():
+    for i in range(3):
+        log.append(_entry(i))
+    for limit in (0, -1):
+        assert log.read_page(limit=limit) == ([], None)
+        with patch.object(index, "enabled", return_value=False):
+            assert log.read_page(limit=limit) == ([], None)
+
+
+def test_pagination_follows_log_order_not_timestamps():
+    # Clock skew: timestamps out of order relative to the log.
+    for i, ts in enumerate((5.0, 1.0, 4.0, 2.0, 3.0, 0.5)):
+        log.append(_entry(i, timestamp=ts))
+    pages, cursor = [], None
+    while True:
+        entries, cursor = log.read_page(limit=2, cursor=cursor)
+        pages.extend(e["timestamp"] for e in entries)
+        if cursor is None:
+            break
+    assert pages == [0.5, 3.0, 2.0, 4.0, 1.0, 5.0]
+    with patch.object(index, "enabled", return_value=False):
+        scanned, _ = log.read_page(limit=6)
+    assert [e["timestamp"] for e in scanned] == pages
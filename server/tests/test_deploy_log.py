@@ -220,3 +220,39 @@ def test_record_execution_destructive_flag():
     )
     entries = log.read_history()
     assert entries[0]["destructive"] is True
+
+
+# -- read_page --
+
+
+def _fill(n: int) -> None:
+    for i in range(n):
+        log.append(LogEntry(
+            timestamp=1000.0 + i,
+            resource=f"res-{i % 2}",
+            provider="vyos" if i % 3 == 0 else "govc",
+            action="action",
+            command="cmd",
+            mode="live" if i % 2 else "mock",
+            operator="alice" if i < 5 else "bob",
+        ))
+
+
+def test_read_page_filters():
+    _fill(10)
+    entries, _ = log.read_page(provider="vyos", mode="mock")
+    assert [e["timestamp"] for e in entries] == [1006.0, 1000.0]
+    entries, _ = log.read_page(operator="bob")
+    assert len(entries) == 5
+
+
+def test_read_page_cursor_walks_all_entries():
+    _fill(7)
+    seen: list[float] = []
+    cursor = None
+    while True:
+        entries, cursor = log.read_page(limit=3, cursor=cursor)
+        seen.extend(e["timestamp"] for e in entries)
+        if cursor is None:
+            break
+    assert seen == [1000.0 + i for i in reversed(range(7))]
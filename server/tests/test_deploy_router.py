@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
 
@@ -36,6 +39,46 @@ def test_history_limit(app_client: TestClient) -> None:
     assert resp.json()["count"] == 2
 
 
+def test_log_io_runs_off_the_event_loop(app_client: TestClient) -> None:
+    from app.deploy import log
+
+    with patch.object(asyncio, "to_thread", wraps=asyncio.to_thread) as to_thread:
+        app_client.post("/api/v1/resources/router-core/vyos/show_interfaces")
+        assert app_client.get("/api/v1/deploy/history").json()["count"] == 1
+    offloaded = [c.args[0] for c in to_thread.call_args_list]
+    assert log.record_execution in offloaded and log.read_page in offloaded
+
+
+def test_history_rejects_out_of_range_limit(app_client: TestClient) -> None:
+    for limit in (0, -1, 100000):
+        resp = app_client.get(f"/api/v1/deploy/history?limit={limit}")
+        assert resp.status_code == 422, limit
+
+
+def test_history_cursor_pagination(app_client: TestClient) -> None:
+    for _ in range(5):
+        app_client.post("/api/v1/resources/router-core/vyos/show_interfaces")
+    seen = 0
+    cursor = None
+    while True:
+        url = "/api/v1/deploy/history?limit=2"
+        if cursor is not None:
+            url += f"&cursor={cursor}"
+        data = app_client.get(url).json()
+        seen += data["count"]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == 5
+
+
+def test_history_stream_rejects_bad_last_event_id(app_client: TestClient) -> None:
+    resp = app_client.get(
+        "/api/v1/deploy/history/stream", headers={"Last-Event-ID": "abc"}
+    )
+    assert resp.status_code == 400
+
+
 # -- Lock --
 
 
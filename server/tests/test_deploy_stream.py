@@ -0,0 +1,129 @@
+"""Tests for the live deployment history stream (SSE hub)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.deploy import log, stream
+from app.deploy.log import LogEntry
+
+
+@pytest.fixture(autouse=True)
+def log_file(tmp_path: Path):
+    log_path = tmp_path / "deploy.jsonl"
+    with (
+        patch.object(log, "_log_path", return_value=log_path),
+        patch.object(stream, "hub", stream.Hub()),
+    ):
+        yield log_path
+
+
+def _append(i: int, resource: str = "router-core") -> None:
+    log.append(LogEntry(
+        timestamp=1000.0 + i,
+        resource=resource,
+        provider="vyos",
+        action="show",
+        command="cmd",
+        mode="mock",
+    ))
+
+
+def _parse(frame: str) -> tuple[int, dict]:
+    fields = dict(
+        line.split(": ", 1) for line in frame.strip().split("\n")
+    )
+    return int(fields["id"]), json.loads(fields["data"])
+
+
+async def _next_entry(gen) -> str:
+    while True:
+        frame = await asyncio.wait_for(gen.__anext__(), timeout=2)
+        if frame.startswith("id:"):
+            return frame
+
+
+@pytest.mark.asyncio
+async def test_live_entries_are_pushed(log_file: Path):
+    gen = stream.event_stream(log_file)
+    assert (await gen.__anext__()).startswith("retry:")
+    _append(0)
+    offset, entry = _parse(await _next_entry(gen))
+    assert offset == 0
+    assert entry["timestamp"] == 1000.0
+    await gen.aclose()
+    assert len(stream.hub) == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id(log_file: Path):
+    for i in range(3):
+        _append(i)
+    first_line = len(log_file.read_bytes().split(b"\n")[0]) + 1
+    gen = stream.event_stream(log_file, last_event_id=first_line)
+    await gen.__anext__()
+    # entry 1 was the last one seen, so replay starts at entry 2
+    assert _parse(await _next_entry(gen))[1]["timestamp"] == 1002.0
+    _append(3)
+    assert _parse(await _next_entry(gen))[1]["timestamp"] == 1003.0
+    await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_reads_in_batches_off_the_loop(log_file: Path):
+    for i in range(7):
+        _append(i)
+    with log_file.open("ab") as f:
+        f.write(b'{"timestamp": 2000.0')  # line still being written
+
+    calls = []
+    real = stream._read_batch
+
+    def read_batch(path, offset, limit):
+        calls.append(limit)
+        return real(path, offset, limit)
+
+    with (
+        patch.object(stream.settings, "stream_replay_batch", 3),
+        patch.object(stream, "_read_batch", read_batch),
+        patch.object(stream.asyncio, "to_thread", wraps=asyncio.to_thread) as to_thread,
+    ):
+        replayed = [entry["timestamp"] async for _, entry in stream._replay(log_file, 0)]
+    assert replayed == [1001.0 + i for i in range(6)]
+    assert calls == [3, 3, 3]
+    assert to_thread.call_count == 4  # skip the seen line, then each batch
+
+    assert [e async for e in stream._replay(log_file.with_name("missing"), 0)] == []
+
+
+@pytest.mark.asyncio
+async def test_resource_filter(log_file: Path):
+    gen = stream.event_stream(log_file, resource="wanted")
+    await gen.__anext__()
+    _append(0, resource="other")
+    _append(1, resource="wanted")
+    assert _parse(await _next_entry(gen))[1]["resource"] == "wanted"
+    await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped():
+    sub = stream.hub.subscribe(maxsize=2)
+    for i in range(3):
+        stream.hub.publish(i, {"n": i})
+    assert sub.dropped
+    assert len(stream.hub) == 0
+    assert sub.queue.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_when_idle(log_file: Path):
+    gen = stream.event_stream(log_file, heartbeat=0.01)
+    await gen.__anext__()
+    assert await gen.__anext__() == ": keepalive\n\n"
+    await gen.aclose()
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import pytest
 
-from app.executor.runner import run_command
+from app.executor import spawner
+from app.executor.runner import run_command, split_command
 
 
 @pytest.mark.asyncio
@@ -39,3 +40,82 @@ async def test_run_command_captures_both() -> None:
     result = await run_command("echo out && echo err >&2")
     assert "out" in result.stdout
     assert "err" in result.stderr
+
+
+# -- split_command --
+
+
+def test_split_command_plain() -> None:
+    assert split_command("ping -c 3 198.51.100.10") == (
+        "ping", "-c", "3", "198.51.100.10",
+    )
+
+
+def test_split_command_keeps_quoted_arg() -> None:
+    assert split_command("ssh vyos@198.51.100.1 'show interfaces'") == (
+        "ssh", "vyos@198.51.100.1", "show interfaces",
+    )
+
+
+@pytest.mark.parametrize("command", [
+    "echo out && echo err >&2",
+    "virsh list | grep running",
+    "ls /var/log/*.log",
+    "echo $HOME",
+    "FOO=1 env",
+    "cd /tmp",
+    "echo 'unterminated",
+    "",
+])
+def test_split_command_needs_shell(command: str) -> None:
+    assert split_command(command) is None
+
+
+@pytest.mark.asyncio
+async def test_run_command_exec_path() -> None:
+    result = await run_command("echo hello", argv=("echo", "hello"))
+    assert result.returncode == 0
+    assert result.stdout.strip() == "hello"
+
+
+@pytest.mark.asyncio
+async def test_run_command_exec_missing_binary() -> None:
+    result = await run_command(
+        "no-such-binary-xyz", argv=("no-such-binary-xyz",)
+    )
+    assert result.returncode == 127
+
+
+@pytest.mark.asyncio
+async def test_run_command_exec_timeout() -> None:
+    result = await run_command("sleep 10", timeout=1, argv=("sleep", "10"))
+    assert result.returncode == -1
+
+
+# -- forkserver spawner --
+
+
+@pytest.fixture
+def forkserver():
+    spawner.start(workers=1)
+    try:
+        yield
+    finally:
+        spawner.stop()
+
+
+@pytest.mark.asyncio
+async def test_spawner_exec_and_shell(forkserver) -> None:
+    assert spawner.is_running()
+    result = await run_command("echo hi", argv=("echo", "hi"))
+    assert result.stdout.strip() == "hi"
+    result = await run_command("echo out && echo err >&2")
+    assert "out" in result.stdout
+    assert "err" in result.stderr
+
+
+@pytest.mark.asyncio
+async def test_spawner_timeout(forkserver) -> None:
+    result = await run_command("sleep 10", timeout=1, argv=("sleep", "10"))
+    assert result.returncode == -1
+    assert "timed out" in result.stderr.lower()
@@ -0,0 +1,44 @@
+"""Tests for the event-loop lag watchdog."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.loop_monitor import LoopWatchdog
+
+
+def _blocking_handler() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_records_lag_percentiles() -> None:
+    wd = LoopWatchdog(interval=0.01, threshold=1.0)
+    wd.start()
+    await asyncio.sleep(0.1)
+    await wd.stop()
+    pct = wd.percentiles()
+    assert set(pct) == {"p50", "p95", "p99", "max"}
+    assert pct["p50"] <= pct["p99"] <= pct["max"]
+
+
+@pytest.mark.asyncio
+async def test_stall_logs_blocking_stack(caplog) -> None:
+    wd = LoopWatchdog(interval=0.01, threshold=0.05)
+    wd.start()
+    await asyncio.sleep(0.05)
+    with caplog.at_level(logging.WARNING, logger="app.loop_monitor"):
+        _blocking_handler()
+        await asyncio.sleep(0.05)
+    await wd.stop()
+    assert wd.stalls == 1
+    assert "_blocking_handler" in caplog.text
+    assert wd.percentiles()["max"] >= 200
+
+
+def test_percentiles_empty() -> None:
+    assert LoopWatchdog().percentiles() == {}
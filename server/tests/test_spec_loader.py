@@ -67,3 +67,9 @@ def test_mtime_set(spec_file: Path) -> None:
 def test_last_reload_set(spec_file: Path) -> None:
     state = load_spec(spec_file)
     assert state.last_reload != ""
+
+
+def test_route_entry_argv(spec_file: Path) -> None:
+    state = load_spec(spec_file)
+    entry = state.routes["/resources/router-core/vyos/show_interfaces"]
+    assert entry.argv == ("ssh", "vyos@198.51.100.1", "show interfaces")
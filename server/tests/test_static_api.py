@@ -0,0 +1,118 @@
+"""Tests for the incremental static API builder."""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import json
+import os
+
+import build_static_api
+from tests.conftest import SAMPLE_SPEC
+
+SAMPLE_BULK = {
+    "hydra": {"@type": "hydra:ApiDocumentation"},
+    "hydra_entrypoint": {"@type": "hydra:EntryPoint"},
+    "hydra_collection": {"@type": "hydra:Collection"},
+    "graph_jsonld": {"@graph": [{"@id": "urn:test:router", "name": "router-core"}]},
+    "skos_types": {},
+    "bound_commands": {
+        "router-core": {"show_interfaces": "ssh vyos@198.51.100.1 'show interfaces'"},
+        "pve-node1": {"ping": "ping -c 3 198.51.100.10", "ssh": "ssh root@198.51.100.10"},
+    },
+    "plan": {"Graph": {"resources": {
+        "router-core": {"@type": {"Router": True}, "ip": "198.51.100.1", "_internal": 1},
+        "pve-node1": {"@type": {"Hypervisor": True}, "depends_on": {"router-core": True}},
+    }}},
+}
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_build_writes_responses(tmp_path) -> None:
+    out = tmp_path / "api"
+    total, changed, removed = build_static_api.build(str(out), SAMPLE_BULK, SAMPLE_SPEC)
+    assert changed == total and removed == 0
+
+    assert _read(out / "api/v1/healthz.json")["route_count"] == 3
+    info = _read(out / "api/v1/spec-info.json")
+    assert info["destructive_count"] == 1
+    assert info["providers"]["proxmox"] == 3
+
+    action = _read(out / "api/v1/resources/vcenter/govc/vm_power_off_hard.json")
+    assert action["destructive"] is True
+    assert action["category"] == "admin"
+
+    detail = _read(out / "api/v1/resources/router-core/index.json")
+    assert detail["ip"] == "198.51.100.1"
+    assert "_internal" not in detail
+    assert _read(out / "api/v1/resources/pve-node1/commands.json")["count"] == 2
+
+    spec = _read(out / "openapi.json")
+    op = spec["paths"]["/api/v1/resources/router-core/vyos/show_interfaces"]["get"]
+    assert op["description"].endswith("(static mock response)")
+    assert "post" in SAMPLE_SPEC["paths"]["/resources/router-core/vyos/show_interfaces"]
+
+
+def test_rebuild_is_incremental(tmp_path) -> None:
+    out = tmp_path / "api"
+    build_static_api.build(str(out), SAMPLE_BULK, SAMPLE_SPEC)
+    target = out / "openapi.json"
+    os.utime(target, (1, 1))
+
+    total, changed, removed = build_static_api.build(str(out), SAMPLE_BULK, SAMPLE_SPEC)
+    assert (changed, removed) == (0, 0)
+    assert os.stat(target).st_mtime == 1
+
+    spec = copy.deepcopy(SAMPLE_SPEC)
+    del spec["paths"]["/resources/vcenter/govc/vm_power_off_hard"]
+    total, changed, removed = build_static_api.build(str(out), SAMPLE_BULK, spec)
+    assert removed == 1
+    assert not (out / "api/v1/resources/vcenter").exists()
+    assert "api/v1/resources/vcenter/govc/vm_power_off_hard.json" not in \
+        _read(out / build_static_api.MANIFEST)
+
+
+def test_precompressed_siblings_and_etags(tmp_path) -> None:
+    out = tmp_path / "api"
+    build_static_api.build(str(out), SAMPLE_BULK, SAMPLE_SPEC)
+    manifest = _read(out / build_static_api.MANIFEST)
+
+    entry = manifest["openapi.json"]
+    assert "gzip" in entry["encodings"]
+    raw = (out / "openapi.json").read_bytes()
+    assert gzip.decompress((out / "openapi.json.gz").read_bytes()) == raw
+    assert entry["size"] == len(raw)
+    assert entry["etag"].startswith('"') and entry["etag"].endswith('"')
+
+    # Tiny responses and Pages config files are not compressed.
+    assert manifest["api/v1/deploy/history.json"]["encodings"] == []
+    assert not (out / "_headers.gz").exists()
+
+
+def test_interrupted_build_leaves_no_stale_sibling(tmp_path, monkeypatch) -> None:
+    out = tmp_path / "api"
+    build_static_api.build(str(out), SAMPLE_BULK, SAMPLE_SPEC)
+    spec = copy.deepcopy(SAMPLE_SPEC)
+    spec["info"]["title"] = "Renamed"
+
+    # A build that died after replacing openapi.json but before its .gz.
+    new = build_static_api.build_outputs(SAMPLE_BULK, spec)["openapi.json"]
+    new = new if isinstance(new, bytes) else build_static_api.json_bytes(new)
+    (out / "openapi.json").write_bytes(new)
+
+    written = []
+    real = build_static_api.write_atomic
+    monkeypatch.setattr(build_static_api, "write_atomic",
+                        lambda path, content: (written.append(path), real(path, content)))
+    build_static_api.build(str(out), SAMPLE_BULK, spec)
+    assert gzip.decompress((out / "openapi.json.gz").read_bytes()) == new
+    assert str(out / "openapi.json.gz") in written
+
+    written.clear()
+    spec["info"]["title"] = "Renamed again"
+    build_static_api.build(str(out), SAMPLE_BULK, spec)
+    assert written.index(str(out / "openapi.json.gz")) < written.index(str(out / "openapi.json"))
@@ -0,0 +1,110 @@
+"""Tests for request tracing (X-Trace-Id header + JSONL export)."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.executor.runner import CommandResult
+from app.middleware.tracing import TracingMiddleware
+
+
+def _traces() -> list[dict]:
+    tracing.shutdown()  # flush the writer thread
+    path: Path = tracing.settings.trace_path
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_trace_id_header(app_client: TestClient) -> None:
+    resp = app_client.get("/api/v1/healthz")
+    trace_id = resp.headers["x-trace-id"]
+    assert len(trace_id) == 32
+    assert _traces()[-1]["trace_id"] == trace_id
+
+
+def test_incoming_trace_id_reused(app_client: TestClient) -> None:
+    incoming = "0af7651916cd43dd8448eb211c80319c"
+    resp = app_client.get("/api/v1/healthz", headers={"X-Trace-Id": incoming})
+    assert resp.headers["x-trace-id"] == incoming
+    resp = app_client.get("/api/v1/healthz", headers={"X-Trace-Id": "nope"})
+    assert resp.headers["x-trace-id"] != "nope"
+
+
+def test_live_action_phases(app_client: TestClient, trusted_ip) -> None:
+    with patch("app.routers.actions.run_command", new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = CommandResult(
+            stdout="ok", stderr="", returncode=0, duration_ms=1
+        )
+        resp = app_client.post(
+            "/api/v1/resources/router-core/vyos/show_interfaces",
+            headers={"Authorization": "Bearer test-token"},
+        )
+    trace = _traces()[-1]
+    assert trace["trace_id"] == resp.headers["x-trace-id"]
+    assert trace["status"] == 200
+    assert trace["mode"] == "live"
+    assert [s["name"] for s in trace["spans"]] == [
+        "route_lookup", "lock_check", "execute", "record_execution",
+    ]
+
+
+def test_destructive_gate_span(app_client: TestClient, trusted_ip) -> None:
+    app_client.post(
+        "/api/v1/resources/vcenter/govc/vm_power_off_hard",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    names = [s["name"] for s in _traces()[-1]["spans"]]
+    assert names == ["route_lookup", "lock_check", "destructive_gate"]
+
+
+def test_unsampled_requests_not_written(app_client: TestClient) -> None:
+    with patch.object(tracing.settings, "trace_sample_rate", 0.0):
+        resp = app_client.get("/api/v1/healthz")
+    assert "x-trace-id" in resp.headers
+    assert not tracing.settings.trace_path.exists()
+
+
+def test_span_outside_trace_is_noop() -> None:
+    tracing._current.set(None)
+    with tracing.span("orphan") as s:
+        assert s is None
+
+
+def test_export_writes_off_the_calling_thread(app_client: TestClient) -> None:
+    writers = []
+    real_emit = tracing.logging.handlers.RotatingFileHandler.emit
+
+    def emit(self, record):
+        writers.append(threading.current_thread())
+        real_emit(self, record)
+
+    with patch.object(tracing.logging.handlers.RotatingFileHandler, "emit", emit):
+        tracing.export(tracing.begin("direct"))
+        trace = _traces()[-1]
+    assert trace["name"] == "direct"
+    assert writers and threading.current_thread() not in writers
+
+
+def test_event_stream_trace_is_marked_streaming(app_client: TestClient) -> None:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/events")
+    async def events():
+        async def body():
+            yield "data: 1\n\n"
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    with TestClient(app) as client:
+        assert client.get("/events").text == "data: 1\n\n"
+        client.get("/missing")
+    streamed, plain = _traces()[-2:]
+    assert streamed["name"] == "GET /events" and streamed["streaming"] is True
+    assert plain["status"] == 404 and "streaming" not in plain
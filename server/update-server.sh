@@ -21,9 +21,10 @@ echo "=== api.quicue.ca Update ==="
 
 # Phase 1: Export CUE data
 echo "--- Exporting CUE data ---"
-cue export ./examples/datacenter/ -e openapi_spec --out json > /tmp/quicue-openapi.json
-cue export ./examples/datacenter/ -e jsonld --out json > /tmp/quicue-graph.jsonld
-cue export ./examples/datacenter/ -e datacenter_hydra --out json > /tmp/quicue-hydra.jsonld
+CUE_EXPORT="python3 tools/cue_export.py ./examples/datacenter/"
+$CUE_EXPORT -e openapi_spec -o /tmp/quicue-openapi.json
+$CUE_EXPORT -e jsonld -o /tmp/quicue-graph.jsonld
+$CUE_EXPORT -e datacenter_hydra -o /tmp/quicue-hydra.jsonld
 echo "  openapi.json: $(wc -c < /tmp/quicue-openapi.json)B"
 echo "  graph.jsonld: $(wc -c < /tmp/quicue-graph.jsonld)B"
 echo "  hydra.jsonld: $(wc -c < /tmp/quicue-hydra.jsonld)B"
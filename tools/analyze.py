@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Precompute #InfraGraph analytics (criticality, SPOF, blast radius).
+
+Computes the values of #CriticalityRank, #SinglePointsOfFailure and
+per-resource #BlastRadius summaries from an exported _resources map, so
+CUE files and the API can look them up instead of evaluating the
+quadratic comprehensions in patterns/graph.cue.
+
+It also finds structural single points of failure that the same-type,
+same-layer peer check misses: articulation points and bridges of the
+undirected graph, and each resource's dominator-tree score (how many
+resources can only be reached from a root through it).
+
+Output is an _analytics struct:
+
+    _analytics: {
+        criticality: [...]          // #CriticalityRank.ranked
+        spof: {risks: [...], summary: {...}}   // #SinglePointsOfFailure
+        blast_radius: {"<id>": {...}}          // #BlastRadius.summary per resource
+        blast: {"<id>": {...}}                 // full #BlastRadius, --blast targets only
+        structural: {
+            articulation_points: {"<id>": true}
+            bridges: [["<dependency>", "<dependent>"], ...]
+            idom: {"<id>": "<immediate dominator>"}
+            dominates: {"<id>": N}
+        }
+    }
+
+Usage:
+    # Pipe from cue export
+    cue export ./examples/datacenter/ -e _resources | python3 tools/analyze.py -
+
+    # Adapter --json output or a _resources JSON file
+    python3 tools/analyze.py resources.json -o analytics.cue
+
+    # Full blast radius for selected targets
+    python3 tools/analyze.py resources.json --blast dns --blast pve-node --json
+
+    # Structural analysis only (linear time; skips the transitive closure)
+    python3 tools/analyze.py huge-resources.json --structural-only -o structural.cue
+
+Zero dependencies — stdlib Python only (cue is only needed for .cue input).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from lib.analytics import (
+    GraphIndex,
+    blast_radius,
+    blast_summaries,
+    criticality,
+    single_points_of_failure,
+    structural,
+)
+from toposort import graph_from_resources, load_resources
+
+
+def analyze(resources: dict, blast: list[str] | None = None,
+            structural_only: bool = False) -> dict:
+    components, deps = graph_from_resources(resources)
+    result = {}
+    if not structural_only:
+        g = GraphIndex(components, deps)
+        result["criticality"] = criticality(g)
+        result["spof"] = single_points_of_failure(g)
+        result["blast_radius"] = blast_summaries(g)
+        if blast:
+            result["blast"] = {t: blast_radius(g, t) for t in blast}
+    result["structural"] = structural(components, deps)
+    return result
+
+
+def _cue_value(v) -> str:
+    # JSON is valid CUE; keep each list item / map entry on one line.
+    return json.dumps(v, separators=(", ", ": "))
+
+
+def _cue_map(name: str, entries: dict, indent: str) -> list[str]:
+    lines = [f"{indent}{name}: {{"]
+    lines += [f"{indent}\t{json.dumps(k)}: {_cue_value(v)}" for k, v in entries.items()]
+    lines.append(f"{indent}}}")
+    return lines
+
+
+def _cue_list(name: str, items: list, indent: str) -> list[str]:
+    lines = [f"{indent}{name}: ["]
+    lines += [f"{indent}\t{_cue_value(v)}," for v in items]
+    lines.append(f"{indent}]")
+    return lines
+
+
+def render_cue(result: dict, package: str, command: str) -> str:
+    lines = [
+        f"// Generated by: {command}",
+        "// DO NOT EDIT — regenerate when _resources changes",
+        f"package {package}",
+        "",
+        "_analytics: {",
+    ]
+    if "criticality" in result:
+        lines += _cue_list("criticality", result["criticality"], "\t")
+        lines.append("\tspof: {")
+        lines += _cue_list("risks", result["spof"]["risks"], "\t\t")
+        lines.append(f"\t\tsummary: {_cue_value(result['spof']['summary'])}")
+        lines.append("\t}")
+        lines += _cue_map("blast_radius", result["blast_radius"], "\t")
+    if "blast" in result:
+        lines += _cue_map("blast", result["blast"], "\t")
+    st = result["structural"]
+    lines.append("\tstructural: {")
+    lines += _cue_map("articulation_points", st["articulation_points"], "\t\t")
+    lines += _cue_list("bridges", st["bridges"], "\t\t")
+    lines += _cue_map("idom", st["idom"], "\t\t")
+    lines += _cue_map("dominates", st["dominates"], "\t\t")
+    lines.append("\t}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute criticality, SPOF and blast radius for an #InfraGraph",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input",
+                        help="_resources JSON file, '-' for stdin, or a CUE package/file")
+    parser.add_argument("-e", "--expr", default="_resources",
+                        help="Expression to export for CUE input (default: _resources)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-p", "--package", default="main",
+                        help="CUE package name (default: main)")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    parser.add_argument("--blast", action="append", metavar="ID",
+                        help="Emit the full #BlastRadius for ID (repeatable)")
+    parser.add_argument("--structural-only", action="store_true",
+                        help="Only articulation points, bridges and dominators "
+                             "(linear time; no transitive closure)")
+    parser.add_argument("--stats", action="store_true", help="Print stats to stderr")
+
+    args = parser.parse_args()
+    if args.blast and args.structural_only:
+        parser.error("--blast needs the closure; drop --structural-only")
+
+    resources = load_resources(args.input, args.expr)
+    for target in args.blast or []:
+        if target not in resources:
+            print(f"ERROR: --blast target '{target}' is not a resource", file=sys.stderr)
+            sys.exit(2)
+    result = analyze(resources, args.blast, args.structural_only)
+    st = result["structural"]
+
+    if args.stats:
+        print(f"Resources: {len(st['dominates'])}", file=sys.stderr)
+        if "spof" in result:
+            print(f"With dependents: {result['spof']['summary']['total_with_deps']}",
+                  file=sys.stderr)
+            print(f"SPOFs: {result['spof']['summary']['spof_count']}", file=sys.stderr)
+        print(f"Articulation points: {len(st['articulation_points'])}", file=sys.stderr)
+        print(f"Bridges: {len(st['bridges'])}", file=sys.stderr)
+
+    if args.json:
+        output = json.dumps(result, indent=2) + "\n"
+    else:
+        source = "cue export -e _resources | python3 tools/analyze.py -" \
+            if args.input == "-" else f"python3 tools/analyze.py {args.input}"
+        output = render_cue(result, args.package, source)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+        print(f"Wrote {args.output} ({len(st['dominates'])} resources)", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -65,6 +65,7 @@ class AsyncApiAdapter(BaseAdapter):
     name = "asyncapi"
     description = "Convert AsyncAPI spec to #InfraGraph"
     metadata_fields = ["protocol", "description", "operationType"]
+    input_patterns = ("*.json", "*.yaml", "*.yml")
 
     def parse(self, path: str, args: argparse.Namespace) -> tuple[dict, dict]:
         """Parse AsyncAPI spec and extract components + dependencies.
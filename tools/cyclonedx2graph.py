@@ -21,6 +21,15 @@ Usage:
     # JSON output (for piping to other tools)
     python tools/cyclonedx2graph.py sbom.json --json
 
+    # Stream a multi-GB SBOM without loading the whole document
+    python tools/cyclonedx2graph.py huge-image-sbom.json --stream
+
+    # Merge one SBOM per service into a single graph, parsed in parallel
+    python tools/cyclonedx2graph.py sboms/ -j 16 -o merged.cue
+
+    # Add transitive ancestors/dependents (blast radius) to _precomputed
+    python tools/cyclonedx2graph.py sbom.json --closure
+
 Output:
     CUE file with _resources (graph input) and _precomputed (depths),
     ready to wire into patterns.#InfraGraph.
@@ -29,12 +38,16 @@ Zero dependencies — stdlib Python only.
 """
 
 import argparse
-import collections
 import json
 import re
 import sys
 from pathlib import Path
 
+from lib.adapter import (closure_cue_lines, compute_closure, compute_depths, expand_inputs,
+                         merge_graphs, parse_inputs)
+from lib.jsonstream import (build_value, iter_array, iter_events, iter_map, next_event,
+                            skip_value)
+
 
 # ---------------------------------------------------------------------------
 # CycloneDX parsing
@@ -150,6 +163,83 @@ def _add_component(comp: dict, components: dict, ref_to_id: dict):
     components[safe_id] = entry
 
 
+def stream_bom(path: str) -> tuple[dict, dict, dict]:
+    """Build (components, ref_to_id, deps) from a BOM without loading it whole.
+
+    Walks the document with the incremental event parser: each entry of
+    components[] (with its nested sub-components) and dependencies[] is
+    materialized, added to the graph, and dropped. Everything else is
+    skipped unbuilt, so peak memory tracks the graph, not the file.
+    Produces the same result as extract_components/extract_dependencies
+    for BOMs whose metadata precedes components (the usual layout).
+    """
+    components = {}
+    ref_to_id = {}
+    pending = []  # (ref, [dependsOn refs]) — resolved once all refs are known
+
+    with open(path, encoding="utf-8") as f:
+        events = iter_events(f)
+        for key in iter_map(events):
+            ev, val = next_event(events)
+            if key == "bomFormat":
+                if val != "CycloneDX":
+                    print(f"WARNING: bomFormat is '{val}', expected 'CycloneDX'",
+                          file=sys.stderr)
+                skip_value(events, ev)
+            elif key == "metadata" and ev == "start_map":
+                for mkey in iter_map(events, started=True):
+                    mev, mval = next_event(events)
+                    if mkey == "component" and mev == "start_map":
+                        _add_component(build_value(events, mev, mval),
+                                       components, ref_to_id)
+                    else:
+                        skip_value(events, mev)
+            elif key == "components" and ev == "start_array":
+                for cev, cval in iter_array(events, started=True):
+                    if cev != "start_map":
+                        skip_value(events, cev)
+                        continue
+                    _stream_component(events, components, ref_to_id)
+            elif key == "dependencies" and ev == "start_array":
+                for dev, dval in iter_array(events, started=True):
+                    entry = build_value(events, dev, dval)
+                    if isinstance(entry, dict):
+                        pending.append((entry.get("ref", ""),
+                                        entry.get("dependsOn", [])))
+            else:
+                skip_value(events, ev)
+        for _ in events:  # anything after the top-level object is an error
+            pass
+
+    deps = extract_dependencies(
+        {"dependencies": [{"ref": r, "dependsOn": d} for r, d in pending]},
+        ref_to_id,
+    )
+    return components, ref_to_id, deps
+
+
+def _stream_component(events, components: dict, ref_to_id: dict):
+    """Add one components[] entry (start_map already read) and its sub-components.
+
+    Sub-components are held only until the parent's fields are complete,
+    so the parent is registered first, as in extract_components.
+    """
+    comp = {}
+    subs = []
+    for key in iter_map(events, started=True):
+        ev, val = next_event(events)
+        if key == "components" and ev == "start_array":
+            for sev, sval in iter_array(events, started=True):
+                sub = build_value(events, sev, sval)
+                if isinstance(sub, dict):
+                    subs.append(sub)
+        else:
+            comp[key] = build_value(events, ev, val)
+    _add_component(comp, components, ref_to_id)
+    for sub in subs:
+        _add_component(sub, components, ref_to_id)
+
+
 def extract_dependencies(bom: dict, ref_to_id: dict) -> dict:
     """Build depends_on maps from the CycloneDX dependencies array.
 
@@ -174,60 +264,15 @@ def extract_dependencies(bom: dict, ref_to_id: dict) -> dict:
     return deps
 
 
-# ---------------------------------------------------------------------------
-# Topological sort (Kahn's algorithm)
-# ---------------------------------------------------------------------------
-
-def compute_depths(components: dict, deps: dict) -> dict:
-    """Compute topological depth for each node via Kahn's algorithm.
-
-    Root nodes (no dependencies) have depth 0.
-    A node's depth = max(depth of dependencies) + 1.
-    """
-    # Build adjacency and in-degree
-    in_degree = {cid: 0 for cid in components}
-    forward = collections.defaultdict(list)  # dep -> [dependents]
-
-    for cid, dep_map in deps.items():
-        for dep_id in dep_map:
-            if dep_id in components:
-                in_degree[cid] = in_degree.get(cid, 0)  # ensure exists
-                forward[dep_id].append(cid)
-
-    # Count actual in-edges (from deps perspective: who depends on me)
-    in_degree = {cid: 0 for cid in components}
-    for cid, dep_map in deps.items():
-        for dep_id in dep_map:
-            if dep_id in components:
-                pass  # forward edges already tracked
-        in_degree[cid] = len([d for d in dep_map if d in components])
-
-    # Kahn's
-    depth = {}
-    queue = collections.deque()
-    for cid in components:
-        if in_degree.get(cid, 0) == 0:
-            queue.append(cid)
-            depth[cid] = 0
-
-    while queue:
-        node = queue.popleft()
-        for dependent in forward[node]:
-            new_depth = depth[node] + 1
-            if dependent not in depth or new_depth > depth[dependent]:
-                depth[dependent] = new_depth
-            in_degree[dependent] -= 1
-            if in_degree[dependent] == 0:
-                queue.append(dependent)
-
-    # Handle cycles — assign max_depth + 1 to any unvisited nodes
-    if len(depth) < len(components):
-        max_d = max(depth.values()) if depth else 0
-        for cid in components:
-            if cid not in depth:
-                depth[cid] = max_d + 1
-
-    return depth
+def parse_bom(path: str, stream: bool = False) -> tuple[dict, dict]:
+    """Parse one SBOM into (components, deps)."""
+    if stream:
+        components, _, deps = stream_bom(path)
+    else:
+        bom = load_bom(path)
+        components, ref_to_id = extract_components(bom)
+        deps = extract_dependencies(bom, ref_to_id)
+    return components, deps
 
 
 # ---------------------------------------------------------------------------
@@ -240,8 +285,9 @@ def escape_cue_string(s: str) -> str:
 
 
 def render_cue(components: dict, deps: dict, depths: dict,
-               package: str, source: str, include_metadata: bool) -> str:
-    """Render the full CUE file."""
+               package: str, source: str, include_metadata: bool,
+               closure: tuple[dict, dict] | None = None) -> str:
+    """Render the full CUE file (with ancestors/dependents given a closure)."""
     lines = []
     lines.append(f'// {package} — generated from CycloneDX SBOM')
     lines.append(f'// Source: {source}')
@@ -293,9 +339,12 @@ def render_cue(components: dict, deps: dict, depths: dict,
     # Precomputed depths
     lines.append(f'_precomputed: {{')
     lines.append(f'\tdepth: {{')
-    for cid in sorted(depths, key=lambda k: (depths[k], k)):
+    ordered = sorted(depths, key=lambda k: (depths[k], k))
+    for cid in ordered:
         lines.append(f'\t\t"{cid}": {depths[cid]}')
     lines.append(f'\t}}')
+    if closure is not None:
+        lines.extend(closure_cue_lines(closure, ordered))
     lines.append(f'}}')
     lines.append(f'')
 
@@ -308,12 +357,16 @@ def render_cue(components: dict, deps: dict, depths: dict,
     return "\n".join(lines) + "\n"
 
 
-def render_json(components: dict, deps: dict, depths: dict) -> str:
+def render_json(components: dict, deps: dict, depths: dict,
+                closure: tuple[dict, dict] | None = None) -> str:
     """Render as JSON (for piping to other tools)."""
     output = {
         "resources": {},
         "precomputed": {"depth": depths},
     }
+    if closure is not None:
+        output["precomputed"]["ancestors"] = closure[0]
+        output["precomputed"]["dependents"] = closure[1]
     for cid, comp in components.items():
         entry = {
             "name": cid,
@@ -339,7 +392,8 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__,
     )
-    parser.add_argument("input", help="Path to CycloneDX JSON file")
+    parser.add_argument("input", nargs="+",
+                        help="CycloneDX JSON file(s), globs, or directories to merge")
     parser.add_argument("-o", "--output", help="Output file (default: stdout)")
     parser.add_argument("-p", "--package", help="CUE package name (default: derived from filename)")
     parser.add_argument("--metadata", action="store_true",
@@ -348,21 +402,40 @@ def main():
                         help="Output JSON instead of CUE")
     parser.add_argument("--stats", action="store_true",
                         help="Print stats to stderr")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse incrementally (bounded memory for multi-GB SBOMs)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="Parallel parse workers for multiple inputs (default: CPU count)")
+    parser.add_argument("--closure", action="store_true",
+                        help="Also emit precomputed ancestors/dependents "
+                             "(one entry per reachable pair: output grows "
+                             "roughly with nodes × average reach)")
 
     args = parser.parse_args()
 
     # Load and parse
-    bom = load_bom(args.input)
-    components, ref_to_id = extract_components(bom)
-    deps = extract_dependencies(bom, ref_to_id)
+    paths = expand_inputs(args.input)
+    if not paths:
+        print(f"ERROR: no input files match {' '.join(args.input)}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        components, deps, conflicts = merge_graphs(
+            parse_inputs(parse_bom, paths, args.stream, jobs=args.jobs)
+        )
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        sys.exit(1)
     depths = compute_depths(components, deps)
+    closure = compute_closure(components, deps) if args.closure else None
 
     # Package name
     package = args.package
     if not package:
-        package = re.sub(r"[^a-zA-Z0-9]", "", Path(args.input).stem.lower())
+        if len(paths) == 1:
+            package = re.sub(r"[^a-zA-Z0-9]", "", Path(paths[0]).stem.lower())
         if not package or not package[0].isalpha():
             package = "sbom"
+    source = Path(paths[0]).name if len(paths) == 1 else f"{len(paths)} inputs"
 
     # Stats
     if args.stats:
@@ -373,13 +446,16 @@ def main():
         print(f"Edges: {n_edges}", file=sys.stderr)
         print(f"Max depth: {max_depth}", file=sys.stderr)
         print(f"Roots: {roots}", file=sys.stderr)
+        if len(paths) > 1:
+            print(f"Inputs: {len(paths)}", file=sys.stderr)
+            print(f"Conflicting IDs: {conflicts}", file=sys.stderr)
 
     # Render
     if args.json:
-        output = render_json(components, deps, depths)
+        output = render_json(components, deps, depths, closure)
     else:
         output = render_cue(components, deps, depths, package,
-                            Path(args.input).name, args.metadata)
+                            source, args.metadata, closure)
 
     # Write
     if args.output:
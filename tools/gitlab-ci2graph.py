@@ -3,6 +3,8 @@
 
 Maps GitLab CI stages and jobs to typed graph resources with both
 explicit (needs:) and implicit (stage ordering) dependency edges.
+extends: chains (including hidden .templates) are flattened, and
+parallel: / parallel:matrix jobs expand into one resource per instance.
 Precomputes topological depth via Kahn's algorithm.
 
 Usage:
@@ -21,6 +23,9 @@ Usage:
     # Explicit DAG only (skip implicit stage ordering edges)
     python tools/gitlab-ci2graph.py .gitlab-ci.yml --dag-only
 
+    # Add transitive ancestors/dependents to _precomputed
+    python tools/gitlab-ci2graph.py .gitlab-ci.yml --closure
+
 Output:
     CUE file with _resources (graph input) and _precomputed (depths),
     ready to wire into patterns.#InfraGraph.
@@ -36,6 +41,8 @@ import re
 import sys
 from pathlib import Path
 
+from lib.adapter import closure_cue_lines, compute_closure, compute_depths
+
 # Try PyYAML first, fall back to a minimal parser
 try:
     import yaml
@@ -92,9 +99,123 @@ def to_safe_id(s: str) -> str:
 # Pipeline parsing
 # ---------------------------------------------------------------------------
 
+MAX_EXTENDS_DEPTH = 11  # GitLab's own nesting limit
+
+
+def _deep_merge(base: dict, override: dict) -> dict:
+    """Merge like GitLab extends: hashes merge deeply, everything else replaces."""
+    merged = dict(base)
+    for k, v in override.items():
+        if isinstance(v, dict) and isinstance(merged.get(k), dict):
+            merged[k] = _deep_merge(merged[k], v)
+        else:
+            merged[k] = v
+    return merged
+
+
+def resolve_extends(ci: dict) -> dict:
+    """Return {key: definition} with extends: chains flattened.
+
+    Templates that are not in the file (e.g. from include:) are skipped
+    with a warning; cycles and over-deep nesting raise ValueError. Each
+    definition (job or hidden template) is resolved once and
+    memoized, so shared templates cost O(1) per job that extends them.
+    Later entries in an extends list take precedence; the job's own keys
+    win over everything it extends.
+    """
+    resolved: dict[str, dict] = {}
+    resolving: list[str] = []
+
+    def resolve(key: str) -> dict:
+        if key in resolved:
+            return resolved[key]
+        value = ci.get(key)
+        if not isinstance(value, dict):
+            # Typically a template from an include: we can't see it.
+            print(f"WARNING: extends: unknown template '{key}'"
+                  f" (from '{resolving[-1]}'), ignoring", file=sys.stderr)
+            resolved[key] = {}
+            return resolved[key]
+        parents = value.get("extends")
+        if not parents:
+            resolved[key] = value
+            return value
+        if key in resolving:
+            chain = " -> ".join(resolving[resolving.index(key):] + [key])
+            raise ValueError(f"extends: circular dependency {chain}")
+        if len(resolving) >= MAX_EXTENDS_DEPTH:
+            raise ValueError(f"extends: nesting deeper than {MAX_EXTENDS_DEPTH} at '{key}'")
+        resolving.append(key)
+        merged: dict = {}
+        for parent in [parents] if isinstance(parents, str) else parents:
+            merged = _deep_merge(merged, resolve(parent))
+        resolving.pop()
+        merged = _deep_merge(merged, value)
+        merged.pop("extends", None)
+        resolved[key] = merged
+        return merged
+
+    return {
+        key: resolve(key) if isinstance(value, dict) and value.get("extends") else value
+        for key, value in ci.items()
+    }
+
+
+def expand_parallel(name: str, job: dict) -> list[tuple[str, dict]]:
+    """Expand parallel: N and parallel:matrix into GitLab's job instance names.
+
+    Returns [(instance_name, variables)]; a plain job yields [(name, {})].
+    """
+    parallel = job.get("parallel")
+    if isinstance(parallel, int) and parallel > 1:
+        return [(f"{name} {i}/{parallel}", {}) for i in range(1, parallel + 1)]
+    if not isinstance(parallel, dict) or not parallel.get("matrix"):
+        return [(name, {})]
+
+    instances = []
+    for row in parallel["matrix"]:
+        combos: list[dict] = [{}]
+        for var, values in row.items():
+            values = values if isinstance(values, list) else [values]
+            combos = [{**c, var: str(v)} for c in combos for v in values]
+        for combo in combos:
+            instances.append((f"{name}: [{', '.join(combo.values())}]", combo))
+    return instances
+
+
+def _is_job(key: str, value) -> bool:
+    if key in RESERVED_KEYS or key.startswith(".") or not isinstance(value, dict):
+        return False
+    return "script" in value or "trigger" in value or "extends" in value
+
+
+def _need_targets(need, instances: dict) -> list[str]:
+    """Job IDs a needs: entry points at (all instances of a parallel job)."""
+    if isinstance(need, str):
+        name, matrix = need, None
+    elif isinstance(need, dict):
+        name, matrix = need.get("job", ""), (need.get("parallel") or {}).get("matrix")
+    else:
+        return []
+    if name not in instances:
+        return [to_safe_id(name)] if name else []
+    if not matrix:
+        return [jid for jid, _ in instances[name]]
+    wanted = []
+    for row in matrix:
+        row = {k: str(v) for k, v in row.items()}
+        wanted += [jid for jid, env in instances[name]
+                   if all(env.get(k) == v for k, v in row.items())]
+    return wanted
+
+
 def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
     """Parse .gitlab-ci.yml into resources and dependency edges.
 
+    Linear in the number of jobs (plus edges emitted): extends: chains
+    are resolved once per definition and jobs are indexed by stage
+    before any edges are built.
+
     Returns: (components dict, deps dict)
     """
     components = {}
@@ -116,6 +237,7 @@ def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
         if i > 0:
             prev_sid = to_safe_id(f"stage-{stages[i - 1]}")
             deps[sid] = {prev_sid: True}
+    stage_pos = {name: i for i, name in enumerate(stages)}
 
     # Pipeline resource
     pipeline_id = "pipeline"
@@ -124,23 +246,23 @@ def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
         "@type": {"CIPipeline": True},
     }
 
-    # Extract jobs
-    global_vars = ci.get("variables", {})
-    defaults = ci.get("default", {})
+    # Pass 1: resolve templates, expand parallel jobs, index by stage.
+    resolved = resolve_extends(ci)
+    jobs = []            # (job_id, resolved definition)
+    instances = {}       # job name -> [(job_id, matrix variables)]
+    stage_jobs = collections.defaultdict(list)
 
-    for key, value in ci.items():
-        if key in RESERVED_KEYS:
-            continue
-        if not isinstance(value, dict):
-            continue
-        if key.startswith("."):
-            # Hidden job / template — skip for now (no execution)
-            continue
-        if "script" not in value and "trigger" not in value and "extends" not in value:
-            # Not a job definition
+    for key, raw in ci.items():
+        if not _is_job(key, raw):
             continue
-
-        job_id = to_safe_id(key)
+        value = resolved[key]
+        instances[key] = [(to_safe_id(inst), env) for inst, env in expand_parallel(key, value)]
+        for job_id, _ in instances[key]:
+            jobs.append((job_id, value))
+            stage_jobs[value.get("stage", "test")].append(job_id)
+
+    # Pass 2: components and edges.
+    for job_id, value in jobs:
         job_stage = value.get("stage", "test")
         stage_sid = stage_ids.get(job_stage)
 
@@ -149,9 +271,6 @@ def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
             "@type": {"CIJob": True},
         }
 
-        if value.get("trigger"):
-            entry["@type"]["CIJob"] = True
-
         if value.get("environment"):
             env = value["environment"]
             if isinstance(env, str):
@@ -174,29 +293,15 @@ def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
         needs = value.get("needs", None)
         if needs is not None:
             for need in needs:
-                if isinstance(need, str):
-                    need_id = to_safe_id(need)
-                elif isinstance(need, dict):
-                    need_id = to_safe_id(need.get("job", ""))
-                else:
-                    continue
-                if need_id:
+                for need_id in _need_targets(need, instances):
                     job_deps[need_id] = True
 
         elif not dag_only and stage_sid:
             # Implicit stage ordering: job depends on all jobs in previous stage
-            stage_idx = stages.index(job_stage) if job_stage in stages else -1
+            stage_idx = stage_pos.get(job_stage, -1)
             if stage_idx > 0:
-                prev_stage = stages[stage_idx - 1]
-                # Find all jobs in previous stage
-                for other_key, other_value in ci.items():
-                    if other_key in RESERVED_KEYS or not isinstance(other_value, dict):
-                        continue
-                    if other_key.startswith("."):
-                        continue
-                    if other_value.get("stage", "test") == prev_stage:
-                        if "script" in other_value or "trigger" in other_value:
-                            job_deps[to_safe_id(other_key)] = True
+                for other_id in stage_jobs.get(stages[stage_idx - 1], ()):
+                    job_deps[other_id] = True
 
         # Job also depends on its stage
         if stage_sid:
@@ -208,47 +313,6 @@ def parse_pipeline(ci: dict, dag_only: bool = False) -> tuple:
     return components, deps
 
 
-# ---------------------------------------------------------------------------
-# Topological sort (Kahn's algorithm)
-# ---------------------------------------------------------------------------
-
-def compute_depths(components: dict, deps: dict) -> dict:
-    """Compute topological depth for each node."""
-    in_degree = {cid: 0 for cid in components}
-    forward = collections.defaultdict(list)
-
-    for cid, dep_map in deps.items():
-        for dep_id in dep_map:
-            if dep_id in components:
-                forward[dep_id].append(cid)
-        in_degree[cid] = len([d for d in dep_map if d in components])
-
-    depth = {}
-    queue = collections.deque()
-    for cid in components:
-        if in_degree.get(cid, 0) == 0:
-            queue.append(cid)
-            depth[cid] = 0
-
-    while queue:
-        node = queue.popleft()
-        for dependent in forward[node]:
-            new_depth = depth[node] + 1
-            if dependent not in depth or new_depth > depth[dependent]:
-                depth[dependent] = new_depth
-            in_degree[dependent] -= 1
-            if in_degree[dependent] == 0:
-                queue.append(dependent)
-
-    if len(depth) < len(components):
-        max_d = max(depth.values()) if depth else 0
-        for cid in components:
-            if cid not in depth:
-                depth[cid] = max_d + 1
-
-    return depth
-
-
 # ---------------------------------------------------------------------------
 # Output
 # ---------------------------------------------------------------------------
@@ -258,7 +322,8 @@ def escape_cue_string(s: str) -> str:
 
 
 def render_cue(components: dict, deps: dict, depths: dict,
-               package: str, source: str, include_metadata: bool) -> str:
+               package: str, source: str, include_metadata: bool,
+               closure: tuple[dict, dict] | None = None) -> str:
     lines = []
     lines.append(f'// {package} — generated from GitLab CI pipeline')
     lines.append(f'// Source: {source}')
@@ -305,9 +370,12 @@ def render_cue(components: dict, deps: dict, depths: dict,
 
     lines.append(f'_precomputed: {{')
     lines.append(f'\tdepth: {{')
-    for cid in sorted(depths, key=lambda k: (depths[k], k)):
+    ordered = sorted(depths, key=lambda k: (depths[k], k))
+    for cid in ordered:
         lines.append(f'\t\t"{cid}": {depths[cid]}')
     lines.append(f'\t}}')
+    if closure is not None:
+        lines.extend(closure_cue_lines(closure, ordered))
     lines.append(f'}}')
     lines.append(f'')
 
@@ -319,8 +387,12 @@ def render_cue(components: dict, deps: dict, depths: dict,
     return "\n".join(lines) + "\n"
 
 
-def render_json(components: dict, deps: dict, depths: dict) -> str:
+def render_json(components: dict, deps: dict, depths: dict,
+                closure: tuple[dict, dict] | None = None) -> str:
     output = {"resources": {}, "precomputed": {"depth": depths}}
+    if closure is not None:
+        output["precomputed"]["ancestors"] = closure[0]
+        output["precomputed"]["dependents"] = closure[1]
     for cid, comp in components.items():
         entry = {"name": cid, "@type": comp["@type"]}
         if cid in deps:
@@ -351,12 +423,21 @@ def main():
     parser.add_argument("--dag-only", action="store_true",
                         help="Only use explicit needs: edges (skip implicit stage ordering)")
     parser.add_argument("--stats", action="store_true", help="Print stats to stderr")
+    parser.add_argument("--closure", action="store_true",
+                        help="Also emit precomputed ancestors/dependents "
+                             "(one entry per reachable pair: output grows "
+                             "roughly with nodes × average reach)")
 
     args = parser.parse_args()
 
     ci = load_yaml(args.input)
-    components, deps_map = parse_pipeline(ci, dag_only=args.dag_only)
+    try:
+        components, deps_map = parse_pipeline(ci, dag_only=args.dag_only)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        sys.exit(1)
     depths = compute_depths(components, deps_map)
+    closure = compute_closure(components, deps_map) if args.closure else None
 
     package = args.package
     if not package:
@@ -378,10 +459,10 @@ def main():
         print(f"Max depth: {max_depth}", file=sys.stderr)
 
     if args.json:
-        output = render_json(components, deps_map, depths)
+        output = render_json(components, deps_map, depths, closure)
     else:
         output = render_cue(components, deps_map, depths, package,
-                            Path(args.input).name, args.metadata)
+                            Path(args.input).name, args.metadata, closure)
 
     if args.output:
         Path(args.output).parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Diff two exported graph snapshots without loading either one whole.
+
+Compares a before and an after snapshot (a _resources map, or adapter
+--json output) and reports what a change review needs:
+
+    added_nodes, removed_nodes   {id: @type}                 (#GraphDiff)
+    type_changes                 {id: {added_types, removed_types}}
+    added_edges, removed_edges   [{source: dependency, target: dependent}]
+    metadata_changes             {id: {field: {before, after}}}
+    modified                     [{resourceName, typeChanged, depsChanged,
+                                   metadataChanged}]         (#ChangeReport)
+    blast_radius                 {id: {before, after, delta}}
+    summary                      counts, has_changes
+
+The first five match apercue's #GraphDiff and the summary carries the
+#ChangeReport totals, so the JSON can be unified into CUE directly.
+blast_radius counts transitive dependents of every touched resource
+(changed, added, removed, or the dependency end of a changed edge) in
+both snapshots and lists the ones whose count moved. Each snapshot's
+counts come from a single pass over its edges, with one bit per touched
+resource, rather than one BFS per resource.
+
+Each snapshot is parsed incrementally, sorted by id in bounded runs
+spilled to a temporary directory, and merge-joined, so at most one run
+of resource bodies is held in memory. Only the id table and the edges
+(as a CSRGraph) are kept whole, for the blast-radius pass.
+
+Usage:
+    python3 tools/graphdiff.py before.json after.json
+
+    # Snapshots from cue export
+    cue export ./examples/datacenter/ -e _resources > after.json
+    python3 tools/graphdiff.py before.json after.json -o diff.json
+
+    # Large snapshots: smaller sort runs, skip the blast-radius pass
+    python3 tools/graphdiff.py old.json new.json --run-size 20000 --blast-limit 0
+
+    # Exit 1 when the snapshots differ
+    python3 tools/graphdiff.py before.json after.json --check
+
+Zero dependencies — stdlib Python only.
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import IO, Iterator
+
+from lib.csr import CSRGraph
+from lib.jsonstream import iter_map_items
+
+DEFAULT_RUN_SIZE = 50_000
+DEFAULT_BLAST_LIMIT = 10_000
+
+_STRUCTURAL = ("name", "@type", "depends_on")
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+
+def iter_resources(fp: IO[str]) -> Iterator[tuple[str, dict]]:
+    """Yield (id, resource) from a _resources map or adapter --json output.
+
+    Adapter output always starts with its "resources" key, so a leading
+    "resources" map of resources is unwrapped and the rest
+    ("precomputed") is skipped. A resource whose id is "resources" is
+    not mistaken for the wrapper: its values are fields, not resources.
+    """
+    for rid, res in iter_map_items(fp, unwrap="resources"):
+        if isinstance(res, dict):
+            yield rid, res
+
+
+def _dump_run(items: list, tmpdir: str) -> str:
+    items.sort(key=lambda item: item[0])
+    with tempfile.NamedTemporaryFile("w", dir=tmpdir, suffix=".jsonl", delete=False) as f:
+        for item in items:
+            f.write(json.dumps(item, separators=(",", ":")))
+            f.write("\n")
+    return f.name
+
+
+def _read_run(path: str) -> Iterator[list]:
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def sorted_resources(path: str, tmpdir: str,
+                     run_size: int = DEFAULT_RUN_SIZE) -> Iterator[tuple[str, dict]]:
+    """(id, resource) from path in id order, via an external merge sort.
+
+    Runs of run_size resources are sorted and spilled to tmpdir, then
+    merged with heapq.merge. A snapshot that fits in one run never
+    touches disk. A repeated id keeps its last value, like json.load.
+    """
+    runs: list[str] = []
+    items: list = []
+    with open(path) as f:
+        for item in iter_resources(f):
+            items.append(item)
+            if len(items) >= run_size:
+                runs.append(_dump_run(items, tmpdir))
+                items = []
+    if runs:
+        if items:
+            runs.append(_dump_run(items, tmpdir))
+        # heapq.merge is stable across runs, which are in input order.
+        stream = heapq.merge(*(_read_run(r) for r in runs), key=lambda item: item[0])
+    else:
+        items.sort(key=lambda item: item[0])
+        stream = iter(items)
+
+    pending = None
+    for rid, res in stream:
+        if pending is not None and pending[0] != rid:
+            yield pending
+        pending = (rid, res)
+    if pending is not None:
+        yield pending
+
+
+def _keys(value) -> dict:
+    """@type / depends_on as an ordered {key: True} (maps or lists)."""
+    return dict.fromkeys(value or {}, True)
+
+
+class _EdgeRows:
+    """Collects depends_on rows while streaming, for CSRGraph.from_rows."""
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        self.entries = array("i")
+        self.row_offsets = array("i", [0])
+        self.row_targets = array("i")
+
+    def _intern(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def add(self, rid: str, deps: dict) -> None:
+        self.entries.append(self._intern(rid))
+        self.row_targets.extend(self._intern(d) for d in deps)
+        self.row_offsets.append(len(self.row_targets))
+
+    def graph(self) -> CSRGraph:
+        return CSRGraph.from_rows(self.names, self.entries, self.row_offsets, self.row_targets)
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+def _merge_join(before: Iterator, after: Iterator) -> Iterator[tuple[str, dict | None, dict | None]]:
+    """(id, before resource or None, after resource or None) in id order."""
+    b = next(before, None)
+    a = next(after, None)
+    while b is not None or a is not None:
+        if a is None or (b is not None and b[0] < a[0]):
+            yield b[0], b[1], None
+            b = next(before, None)
+        elif b is None or a[0] < b[0]:
+            yield a[0], None, a[1]
+            a = next(after, None)
+        else:
+            yield a[0], b[1], a[1]
+            b = next(before, None)
+            a = next(after, None)
+
+
+def _dependent_counts(graph: CSRGraph, rids: list[str]) -> dict[str, int]:
+    """Transitive dependent count per rid (0 for ids not in graph)."""
+    present = [rid for rid in rids if rid in graph.index]
+    counts = graph.dependent_counts([graph.index[rid] for rid in present])
+    return {rid: 0 for rid in rids} | dict(zip(present, counts))
+
+
+def diff_streams(before: Iterator, after: Iterator,
+                 blast_limit: int = DEFAULT_BLAST_LIMIT) -> dict:
+    """Diff two id-ordered (id, resource) streams.
+
+    blast_limit caps how many touched resources get a blast-radius count
+    (each is one bit of CSRGraph.dependent_counts); 0 skips the pass.
+    """
+    added_nodes: dict = {}
+    removed_nodes: dict = {}
+    type_changes: dict = {}
+    added_edges: list = []
+    removed_edges: list = []
+    metadata_changes: dict = {}
+    modified: list = []
+    touched: dict = {}
+    rows_before, rows_after = _EdgeRows(), _EdgeRows()
+    total_before = total_after = 0
+
+    for rid, old, new in _merge_join(before, after):
+        old_deps = _keys(old.get("depends_on")) if old is not None else {}
+        new_deps = _keys(new.get("depends_on")) if new is not None else {}
+        if old is not None:
+            total_before += 1
+            rows_before.add(rid, old_deps)
+        if new is not None:
+            total_after += 1
+            rows_after.add(rid, new_deps)
+
+        gained = [d for d in new_deps if d not in old_deps]
+        lost = [d for d in old_deps if d not in new_deps]
+        added_edges += ({"source": d, "target": rid} for d in gained)
+        removed_edges += ({"source": d, "target": rid} for d in lost)
+        touched.update(dict.fromkeys(gained, True))
+        touched.update(dict.fromkeys(lost, True))
+
+        if old is None:
+            added_nodes[rid] = _keys(new.get("@type"))
+            touched[rid] = True
+            continue
+        if new is None:
+            removed_nodes[rid] = _keys(old.get("@type"))
+            touched[rid] = True
+            continue
+
+        old_types, new_types = _keys(old.get("@type")), _keys(new.get("@type"))
+        if old_types != new_types:
+            type_changes[rid] = {
+                "added_types": {t: True for t in new_types if t not in old_types},
+                "removed_types": {t: True for t in old_types if t not in new_types},
+            }
+        fields = {}
+        for k in {**old, **new}:
+            if k in _STRUCTURAL or old.get(k) == new.get(k):
+                continue
+            change = {}
+            if k in old:
+                change["before"] = old[k]
+            if k in new:
+                change["after"] = new[k]
+            fields[k] = change
+        if fields:
+            metadata_changes[rid] = fields
+        if rid in type_changes or gained or lost or fields:
+            modified.append({
+                "resourceName": rid,
+                "typeChanged": rid in type_changes,
+                "depsChanged": bool(gained or lost),
+                "metadataChanged": bool(fields),
+            })
+            touched[rid] = True
+
+    blast: dict = {}
+    blast_skipped = bool(touched) and not 0 < len(touched) <= blast_limit
+    if touched and not blast_skipped:
+        rids = sorted(touched)
+        counts_before = _dependent_counts(rows_before.graph(), rids)
+        counts_after = _dependent_counts(rows_after.graph(), rids)
+        for rid in rids:
+            n_before, n_after = counts_before[rid], counts_after[rid]
+            if n_before != n_after:
+                blast[rid] = {"before": n_before, "after": n_after, "delta": n_after - n_before}
+
+    changes = len(added_nodes) + len(removed_nodes) + len(modified)
+    summary = {
+        "added_node_count": len(added_nodes),
+        "removed_node_count": len(removed_nodes),
+        "type_change_count": len(type_changes),
+        "added_edge_count": len(added_edges),
+        "removed_edge_count": len(removed_edges),
+        "metadata_change_count": len(metadata_changes),
+        "modified_count": len(modified),
+        "blast_radius_change_count": len(blast),
+        "blast_radius_skipped": blast_skipped,
+        "total_previous": total_before,
+        "total_current": total_after,
+        "total_changes": changes,
+        "change_percentage": changes * 100 // total_before if total_before else 0,
+        "has_changes": changes > 0,
+    }
+    return {
+        "added_nodes": added_nodes,
+        "removed_nodes": removed_nodes,
+        "type_changes": type_changes,
+        "added_edges": added_edges,
+        "removed_edges": removed_edges,
+        "metadata_changes": metadata_changes,
+        "modified": modified,
+        "blast_radius": blast,
+        "summary": summary,
+    }
+
+
+def diff_files(before: str, after: str, run_size: int = DEFAULT_RUN_SIZE,
+               blast_limit: int = DEFAULT_BLAST_LIMIT) -> dict:
+    """Diff two snapshot files (see module docstring for the result shape)."""
+    with tempfile.TemporaryDirectory(prefix="graphdiff-") as tmpdir:
+        return diff_streams(
+            sorted_resources(before, tmpdir, run_size),
+            sorted_resources(after, tmpdir, run_size),
+            blast_limit,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Diff two exported #InfraGraph snapshots",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("before", help="Previous snapshot (_resources JSON or adapter --json)")
+    parser.add_argument("after", help="Current snapshot")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--run-size", type=int, default=DEFAULT_RUN_SIZE,
+                        help=f"Resources per sorted run held in memory (default: {DEFAULT_RUN_SIZE})")
+    parser.add_argument("--blast-limit", type=int, default=DEFAULT_BLAST_LIMIT,
+                        help="Skip blast radius when more resources are touched "
+                             f"(default: {DEFAULT_BLAST_LIMIT}; 0 disables)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the snapshots differ")
+    parser.add_argument("--stats", action="store_true", help="Print summary to stderr")
+
+    args = parser.parse_args()
+    if args.run_size < 1:
+        parser.error("--run-size must be at least 1")
+
+    try:
+        result = diff_files(args.before, args.after, args.run_size, args.blast_limit)
+    except (OSError, ValueError) as e:  # JSONDecodeError is a ValueError
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+    summary = result["summary"]
+
+    if args.stats:
+        for key, value in summary.items():
+            print(f"{key}: {value}", file=sys.stderr)
+
+    output = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+        print(f"Wrote {args.output} ({summary['total_changes']} changes)", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+
+    if args.check and summary["has_changes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,7 @@ class HelmAdapter(BaseAdapter):
     name = "helm"
     description = "Convert Helm Chart.yaml to #InfraGraph"
     metadata_fields = ["version", "appVersion", "chartType", "repository"]
+    input_patterns = ("Chart.yaml",)
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         """Add Helm-specific CLI arguments."""
@@ -57,6 +58,16 @@ class HelmAdapter(BaseAdapter):
             help="Walk charts/ subdirectory to include local sub-charts"
         )
 
+    def cache_inputs(self, path: str, args: argparse.Namespace) -> list[str]:
+        """Chart.yaml, its Chart.lock, and local sub-charts with --recursive."""
+        chart_dir = Path(path).parent
+        files = [path]
+        if (chart_dir / "Chart.lock").exists():
+            files.append(str(chart_dir / "Chart.lock"))
+        if args.recursive:
+            files += sorted(str(p) for p in (chart_dir / "charts").glob("**/Chart.*"))
+        return files
+
     def parse(self, path: str, args: argparse.Namespace) -> tuple[dict, dict]:
         """Parse Chart.yaml and optional Chart.lock, return (components, deps)."""
         # Try to import PyYAML
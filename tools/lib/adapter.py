@@ -3,7 +3,8 @@
 Shared utilities for converting external specs (CycloneDX, GitLab CI,
 SPDX, STIX, Helm, etc.) into #InfraGraph input. Each adapter implements
 a parse function that returns (components, deps); this module handles
-everything else: ID sanitization, Kahn's depth, CUE/JSON rendering, CLI.
+everything else: ID sanitization, Kahn's depth, transitive closure,
+CUE/JSON/JSON-LD rendering, CLI.
 
 Usage in an adapter:
 
@@ -26,10 +27,18 @@ The deps dict maps safe_id -> {dep_safe_id: True, ...}.
 
 import argparse
 import collections
+import glob
+import gzip
 import json
+import os
 import re
+import shutil
 import sys
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from lib.cache import ContentCache, default_cache_dir, digest, file_digest
+from lib.csr import CSRGraph
 
 
 # ---------------------------------------------------------------------------
@@ -62,6 +71,8 @@ def compute_depths(components: dict, deps: dict) -> dict:
     A node's depth = max(depth of its dependencies) + 1.
     Handles cycles by assigning max_depth + 1.
     """
+    if isinstance(deps, CSRGraph):
+        return deps.depths()
     in_degree = {cid: 0 for cid in components}
     forward = collections.defaultdict(list)
 
@@ -100,6 +111,222 @@ def compute_depths(components: dict, deps: dict) -> dict:
     return depth
 
 
+# ---------------------------------------------------------------------------
+# Transitive closure (integer bitsets over topological order)
+# ---------------------------------------------------------------------------
+
+def topological_order(components: dict, deps: dict) -> tuple[list, list]:
+    """Kahn's order over components, dependencies first.
+
+    Returns (order, cyclic): nodes Kahn could place, and the leftovers
+    that sit on or behind a cycle (in input order).
+    """
+    in_degree = {cid: 0 for cid in components}
+    forward = collections.defaultdict(list)
+    for cid, dep_map in deps.items():
+        if cid not in components:
+            continue
+        for dep_id in dep_map:
+            if dep_id in components:
+                forward[dep_id].append(cid)
+                in_degree[cid] += 1
+
+    order = [cid for cid in components if in_degree[cid] == 0]
+    i = 0
+    while i < len(order):
+        for dependent in forward[order[i]]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                order.append(dependent)
+        i += 1
+
+    placed = set(order)
+    cyclic = [cid for cid in components if cid not in placed]
+    return order, cyclic
+
+
+def closure_bitsets(components: dict, deps: dict) -> tuple[list, list, list]:
+    """Compute ancestor and dependent sets as Python int bitsets.
+
+    Bit i stands for ids[i], where ids is the topological order (cyclic
+    leftovers appended). One pass in order ORs each node's dependencies'
+    ancestor sets; one pass in reverse does the same for dependents.
+    Cyclic leftovers are iterated to a fixpoint. A node is never its own
+    ancestor or dependent.
+
+    Returns (ids, ancestors, dependents), the latter two indexed like ids.
+    """
+    order, cyclic = topological_order(components, deps)
+    ids = order + cyclic
+    index = {cid: i for i, cid in enumerate(ids)}
+
+    parents = [
+        [index[d] for d in deps.get(cid, {}) if d in index]
+        for cid in ids
+    ]
+    children: list[list[int]] = [[] for _ in ids]
+    for i, ps in enumerate(parents):
+        for p in ps:
+            children[p].append(i)
+
+    n = len(ids)
+    anc = [0] * n
+    for i in range(n):
+        bits = 0
+        for p in parents[i]:
+            bits |= anc[p] | (1 << p)
+        anc[i] = bits
+
+    desc = [0] * n
+    for i in range(n - 1, -1, -1):
+        bits = 0
+        for c in children[i]:
+            bits |= desc[c] | (1 << c)
+        desc[i] = bits
+
+    if cyclic:
+        tail = range(len(order), n)
+        changed = True
+        while changed:
+            changed = False
+            for i in tail:
+                bits = anc[i]
+                for p in parents[i]:
+                    bits |= anc[p] | (1 << p)
+                if bits != anc[i]:
+                    anc[i], changed = bits, True
+        # Forward closure of cyclic nodes feeds their dependents; rebuild
+        # descendants from ancestors so both views agree.
+        desc = [0] * n
+        for i, bits in enumerate(anc):
+            bit = 1 << i
+            while bits:
+                low = bits & -bits
+                desc[low.bit_length() - 1] |= bit
+                bits ^= low
+        for i in range(n):
+            anc[i] &= ~(1 << i)
+            desc[i] &= ~(1 << i)
+
+    return ids, anc, desc
+
+
+def bits_to_ids(bits: int, ids: list) -> list:
+    """Decode a bitset into the ids it contains (in bit order)."""
+    out = []
+    while bits:
+        low = bits & -bits
+        out.append(ids[low.bit_length() - 1])
+        bits ^= low
+    return out
+
+
+def compute_closure(components: dict, deps: dict) -> tuple[dict, dict]:
+    """Transitive ancestors and dependents for every node.
+
+    Returns (ancestors, dependents), each {safe_id: {other_id: True}} —
+    the shape #InfraGraph accepts as Precomputed.ancestors/dependents.
+    """
+    ids, anc, desc = closure_bitsets(components, deps)
+    ancestors = {}
+    dependents = {}
+    for i, cid in enumerate(ids):
+        ancestors[cid] = dict.fromkeys(bits_to_ids(anc[i], ids), True)
+        dependents[cid] = dict.fromkeys(bits_to_ids(desc[i], ids), True)
+    return ancestors, dependents
+
+
+# ---------------------------------------------------------------------------
+# Multiple inputs
+# ---------------------------------------------------------------------------
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def expand_inputs(specs: list[str], patterns: tuple[str, ...] = ("*.json",)) -> list[str]:
+    """Expand input arguments into a deterministic list of paths.
+
+    Glob arguments expand (recursively with **), directories are searched
+    recursively for files matching patterns, anything else is kept as is.
+    Each expansion is sorted; duplicates keep their first position.
+    """
+    paths: dict[str, None] = {}
+    for spec in specs:
+        if _GLOB_CHARS.search(spec):
+            found = sorted(glob.glob(spec, recursive=True))
+        elif Path(spec).is_dir():
+            found = sorted({str(p) for pat in patterns for p in Path(spec).rglob(pat)
+                            if p.is_file()})
+        else:
+            found = [spec]
+        for path in found:
+            paths.setdefault(path, None)
+    return list(paths)
+
+
+def _parse_one(parse: Callable, path: str, *args) -> tuple[dict, dict]:
+    try:
+        return parse(path, *args)
+    except Exception as exc:
+        # Worker tracebacks don't survive pickling well; name the file.
+        raise RuntimeError(f"{path}: {type(exc).__name__}: {exc}") from exc
+
+
+def parse_inputs(parse: Callable, paths: list[str], *args,
+                 jobs: int | None = None) -> Iterator[tuple[dict, dict]]:
+    """Yield parse(path, *args) for each path, in input order.
+
+    With more than one path and jobs != 1 the parses run in a process
+    pool; parse and args must be picklable (a module-level function or
+    a method of a module-level class).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            yield _parse_one(parse, path, *args)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=min(jobs, n)) as pool:
+        yield from pool.map(_parse_one, [parse] * n, paths, *([a] * n for a in args),
+                            chunksize=max(1, n // (jobs * 8)))
+
+
+def merge_graphs(graphs: Iterable[tuple[dict, dict]]) -> tuple[dict, dict, int]:
+    """Merge (components, deps) pairs into one graph.
+
+    A safe ID seen in several inputs is one resource: its @type and
+    depends_on sets are unioned, and for every other field the first
+    input (in input order) that sets it wins. Returns
+    (components, deps, conflicts), where conflicts counts IDs whose
+    later occurrences disagreed on a field.
+    """
+    components: dict = {}
+    deps: dict = {}
+    conflicted: set = set()
+    for comps, dep_map in graphs:
+        for cid, comp in comps.items():
+            have = components.get(cid)
+            if have is None:
+                components[cid] = {**comp, "@type": dict(comp["@type"])}
+                continue
+            have["@type"].update(comp["@type"])
+            for k, v in comp.items():
+                if k == "@type":
+                    continue
+                if k not in have:
+                    have[k] = v
+                elif have[k] != v:
+                    conflicted.add(cid)
+        for cid, ds in dep_map.items():
+            if cid in deps:
+                deps[cid].update(ds)
+            else:
+                deps[cid] = dict(ds)
+    return components, deps, len(conflicted)
+
+
 # ---------------------------------------------------------------------------
 # CUE rendering
 # ---------------------------------------------------------------------------
@@ -109,101 +336,340 @@ def escape_cue_string(s: str) -> str:
     return s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
 
 
-def render_cue(components: dict, deps: dict, depths: dict,
-               package: str, source: str, header_lines: list[str] | None = None,
-               metadata_fields: list[str] | None = None) -> str:
-    """Render components and deps as a CUE file with #InfraGraph wiring.
+def iter_cue(components: dict, deps: dict, depths: dict,
+             package: str, source: str, header_lines: list[str] | None = None,
+             metadata_fields: list[str] | None = None,
+             closure: tuple[dict, dict] | None = None) -> Iterator[str]:
+    """Yield the CUE file line by line (each with its trailing newline).
 
-    Args:
-        components: {safe_id: {name, @type, ...}}
-        deps: {safe_id: {dep_id: True, ...}}
-        depths: {safe_id: int}
-        package: CUE package name
-        source: Source filename for the header comment
-        header_lines: Additional header comment lines
-        metadata_fields: Field names to include from components (beyond name/@type/depends_on)
+    Same arguments as render_cue; use with write_output to stream large
+    graphs straight to a file handle.
     """
     if metadata_fields is None:
         metadata_fields = []
 
-    lines = []
-    lines.append(f"// {package} — generated from {source}")
+    yield f"// {package} — generated from {source}\n"
     if header_lines:
         for hl in header_lines:
-            lines.append(f"// {hl}")
-    lines.append(f"//")
-    lines.append(f"// Components: {len(components)}")
-    lines.append(f"// Generated by: quicue.ca adapter toolkit")
-    lines.append(f"")
-    lines.append(f"package {package}")
-    lines.append(f"")
-    lines.append(f"import (")
-    lines.append(f'\t"quicue.ca/patterns@v0"')
-    lines.append(f")")
-    lines.append(f"")
+            yield f"// {hl}\n"
+    yield "//\n"
+    yield f"// Components: {len(components)}\n"
+    yield "// Generated by: quicue.ca adapter toolkit\n"
+    yield "\n"
+    yield f"package {package}\n"
+    yield "\n"
+    yield "import (\n"
+    yield '\t"quicue.ca/patterns@v0"\n'
+    yield ")\n"
+    yield "\n"
 
     # Resources
-    lines.append(f"_resources: {{")
+    yield "_resources: {\n"
     for cid in sorted(components, key=lambda k: depths.get(k, 0)):
         comp = components[cid]
-        lines.append(f'\t"{cid}": {{')
-        lines.append(f'\t\tname: "{cid}"')
+        yield f'\t"{cid}": {{\n'
+        yield f'\t\tname: "{cid}"\n'
 
         types = sorted(comp["@type"].keys())
         type_str = ", ".join(f"{t}: true" for t in types)
-        lines.append(f'\t\t"@type": {{{type_str}}}')
+        yield f'\t\t"@type": {{{type_str}}}\n'
 
         if cid in deps and deps[cid]:
             dep_ids = sorted(deps[cid].keys())
             dep_str = ", ".join(f'"{d}": true' for d in dep_ids)
-            lines.append(f"\t\tdepends_on: {{{dep_str}}}")
+            yield f"\t\tdepends_on: {{{dep_str}}}\n"
 
         for field in metadata_fields:
             val = comp.get(field)
             if val is None:
                 continue
             if isinstance(val, bool):
-                lines.append(f"\t\t{field}: {'true' if val else 'false'}")
+                yield f"\t\t{field}: {'true' if val else 'false'}\n"
             elif isinstance(val, (int, float)):
-                lines.append(f"\t\t{field}: {val}")
+                yield f"\t\t{field}: {val}\n"
             else:
-                lines.append(f'\t\t{field}: "{escape_cue_string(str(val))}"')
+                yield f'\t\t{field}: "{escape_cue_string(str(val))}"\n'
+
+        yield "\t}\n"
+
+    yield "}\n"
+    yield "\n"
+
+    # Precomputed depths (and closure)
+    ordered = sorted(depths, key=lambda k: (depths[k], k))
+    yield "_precomputed: {\n"
+    yield "\tdepth: {\n"
+    for cid in ordered:
+        yield f'\t\t"{cid}": {depths[cid]}\n'
+    yield "\t}\n"
+    if closure is not None:
+        for line in closure_cue_lines(closure, ordered):
+            yield line + "\n"
+    yield "}\n"
+    yield "\n"
 
-        lines.append(f"\t}}")
+    # Graph wiring
+    yield "infra: patterns.#InfraGraph & {\n"
+    yield "\tInput:       _resources\n"
+    yield "\tPrecomputed: _precomputed\n"
+    yield "}\n"
 
-    lines.append(f"}}")
-    lines.append(f"")
 
-    # Precomputed depths
-    lines.append(f"_precomputed: {{")
-    lines.append(f"\tdepth: {{")
-    for cid in sorted(depths, key=lambda k: (depths[k], k)):
-        lines.append(f'\t\t"{cid}": {depths[cid]}')
-    lines.append(f"\t}}")
-    lines.append(f"}}")
-    lines.append(f"")
+def closure_cue_lines(closure: tuple[dict, dict], ordered: list) -> list[str]:
+    """The ancestors and dependents blocks of _precomputed, one line each.
+
+    ordered is the node order of the depth block; members are sorted.
+    """
+    lines = []
+    for label, sets in zip(("ancestors", "dependents"), closure):
+        lines.append(f"\t{label}: {{")
+        for cid in ordered:
+            members = ", ".join(f'"{m}": true' for m in sorted(sets.get(cid, {})))
+            lines.append(f'\t\t"{cid}": {{{members}}}')
+        lines.append("\t}")
+    return lines
+
+
+def render_cue(components: dict, deps: dict, depths: dict,
+               package: str, source: str, header_lines: list[str] | None = None,
+               metadata_fields: list[str] | None = None,
+               closure: tuple[dict, dict] | None = None) -> str:
+    """Render components and deps as a CUE file with #InfraGraph wiring.
+
+    Args:
+        components: {safe_id: {name, @type, ...}}
+        deps: {safe_id: {dep_id: True, ...}}
+        depths: {safe_id: int}
+        package: CUE package name
+        source: Source filename for the header comment
+        header_lines: Additional header comment lines
+        metadata_fields: Field names to include from components (beyond name/@type/depends_on)
+        closure: (ancestors, dependents) from compute_closure, emitted into
+            _precomputed so CUE skips its recursive closure
+    """
+    return "".join(iter_cue(components, deps, depths, package, source,
+                            header_lines, metadata_fields, closure))
 
-    # Graph wiring
-    lines.append(f"infra: patterns.#InfraGraph & {{")
-    lines.append(f"\tInput:       _resources")
-    lines.append(f"\tPrecomputed: _precomputed")
-    lines.append(f"}}")
 
-    return "\n".join(lines) + "\n"
+def _json_entry(cid: str, comp: dict, deps: dict) -> dict:
+    entry = {"name": cid, "@type": comp["@type"]}
+    if cid in deps:
+        entry["depends_on"] = deps[cid]
+    for k, v in comp.items():
+        if k not in ("name", "@type"):
+            entry[k] = v
+    return entry
 
 
-def render_json(components: dict, deps: dict, depths: dict) -> str:
+def iter_json(components: dict, deps: dict, depths: dict,
+              closure: tuple[dict, dict] | None = None,
+              compact: bool = False) -> Iterator[str]:
+    """Yield the JSON document in pieces, one resource at a time.
+
+    The indented form is byte-identical to json.dumps(..., indent=2) of
+    the whole document; compact drops all optional whitespace. Only one
+    resource entry is materialized at a time.
+    """
+    precomputed = {"depth": depths}
+    if closure is not None:
+        precomputed["ancestors"] = closure[0]
+        precomputed["dependents"] = closure[1]
+
+    if compact:
+        dumps = lambda v: json.dumps(v, separators=(",", ":"))  # noqa: E731
+        yield '{"resources":{'
+        for i, (cid, comp) in enumerate(components.items()):
+            yield ("," if i else "") + dumps(cid) + ":" + dumps(_json_entry(cid, comp, deps))
+        yield '},"precomputed":' + dumps(precomputed) + "}\n"
+        return
+
+    # json.dumps(indent=2) never emits raw newlines inside strings, so a
+    # nested value can be indented by prefixing each of its lines.
+    def nested(v, pad: str) -> str:
+        return json.dumps(v, indent=2).replace("\n", "\n" + pad)
+
+    if components:
+        yield '{\n  "resources": {'
+        for i, (cid, comp) in enumerate(components.items()):
+            yield ("," if i else "") + "\n    " + json.dumps(cid) + ": " \
+                + nested(_json_entry(cid, comp, deps), "    ")
+        yield "\n  },"
+    else:
+        yield '{\n  "resources": {},'
+    yield '\n  "precomputed": ' + nested(precomputed, "  ") + "\n}\n"
+
+
+def render_json(components: dict, deps: dict, depths: dict,
+                closure: tuple[dict, dict] | None = None,
+                compact: bool = False) -> str:
     """Render as JSON for piping to other tools."""
-    output = {"resources": {}, "precomputed": {"depth": depths}}
-    for cid, comp in components.items():
-        entry = {"name": cid, "@type": comp["@type"]}
-        if cid in deps:
-            entry["depends_on"] = deps[cid]
-        for k, v in comp.items():
-            if k not in ("name", "@type"):
-                entry[k] = v
-        output["resources"][cid] = entry
-    return json.dumps(output, indent=2) + "\n"
+    return "".join(iter_json(components, deps, depths, closure, compact))
+
+
+# ---------------------------------------------------------------------------
+# JSON-LD rendering
+# ---------------------------------------------------------------------------
+
+DEFAULT_BASE_IRI = "https://infra.example.com/resources/"
+
+# The fixed part of vocab/context.cue; type terms are added per graph.
+JSONLD_CONTEXT = {
+    "quicue": "https://quicue.ca/vocab#",
+    "dcterms": "http://purl.org/dc/terms/",
+    "prov": "http://www.w3.org/ns/prov#",
+    "dcat": "http://www.w3.org/ns/dcat#",
+    "sh": "http://www.w3.org/ns/shacl#",
+    "schema": "https://schema.org/",
+    "time": "http://www.w3.org/2006/time#",
+    "earl": "http://www.w3.org/ns/earl#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "name": "dcterms:title",
+    "description": "dcterms:description",
+    "ip": "quicue:ipAddress",
+    "fqdn": "quicue:fqdn",
+    "ssh_user": "quicue:sshUser",
+    "host": "quicue:host",
+    "container_id": "quicue:containerId",
+    "vm_id": "quicue:vmId",
+    "depends_on": {"@id": "dcterms:requires", "@type": "@id"},
+    "hosted_on": {"@id": "quicue:hostedOn", "@type": "@id"},
+    "status": {"@id": "schema:actionStatus", "@type": "@id"},
+    "provides": {"@id": "quicue:provides", "@container": "@set"},
+    "tags": {"@id": "quicue:tags", "@container": "@set"},
+    "actions": {"@id": "quicue:hasAction", "@container": "@set"},
+}
+
+# Fields copied onto graph nodes: the jsonld projection in
+# examples/datacenter plus the other context terms. Anything else has no
+# IRI and would be dropped by a JSON-LD processor anyway.
+JSONLD_FIELDS = ("ip", "url", "fqdn", "host", "container_id", "vm_id", "ssh_user",
+                 "description", "hosted_on", "status", "provides", "tags")
+
+
+def jsonld_context(components: dict, base_iri: str = DEFAULT_BASE_IRI) -> dict:
+    """vocab.context["@context"] with @base, and a quicue: term per @type in use."""
+    types: dict = {}
+    for comp in components.values():
+        types.update(dict.fromkeys(comp["@type"]))
+    return {
+        "@base": base_iri,
+        **JSONLD_CONTEXT,
+        **{t: f"quicue:{t}" for t in types if t not in JSONLD_CONTEXT},
+    }
+
+
+def _jsonld_node(cid: str, comp: dict, deps: dict, base_iri: str) -> dict:
+    node = {"@id": base_iri + cid, "@type": list(comp["@type"]), "name": comp.get("name", cid)}
+    for k in JSONLD_FIELDS:
+        if k in comp:
+            node[k] = comp[k]
+    if cid in deps:
+        node["depends_on"] = list(deps[cid])  # relative IRIs, resolved against @base
+    return node
+
+
+def iter_jsonld(components: dict, deps: dict, base_iri: str = DEFAULT_BASE_IRI,
+                context: dict | str | None = None, compact: bool = False,
+                ids: Iterable[str] | None = None) -> Iterator[str]:
+    """Yield a JSON-LD document ({"@context", "@graph"}) one node at a time.
+
+    Nodes have the shape of the datacenter example's jsonld export:
+    absolute @id, @type terms, and depends_on as @id references.
+    context defaults to jsonld_context(); pass a dict (e.g. an exported
+    vocab context) or a URL string to use instead. ids restricts the
+    graph to those components, in that order.
+    """
+    if context is None:
+        context = jsonld_context(components, base_iri)
+    if compact:
+        dumps = lambda v: json.dumps(v, separators=(",", ":"))  # noqa: E731
+        ctx = dumps(context)
+        yield '{"@context":' + ctx + ',"@graph":['
+        first, sep, end = "", ",", "]}\n"
+    else:
+        dumps = lambda v: json.dumps(v, indent=2).replace("\n", "\n    ")  # noqa: E731
+        ctx = json.dumps(context, indent=2).replace("\n", "\n  ")
+        yield '{\n  "@context": ' + ctx + ',\n  "@graph": ['
+        first, sep, end = "\n    ", ",\n    ", "\n  ]\n}\n"
+    n = 0
+    for n, cid in enumerate(components if ids is None else ids, 1):
+        yield (sep if n > 1 else first) + dumps(_jsonld_node(cid, components[cid], deps, base_iri))
+    yield end if n or compact else "]\n}\n"
+
+
+def render_jsonld(components: dict, deps: dict, base_iri: str = DEFAULT_BASE_IRI,
+                  context: dict | str | None = None, compact: bool = False) -> str:
+    """Render the JSON-LD projection of the graph."""
+    return "".join(iter_jsonld(components, deps, base_iri, context, compact))
+
+
+def write_jsonld_chunks(components: dict, deps: dict, out_dir: str, chunk_nodes: int,
+                        base_iri: str = DEFAULT_BASE_IRI, context: dict | None = None,
+                        compress: bool = False) -> dict:
+    """Write the graph as compact JSON-LD, chunk_nodes nodes per file.
+
+    out_dir gets context.jsonld (the shared @context), graph-00000.jsonld
+    ... (each a standalone document whose @context references
+    context.jsonld) and index.json listing the chunks with their first
+    and last node ids. With compress every file but the index gets a
+    .gz suffix, to be served gzip-encoded under its plain name. Returns
+    the index.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    suffix = ".gz" if compress else ""
+    if context is None:
+        context = jsonld_context(components, base_iri)
+    write_output([json.dumps({"@context": context}, indent=2) + "\n"],
+                 str(out / f"context.jsonld{suffix}"), compress)
+
+    names = list(components)
+    chunks = []
+    for k, start in enumerate(range(0, len(names), chunk_nodes)):
+        ids = names[start:start + chunk_nodes]
+        file = f"graph-{k:05d}.jsonld{suffix}"
+        write_output(iter_jsonld(components, deps, base_iri, "context.jsonld",
+                                 compact=True, ids=ids),
+                     str(out / file), compress)
+        chunks.append({"file": file, "nodes": len(ids), "first": ids[0], "last": ids[-1]})
+    index = {
+        "context": f"context.jsonld{suffix}",
+        "base": base_iri,
+        "chunk_nodes": chunk_nodes,
+        "total_nodes": len(names),
+        "chunks": chunks,
+    }
+    (out / "index.json").write_text(json.dumps(index, indent=2) + "\n")
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def write_output(chunks: Iterable[str], path: str | None = None,
+                 compress: bool = False) -> None:
+    """Write rendered chunks incrementally to path (or stdout).
+
+    compress gzips the stream; the gzip header carries no timestamp or
+    name, so unchanged input gives byte-identical .gz output.
+    """
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        raw = open(path, "wb", buffering=1 << 16)
+    else:
+        raw = sys.stdout.buffer
+    out = gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) if compress else raw
+    try:
+        for chunk in chunks:
+            out.write(chunk.encode("utf-8"))
+    finally:
+        if compress:
+            out.close()
+        if path:
+            raw.close()
+        else:
+            raw.flush()
 
 
 # ---------------------------------------------------------------------------
@@ -220,6 +686,9 @@ class BaseAdapter:
 
     Optionally override:
         metadata_fields     — list of field names to include with --metadata
+        input_patterns      — file patterns searched when a directory is given
+        version             — bump when parse() output changes (cache key)
+        cache_inputs(path, args) — files parse() reads for one input
         add_arguments(parser) — add adapter-specific CLI arguments
         default_package(path) — derive package name from input path
     """
@@ -227,6 +696,14 @@ class BaseAdapter:
     name: str = "adapter"
     description: str = "Convert external spec to #InfraGraph"
     metadata_fields: list[str] = []
+    input_patterns: tuple[str, ...] = ("*.json",)
+    version: str = "1"
+
+    # Flags that only affect rendering; everything else may affect parse().
+    _RENDER_FLAGS = ("package", "json", "closure", "compact", "gzip",
+                     "jsonld", "base_iri", "jsonld_context", "jsonld_chunk")
+    # Flags that affect neither.
+    _RUN_FLAGS = ("input", "output", "stats", "jobs", "cache", "cache_dir", "cache_max_mb")
 
     def parse(self, path: str, args: argparse.Namespace) -> tuple[dict, dict]:
         """Parse the input file. Returns (components, deps)."""
@@ -236,6 +713,10 @@ class BaseAdapter:
         """Add adapter-specific CLI arguments."""
         pass
 
+    def cache_inputs(self, path: str, args: argparse.Namespace) -> list[str]:
+        """Files whose contents determine parse(path, args)."""
+        return [path]
+
     def default_package(self, path: str) -> str:
         """Derive a CUE package name from the input path."""
         pkg = re.sub(r"[^a-zA-Z0-9]", "", Path(path).stem.lower())
@@ -249,7 +730,8 @@ class BaseAdapter:
             description=self.description,
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
-        parser.add_argument("input", help="Path to input file")
+        parser.add_argument("input", nargs="+",
+                            help="Input file(s), globs, or directories to merge")
         parser.add_argument("-o", "--output", help="Output file (default: stdout)")
         parser.add_argument("-p", "--package", help="CUE package name")
         parser.add_argument("--metadata", action="store_true",
@@ -258,14 +740,97 @@ class BaseAdapter:
                             help="Output JSON instead of CUE")
         parser.add_argument("--stats", action="store_true",
                             help="Print stats to stderr")
+        parser.add_argument("--closure", action="store_true",
+                            help="Also emit precomputed ancestors/dependents "
+                                 "(one entry per reachable pair: output grows "
+                                 "roughly with nodes × average reach)")
+        parser.add_argument("--compact", action="store_true",
+                            help="Compact JSON (no indentation; with --json or --jsonld)")
+        parser.add_argument("--jsonld", action="store_true",
+                            help="Output JSON-LD (vocab @context) instead of CUE")
+        parser.add_argument("--base-iri", default=DEFAULT_BASE_IRI,
+                            help=f"JSON-LD @base for resource IRIs (default: {DEFAULT_BASE_IRI})")
+        parser.add_argument("--jsonld-context", metavar="FILE",
+                            help="Use an exported vocab context "
+                                 "(cue export ./vocab -e context) instead of the built-in one")
+        parser.add_argument("--jsonld-chunk", type=int, metavar="N",
+                            help="With --jsonld: write -o as a directory of compact "
+                                 "N-node JSON-LD files plus index.json")
+        parser.add_argument("--gzip", action="store_true",
+                            help="Gzip the output")
+        parser.add_argument("-j", "--jobs", type=int, default=0,
+                            help="Parallel parse workers for multiple inputs "
+                                 "(default: CPU count)")
+        parser.add_argument("--cache", action="store_true",
+                            help="Reuse parsed inputs and rendered output from the "
+                                 "adapter cache when inputs are unchanged")
+        parser.add_argument("--cache-dir",
+                            default=os.environ.get("QUICUE_ADAPTER_CACHE"),
+                            help="Cache directory; implies --cache "
+                                 "(default: $QUICUE_ADAPTER_CACHE or ~/.cache/quicue/adapters)")
+        parser.add_argument("--cache-max-mb", type=int, default=1024,
+                            help="Evict least recently used cache entries beyond this size")
         self.add_arguments(parser)
 
         args = parser.parse_args()
-
-        components, deps = self.parse(args.input, args)
-        depths = compute_depths(components, deps)
-
-        package = args.package or self.default_package(args.input)
+        if args.json and args.jsonld:
+            parser.error("--json and --jsonld are exclusive")
+        if args.jsonld_chunk is not None:
+            if not args.jsonld or not args.output:
+                parser.error("--jsonld-chunk needs --jsonld and -o DIR")
+            if args.jsonld_chunk < 1:
+                parser.error("--jsonld-chunk must be at least 1")
+        context = None
+        if args.jsonld_context:
+            with open(args.jsonld_context) as f:
+                context = json.load(f)
+            context = {**context.get("@context", context), "@base": args.base_iri}
+
+        paths = expand_inputs(args.input, self.input_patterns)
+        if not paths:
+            print(f"ERROR: no input files match {' '.join(args.input)}", file=sys.stderr)
+            sys.exit(1)
+        cache = keys = out_key = None
+        if args.cache or args.cache_dir:
+            cache = ContentCache(args.cache_dir or default_cache_dir("adapters"),
+                                 args.cache_max_mb << 20)
+            keys = self._parse_keys(paths, args)
+            # A chunk directory is not a single cacheable file.
+            if all(keys) and args.jsonld_chunk is None:
+                flags = {k: v for k, v in sorted(vars(args).items())
+                         if k not in self._RUN_FLAGS}
+                out_key = digest("output", json.dumps(flags, default=str),
+                                 json.dumps(context), *keys)
+                hit = cache.get(out_key)
+                if hit is not None:
+                    self._emit(hit, args.output)
+                    if args.stats:
+                        print("Cache: output reused", file=sys.stderr)
+                    if args.output:
+                        print(f"Wrote {args.output} (inputs unchanged, from cache)",
+                              file=sys.stderr)
+                    return
+
+        try:
+            components, deps, conflicts = merge_graphs(
+                self._parse_all(paths, args, cache, keys)
+            )
+        except RuntimeError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            sys.exit(1)
+        # Merged inputs can be large; hold the edges as int32 rows instead.
+        deps = CSRGraph.from_graph(components, deps)
+        # The JSON-LD projection needs neither depths nor the closure.
+        depths = compute_depths(components, deps) if args.stats or not args.jsonld else {}
+        closure = compute_closure(components, deps) \
+            if args.closure and not args.jsonld else None
+
+        if len(paths) == 1:
+            package = args.package or self.default_package(paths[0])
+            source = Path(paths[0]).name
+        else:
+            package = args.package or self.name
+            source = f"{len(paths)} inputs"
 
         if args.stats:
             n_edges = sum(len(d) for d in deps.values())
@@ -275,20 +840,98 @@ class BaseAdapter:
             print(f"Edges: {n_edges}", file=sys.stderr)
             print(f"Max depth: {max_depth}", file=sys.stderr)
             print(f"Roots: {roots}", file=sys.stderr)
+            if len(paths) > 1:
+                print(f"Inputs: {len(paths)}", file=sys.stderr)
+                print(f"Conflicting IDs: {conflicts}", file=sys.stderr)
 
         meta = self.metadata_fields if args.metadata else []
 
-        if args.json:
-            output = render_json(components, deps, depths)
+        if args.jsonld_chunk is not None:
+            index = write_jsonld_chunks(components, deps, args.output, args.jsonld_chunk,
+                                        args.base_iri, context, compress=args.gzip)
+            print(f"Wrote {args.output}/ ({len(components)} nodes in "
+                  f"{len(index['chunks'])} chunks)", file=sys.stderr)
+            return
+        if args.jsonld:
+            chunks = iter_jsonld(components, deps, args.base_iri, context,
+                                 compact=args.compact)
+        elif args.json:
+            chunks = iter_json(components, deps, depths, closure=closure,
+                               compact=args.compact)
         else:
-            output = render_cue(
+            chunks = iter_cue(
                 components, deps, depths, package,
-                Path(args.input).name, metadata_fields=meta,
+                source, metadata_fields=meta, closure=closure,
             )
 
+        if out_key is None:
+            write_output(chunks, args.output, compress=args.gzip)
+        else:
+            tmp = cache.reserve()
+            write_output(chunks, str(tmp), compress=args.gzip)
+            self._emit(tmp, args.output)
+            cache.commit(tmp, out_key)
         if args.output:
-            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-            Path(args.output).write_text(output)
             print(f"Wrote {args.output} ({len(components)} components)", file=sys.stderr)
+
+    def _parse_keys(self, paths: list[str], args: argparse.Namespace) -> list[str | None]:
+        """Cache key per input, or None where an input file can't be read.
+
+        Keys cover the adapter and toolkit source, the adapter's name and
+        version, parse-affecting flags and the contents of every file
+        cache_inputs() names.
+        """
+        flags = {k: v for k, v in sorted(vars(args).items())
+                 if k not in self._RUN_FLAGS and k not in self._RENDER_FLAGS}
+        salt = digest(
+            "parse", self.name, self.version,
+            file_digest(__file__),
+            file_digest(sys.modules[type(self).__module__].__file__),
+            json.dumps(flags, default=str),
+        )
+        keys = []
+        for path in paths:
+            try:
+                files = self.cache_inputs(path, args)
+                keys.append(digest(salt, *(f"{Path(f).name}:{file_digest(f)}" for f in files)))
+            except OSError:
+                keys.append(None)
+        return keys
+
+    def _parse_all(self, paths: list[str], args: argparse.Namespace,
+                   cache: ContentCache | None,
+                   keys: list[str | None] | None) -> Iterator[tuple[dict, dict]]:
+        """parse_inputs, reusing cached graphs for unchanged inputs."""
+        if cache is None:
+            yield from parse_inputs(self.parse, paths, args, jobs=args.jobs)
+            return
+        cached = {}
+        for path, key in zip(paths, keys):
+            data = cache.get_bytes(key) if key else None
+            if data is not None:
+                cached[path] = data
+        misses = [p for p in paths if p not in cached]
+        if args.stats:
+            print(f"Cache: {len(cached)}/{len(paths)} inputs reused", file=sys.stderr)
+        parsed = parse_inputs(self.parse, misses, args, jobs=args.jobs)
+        for path, key in zip(paths, keys):
+            if path in cached:
+                components, deps = json.loads(cached.pop(path))
+            else:
+                components, deps = next(parsed)
+                if key:
+                    cache.put_bytes(key, json.dumps(
+                        [components, deps], separators=(",", ":"), default=str
+                    ).encode("utf-8"))
+            yield components, deps
+
+    @staticmethod
+    def _emit(path: Path, output: str | None) -> None:
+        """Copy a rendered file to output (or stdout)."""
+        if output:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, output)
         else:
-            sys.stdout.write(output)
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
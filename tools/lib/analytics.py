@@ -0,0 +1,361 @@
+"""Graph analytics matching patterns/graph.cue, computed in Python.
+
+#CriticalityRank, #SinglePointsOfFailure and #BlastRadius are
+comprehensions over every resource pair, which dominates `cue export`
+time past a few hundred nodes. The functions here produce the same
+values from one closure pass (integer bitsets, see
+adapter.closure_bitsets) plus per-(type, depth) counts, so the answers
+can be precomputed and looked up instead.
+
+structural() adds what the same-type/same-layer peer check cannot
+see: articulation points, bridges and dominator-tree scores, all in
+(near-)linear time without the closure.
+
+Results follow #InfraGraph with full Precomputed input: ancestors and
+dependents are transitive, and lists keep resource (input) order like
+the CUE comprehensions do.
+
+Usage:
+
+    from lib.analytics import GraphIndex, criticality, single_points_of_failure
+
+    g = GraphIndex(components, deps)
+    ranked = criticality(g)              # == #CriticalityRank.ranked
+    spof = single_points_of_failure(g)   # == #SinglePointsOfFailure {risks, summary}
+
+Zero dependencies — stdlib Python only.
+"""
+
+import collections
+
+from lib.adapter import bits_to_ids, closure_bitsets, compute_depths
+
+
+class GraphIndex:
+    """Closure bitsets plus depth and layer indexes shared by the analyses.
+
+    Attributes:
+        names: resource ids in input order (CUE iteration order)
+        depths: {id: depth}
+        ids: bit position -> id (topological order)
+        pos: id -> bit position
+        anc, desc: ancestor / dependent bitsets, indexed by bit position
+        layers: {depth: bitset of resources at that depth}
+    """
+
+    def __init__(self, components: dict, deps: dict, depths: dict | None = None) -> None:
+        self.components = components
+        self.deps = deps
+        self.names = list(components)
+        self.depths = depths if depths is not None else compute_depths(components, deps)
+        self.ids, self.anc, self.desc = closure_bitsets(components, deps)
+        self.pos = {cid: i for i, cid in enumerate(self.ids)}
+        self.layers: dict[int, int] = collections.defaultdict(int)
+        for cid in self.names:
+            self.layers[self.depths[cid]] |= 1 << self.pos[cid]
+
+    def dependents(self, cid: str) -> int:
+        """Number of resources that transitively depend on cid."""
+        return self.desc[self.pos[cid]].bit_count()
+
+    def affected(self, cid: str) -> list[str]:
+        """Transitive dependents of cid, in resource order."""
+        members = set(bits_to_ids(self.desc[self.pos[cid]], self.ids))
+        return [n for n in self.names if n in members]
+
+
+def criticality(g: GraphIndex) -> list[dict]:
+    """#CriticalityRank.ranked: [{name, dependents}] in resource order."""
+    return [{"name": cid, "dependents": g.dependents(cid)} for cid in g.names]
+
+
+def group_by_type(g: GraphIndex) -> dict[str, dict]:
+    """#GroupByType.groups: {type: {id: True}}."""
+    groups: dict[str, dict] = {}
+    for cid in g.names:
+        for t in g.components[cid]["@type"]:
+            groups.setdefault(t, {})[cid] = True
+    return groups
+
+
+def single_points_of_failure(g: GraphIndex) -> dict:
+    """#SinglePointsOfFailure: {risks, summary}.
+
+    A resource with dependents is a risk unless another resource shares
+    one of its types at the same depth. Peers are found by counting
+    (type, depth) pairs once instead of scanning each type group per node.
+    """
+    peers = collections.Counter(
+        (t, g.depths[cid]) for cid in g.names for t in g.components[cid]["@type"]
+    )
+    risks = []
+    with_dependents = 0
+    for cid in g.names:
+        n = g.dependents(cid)
+        if n == 0:
+            continue
+        with_dependents += 1
+        types = g.components[cid]["@type"]
+        depth = g.depths[cid]
+        if any(peers[(t, depth)] > 1 for t in types):
+            continue
+        risks.append({"name": cid, "dependents": n, "types": types, "depth": depth})
+    return {
+        "risks": risks,
+        "summary": {"spof_count": len(risks), "total_with_deps": with_dependents},
+    }
+
+
+def blast_radius(g: GraphIndex, target: str) -> dict:
+    """#BlastRadius for one target: affected set, rollback/startup order, safe peers."""
+    affected = g.affected(target)
+    # Stable sort, deepest first, like list.Sort over the affected struct.
+    rollback = sorted(affected, key=lambda n: -g.depths[n]) + [target]
+    i = g.pos[target]
+    safe = g.layers[g.depths[target]] & ~g.desc[i] & ~(1 << i)
+    safe_set = set(bits_to_ids(safe, g.ids))
+    safe_peers = [n for n in g.names if n in safe_set]
+    return {
+        "affected": dict.fromkeys(affected, True),
+        "rollback_order": rollback,
+        "startup_order": rollback[::-1],
+        "safe_peers": dict.fromkeys(safe_peers, True),
+        "summary": {
+            "target": target,
+            "affected_count": len(affected),
+            "rollback_steps": len(rollback),
+            "safe_peer_count": len(safe_peers),
+        },
+    }
+
+
+def blast_summaries(g: GraphIndex) -> dict[str, dict]:
+    """#BlastRadius.summary for every resource, from bit counts alone."""
+    out = {}
+    for cid in g.names:
+        i = g.pos[cid]
+        affected = g.desc[i].bit_count()
+        safe = g.layers[g.depths[cid]] & ~g.desc[i] & ~(1 << i)
+        out[cid] = {
+            "affected_count": affected,
+            "rollback_steps": affected + 1,
+            "safe_peer_count": safe.bit_count(),
+        }
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Structural single points of failure (linear time, no closure needed)
+# ---------------------------------------------------------------------------
+
+def _index(components: dict, deps: dict) -> tuple[list, dict, list]:
+    """(names, position, parents) with edges restricted to known ids."""
+    names = list(components)
+    pos = {cid: i for i, cid in enumerate(names)}
+    parents = [[pos[d] for d in deps.get(cid, {}) if d in pos and d != cid] for cid in names]
+    return names, pos, parents
+
+
+def articulation_points(components: dict, deps: dict) -> tuple[dict, list]:
+    """Cut vertices and bridges of the undirected dependency graph.
+
+    Removing an articulation point (or a bridge edge) disconnects part of
+    the graph regardless of edge direction. Iterative Tarjan low-link,
+    O(V + E). Returns ({id: True} in DFS discovery order,
+    [[dependency, dependent], ...] in DFS finish order).
+    """
+    names, _, parents = _index(components, deps)
+    n = len(names)
+    adj: list[list[tuple[int, int]]] = [[] for _ in range(n)]
+    edges = []
+    for child, ps in enumerate(parents):
+        for p in ps:
+            adj[p].append((child, len(edges)))
+            adj[child].append((p, len(edges)))
+            edges.append((p, child))
+
+    disc = [-1] * n
+    low = [0] * n
+    cut = [False] * n
+    bridges = []
+    t = 0
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = t
+        t += 1
+        root_children = 0
+        # (node, edge id used to enter it, next adjacency index)
+        stack = [(root, -1, 0)]
+        while stack:
+            v, via, i = stack[-1]
+            if i < len(adj[v]):
+                stack[-1] = (v, via, i + 1)
+                w, eid = adj[v][i]
+                if eid == via:
+                    continue
+                if disc[w] == -1:
+                    disc[w] = low[w] = t
+                    t += 1
+                    if v == root:
+                        root_children += 1
+                    stack.append((w, eid, 0))
+                elif disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+            stack.pop()
+            if not stack:
+                break
+            u = stack[-1][0]
+            if low[v] < low[u]:
+                low[u] = low[v]
+            if low[v] > disc[u]:
+                bridges.append(edges[via])
+            if u != root and low[v] >= disc[u]:
+                cut[u] = True
+        if root_children > 1:
+            cut[root] = True
+
+    order = sorted(range(n), key=disc.__getitem__)
+    return (
+        {names[v]: True for v in order if cut[v]},
+        [[names[p], names[c]] for p, c in bridges],
+    )
+
+
+def dominators(components: dict, deps: dict) -> dict[str, str | None]:
+    """Immediate dominator of each resource in the dependency graph.
+
+    Edges run dependency -> dependent from a virtual root above every
+    resource with no dependencies (and above any cycle not reachable
+    from one). d dominates v when every chain from a root to v passes
+    through d. Lengauer–Tarjan with path compression, O(E log V).
+    Returns {id: idom id, or None when only the virtual root dominates}.
+    """
+    names, _, parents = _index(components, deps)
+    n = len(names)
+    R = n  # virtual root
+    succ: list[list[int]] = [[] for _ in range(n + 1)]
+    preds: list[list[int]] = [list(ps) for ps in parents] + [[]]
+    for child, ps in enumerate(parents):
+        for p in ps:
+            succ[p].append(child)
+
+    dfn = [-1] * (n + 1)        # node -> DFS number
+    vertex: list[int] = []      # DFS number -> node
+    parent = [-1] * (n + 1)
+
+    def dfs(start: int, from_node: int) -> None:
+        parent[start] = from_node
+        dfn[start] = len(vertex)
+        vertex.append(start)
+        stack = [(start, 0)]
+        while stack:
+            v, i = stack[-1]
+            if i < len(succ[v]):
+                stack[-1] = (v, i + 1)
+                w = succ[v][i]
+                if dfn[w] == -1:
+                    parent[w] = v
+                    dfn[w] = len(vertex)
+                    vertex.append(w)
+                    stack.append((w, 0))
+            else:
+                stack.pop()
+
+    dfn[R] = 0
+    vertex.append(R)
+    roots = [v for v in range(n) if not parents[v]]
+    for v in roots:
+        succ[R].append(v)
+        preds[v].append(R)
+    for v in roots:
+        if dfn[v] == -1:
+            dfs(v, R)
+    for v in range(n):  # cycles with no root above them
+        if dfn[v] == -1:
+            succ[R].append(v)
+            preds[v].append(R)
+            dfs(v, R)
+
+    # Arrays below are indexed by DFS number.
+    total = len(vertex)
+    semi = list(range(total))
+    idom = [0] * total
+    ancestor = [-1] * total
+    label = list(range(total))
+    bucket: list[list[int]] = [[] for _ in range(total)]
+    par = [dfn[parent[vertex[i]]] if i else -1 for i in range(total)]
+
+    def evaluate(v: int) -> int:
+        if ancestor[v] == -1:
+            return v
+        # Collect the path to the forest root, then compress it top-down.
+        path = []
+        u = v
+        while ancestor[ancestor[u]] != -1:
+            path.append(u)
+            u = ancestor[u]
+        for u in reversed(path):
+            a = ancestor[u]
+            if semi[label[a]] < semi[label[u]]:
+                label[u] = label[a]
+            ancestor[u] = ancestor[a]
+        return label[v]
+
+    for w in range(total - 1, 0, -1):
+        for p in preds[vertex[w]]:
+            u = evaluate(dfn[p])
+            if semi[u] < semi[w]:
+                semi[w] = semi[u]
+        bucket[semi[w]].append(w)
+        ancestor[w] = par[w]
+        p = par[w]
+        for v in bucket[p]:
+            u = evaluate(v)
+            idom[v] = u if semi[u] < semi[v] else p
+        bucket[p] = []
+    for w in range(1, total):
+        if idom[w] != semi[w]:
+            idom[w] = idom[idom[w]]
+
+    return {
+        names[vertex[w]]: (names[vertex[idom[w]]] if idom[w] else None)
+        for w in sorted(range(1, total), key=lambda w: vertex[w])
+    }
+
+
+def dominator_counts(idom: dict[str, str | None]) -> dict[str, int]:
+    """How many resources each resource dominates (dominator subtree size - 1)."""
+    children: dict[str | None, list] = collections.defaultdict(list)
+    for v, d in idom.items():
+        children[d].append(v)
+    counts = dict.fromkeys(idom, 0)
+    # Post-order over the dominator tree from the virtual root.
+    stack = [(v, False) for v in children[None]]
+    while stack:
+        v, done = stack.pop()
+        if done:
+            d = idom[v]
+            if d is not None:
+                counts[d] += counts[v] + 1
+            continue
+        stack.append((v, True))
+        stack.extend((c, False) for c in children[v])
+    return counts
+
+
+def structural(components: dict, deps: dict) -> dict:
+    """Articulation points, bridges and dominator scores in one struct.
+
+    Shaped like #InfraGraph.Precomputed maps ({id: value}) so CUE and API
+    consumers can index it directly.
+    """
+    cut, bridges = articulation_points(components, deps)
+    idom = dominators(components, deps)
+    return {
+        "articulation_points": cut,
+        "bridges": bridges,
+        "idom": {v: d for v, d in idom.items() if d is not None},
+        "dominates": dominator_counts(idom),
+    }
@@ -0,0 +1,166 @@
+"""Content-addressed on-disk cache with size-bounded LRU eviction.
+
+Entries are plain files named by a hex key under one directory. Keys
+come from digest() over everything that determines the value (input
+bytes, tool version, flags), so a stale entry is never looked up again
+and simply ages out. Reads refresh the entry's mtime; when the directory
+grows past max_bytes the least recently used entries are removed, down
+to LOW_WATER of max_bytes. Writes only update a running size total; the
+directory is scanned once when the cache is first written to and again
+only when the total crosses max_bytes, so n puts cost O(n), not O(n²).
+
+Writes go to a temporary file and are renamed into place, so concurrent
+runs sharing a cache directory never see partial entries.
+
+Zero dependencies — stdlib Python only.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Eviction frees space down to this fraction of max_bytes, so a full
+# cache is not rescanned on every following write.
+LOW_WATER = 0.9
+
+
+def default_cache_dir(name: str) -> Path:
+    """$XDG_CACHE_HOME/quicue/<name> (or ~/.cache/quicue/<name>)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "quicue" / name
+
+
+def digest(*parts: str | bytes) -> str:
+    """SHA-256 over parts, length-prefixed so part boundaries matter."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ContentCache:
+    """A directory of key → file entries with LRU eviction."""
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._total: int | None = None  # bytes in entries, once scanned
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str) -> Path | None:
+        """Path of the entry for key (marking it recently used), or None."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_bytes(self, key: str) -> bytes | None:
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # evicted by a concurrent run
+            return None
+
+    def reserve(self) -> Path:
+        """A fresh temporary path in the cache directory, for commit()."""
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        os.close(fd)
+        return Path(tmp)
+
+    def commit(self, tmp: str | Path, key: str) -> Path:
+        """Atomically move a reserved file into place as key's entry."""
+        path = self.path(key)
+        size = os.stat(tmp).st_size
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]
+            else:
+                self._total += size - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+        return path
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        tmp = self.reserve()
+        tmp.write_bytes(data)
+        return self.commit(tmp, key)
+
+    def put_file(self, key: str, src: str | Path) -> Path:
+        """Store a copy of src under key."""
+        tmp = self.reserve()
+        shutil.copyfile(src, tmp)
+        return self.commit(tmp, key)
+
+    def _scan(self) -> tuple[list, int]:
+        """([(mtime, size, path)], total bytes) of the current entries."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(".tmp-") or not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:  # removed by a concurrent run
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+        return entries, total
+
+    def evict(self) -> int:
+        """Remove least recently used entries once over max_bytes.
+
+        Frees space down to LOW_WATER * max_bytes and resyncs the running
+        total with the directory (other processes may share it).
+        """
+        with self._lock:
+            entries, total = self._scan()
+            removed = 0
+            if total > self.max_bytes:
+                removed, total = self._remove_oldest(entries, total)
+            self._total = total
+            return removed
+
+    def _remove_oldest(self, entries: list, total: int) -> tuple[int, int]:
+        target = int(self.max_bytes * LOW_WATER)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed, total
@@ -0,0 +1,344 @@
+"""Compact interned-ID dependency graph (CSR adjacency in array('i')).
+
+The toolkit's native shape is deps[safe_id] = {dep_id: True}: a dict
+per node and a dict slot per edge, a few hundred bytes per edge. A
+CSRGraph stores the same graph as a string table plus compressed
+sparse rows:
+
+    names                     id -> safe_id (components first, then
+                              ids that only appear in depends_on)
+    fwd_offsets, fwd_targets  id -> its dependencies
+    rev_offsets, rev_targets  id -> its dependents
+
+so an edge costs 8 bytes (one int32 in each direction).
+
+A CSRGraph is also a read-only Mapping with the deps shape, so
+render_cue, render_json, compute_depths and compute_closure accept it in
+place of the dict. Iteration and row order are preserved, so output is
+byte-identical.
+
+Usage:
+
+    from lib.csr import CSRGraph
+
+    graph = CSRGraph.from_graph(components, deps)
+    del deps                                  # keep only the compact form
+    depths = compute_depths(components, graph)
+    for i in graph.bfs([graph.index["db"]], reverse=True):
+        ...                                   # everything that depends on db
+
+Zero dependencies — stdlib Python only.
+"""
+
+import collections
+from array import array
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+
+
+class CSRGraph(Mapping):
+    """Dependency graph over interned ids with forward and reverse CSR rows."""
+
+    def __init__(self, names: list[str], n_components: int, entries: array,
+                 fwd_offsets: array, fwd_targets: array) -> None:
+        self.names = names
+        self.n_components = n_components
+        self.index = {name: i for i, name in enumerate(names)}
+        self.entries = entries            # ids with a deps entry, in deps order
+        self.fwd_offsets = fwd_offsets
+        self.fwd_targets = fwd_targets
+        self._has_entry = bytearray(len(names))
+        for i in entries:
+            self._has_entry[i] = 1
+        self.rev_offsets, self.rev_targets = self._reverse()
+
+    @classmethod
+    def from_graph(cls, components: dict, deps: dict) -> "CSRGraph":
+        """Build from the toolkit's (components, deps) shape."""
+        names = list(components)
+        index = {name: i for i, name in enumerate(names)}
+
+        def intern(name: str) -> int:
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(names)
+                names.append(name)
+            return i
+
+        entries = array("i")
+        row_offsets = array("i", [0])
+        row_targets = array("i")
+        for cid, dep_map in deps.items():
+            entries.append(intern(cid))
+            row_targets.extend(intern(d) for d in dep_map)
+            row_offsets.append(len(row_targets))
+        return cls.from_rows(names, entries, row_offsets, row_targets, len(components))
+
+    @classmethod
+    def from_rows(cls, names: list[str], entries: array, row_offsets: array,
+                  row_targets: array, n_components: int | None = None) -> "CSRGraph":
+        """Build from dependency rows listed in deps (entry) order.
+
+        Row k holds the dependencies of entries[k]:
+        row_targets[row_offsets[k]:row_offsets[k + 1]]. Useful when edges
+        are collected while streaming, without a deps dict in between.
+        Ids below n_components (default: all) count as components.
+        """
+        n = len(names)
+        offsets = array("i", [0]) * (n + 1)
+        for k, i in enumerate(entries):
+            offsets[i + 1] = row_offsets[k + 1] - row_offsets[k]
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        targets = array("i", [0]) * len(row_targets)
+        for k, i in enumerate(entries):
+            start = row_offsets[k]
+            length = row_offsets[k + 1] - start
+            targets[offsets[i]:offsets[i] + length] = row_targets[start:start + length]
+        return cls(names, n if n_components is None else n_components,
+                   entries, offsets, targets)
+
+    def _reverse(self) -> tuple[array, array]:
+        """Dependents rows, ordered as compute_depths visits them.
+
+        Edges are bucketed by (entry order, row order) so each row lists
+        dependents in the order a dict-of-dicts walk would find them.
+        """
+        n = len(self.names)
+        counts = array("i", [0]) * (n + 1)
+        for t in self.fwd_targets:
+            counts[t + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        fill = array("i", counts)
+        targets = array("i", [0]) * len(self.fwd_targets)
+        for src in self.entries:
+            for t in self.deps_of(src):
+                targets[fill[t]] = src
+                fill[t] += 1
+        return counts, targets
+
+    # -- rows ---------------------------------------------------------------
+
+    def deps_of(self, i: int) -> memoryview:
+        """Ids node i depends on."""
+        return memoryview(self.fwd_targets)[self.fwd_offsets[i]:self.fwd_offsets[i + 1]]
+
+    def dependents_of(self, i: int) -> memoryview:
+        """Ids that depend directly on node i."""
+        return memoryview(self.rev_targets)[self.rev_offsets[i]:self.rev_offsets[i + 1]]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.fwd_targets)
+
+    def nbytes(self) -> int:
+        """Bytes held by the adjacency arrays (excluding the string table)."""
+        arrays = (self.entries, self.fwd_offsets, self.fwd_targets,
+                  self.rev_offsets, self.rev_targets)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self._has_entry)
+
+    # -- Mapping (deps shape) -----------------------------------------------
+
+    def __getitem__(self, cid: str) -> dict:
+        i = self.index.get(cid)
+        if i is None or not self._has_entry[i]:
+            raise KeyError(cid)
+        names = self.names
+        return {names[t]: True for t in self.deps_of(i)}
+
+    def __contains__(self, cid: object) -> bool:
+        i = self.index.get(cid)  # type: ignore[arg-type]
+        return i is not None and bool(self._has_entry[i])
+
+    def __iter__(self) -> Iterator[str]:
+        names = self.names
+        return (names[i] for i in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def to_deps(self) -> dict:
+        """Expand back to deps[safe_id] = {dep_id: True}."""
+        return {cid: self[cid] for cid in self}
+
+    # -- traversal ----------------------------------------------------------
+
+    def topological_order(self) -> tuple[array, list[int]]:
+        """Kahn's order over components, dependencies first.
+
+        Returns (order, cyclic) as ids, like adapter.topological_order.
+        """
+        n = self.n_components
+        in_degree = array("i", [0]) * n
+        for i in range(n):
+            in_degree[i] = sum(1 for t in self.deps_of(i) if t < n)
+        order = array("i", (i for i in range(n) if in_degree[i] == 0))
+        k = 0
+        while k < len(order):
+            for d in self.dependents_of(order[k]):
+                if d < n:
+                    in_degree[d] -= 1
+                    if in_degree[d] == 0:
+                        order.append(d)
+            k += 1
+        placed = bytearray(n)
+        for i in order:
+            placed[i] = 1
+        return order, [i for i in range(n) if not placed[i]]
+
+    def depths(self) -> dict[str, int]:
+        """Same result (and key order) as adapter.compute_depths."""
+        n = self.n_components
+        total = len(self.names)
+        in_degree = array("i", [0]) * total
+        for i in self.entries:
+            in_degree[i] = sum(1 for t in self.deps_of(i) if t < n)
+
+        depth = array("i", [-1]) * total
+        seen: list[int] = []
+        queue = collections.deque()
+        for i in range(n):
+            if in_degree[i] == 0:
+                queue.append(i)
+                depth[i] = 0
+                seen.append(i)
+
+        while queue:
+            node = queue.popleft()
+            if node >= n:
+                continue  # only components have dependents edges counted
+            for dep in self.dependents_of(node):
+                new_depth = depth[node] + 1
+                if depth[dep] == -1:
+                    seen.append(dep)
+                if new_depth > depth[dep]:
+                    depth[dep] = new_depth
+                in_degree[dep] -= 1
+                if in_degree[dep] == 0:
+                    queue.append(dep)
+
+        names = self.names
+        result = {names[i]: depth[i] for i in seen}
+        if len(result) < n:
+            max_d = max(result.values()) if result else 0
+            for i in range(n):
+                if depth[i] == -1:
+                    result[names[i]] = max_d + 1
+        return result
+
+    def bfs(self, sources: Iterable[int], reverse: bool = False) -> Iterator[int]:
+        """Breadth-first ids reachable from sources (sources included).
+
+        Forward follows depends_on (towards roots); reverse follows
+        dependents (the blast-radius direction).
+        """
+        step = self.dependents_of if reverse else self.deps_of
+        seen = bytearray(len(self.names))
+        queue = collections.deque()
+        for s in sources:
+            if not seen[s]:
+                seen[s] = 1
+                queue.append(s)
+        while queue:
+            v = queue.popleft()
+            yield v
+            for w in step(v):
+                if not seen[w]:
+                    seen[w] = 1
+                    queue.append(w)
+
+    def dependent_counts(self, ids: list[int]) -> list[int]:
+        """How many nodes transitively depend on each of ids.
+
+        The same numbers as len(list(bfs([i], reverse=True))) - 1 for
+        every i in ids, from one pass instead of one BFS each: bit j
+        marks "depends on ids[j]", and each strongly connected component
+        ORs its dependencies' marks as Tarjan's algorithm completes it
+        (dependencies complete first, so cycles need no fixpoint). Marks
+        are len(ids) bits wide, however large the graph.
+        """
+        total = len(self.names)
+        own = [0] * total
+        for j, i in enumerate(ids):
+            own[i] |= 1 << j
+        mark = [0] * total
+
+        order = array("i", [-1]) * total  # Tarjan visit index
+        low = array("i", [0]) * total
+        on_stack = bytearray(total)
+        stack: list[int] = []
+        visited = 0
+        for root in range(total):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = visited
+            visited += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, self.deps_of(root), 0)]
+            while work:
+                v, deps, k = work[-1]
+                if k < len(deps):
+                    work[-1] = (v, deps, k + 1)
+                    w = deps[k]
+                    if order[w] == -1:
+                        order[w] = low[w] = visited
+                        visited += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, self.deps_of(w), 0))
+                    elif on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                    continue
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] != order[v]:
+                    continue
+                # v roots a component; everything it depends on outside
+                # the component already has its final mark.
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    members.append(w)
+                    if w == v:
+                        break
+                bits = 0
+                for w in members:
+                    bits |= own[w]
+                    for d in self.deps_of(w):
+                        bits |= mark[d]
+                for w in members:
+                    mark[w] = bits
+
+        # Column sums of the marks by bit-sliced addition: levels[b] holds
+        # bit b of every id's count, so adding a mark is a few big-int
+        # ops. Nodes sharing a mark are added once, times their number.
+        levels: list[int] = []
+        for bits, times in collections.Counter(m for m in mark if m).items():
+            b = 0
+            while times:
+                if times & 1:
+                    carry, k = bits, b
+                    while carry:
+                        while k >= len(levels):
+                            levels.append(0)
+                        levels[k], carry = levels[k] ^ carry, levels[k] & carry
+                        k += 1
+                times >>= 1
+                b += 1
+        counts = [-1] * len(ids)  # each id marks itself
+        for b, level in enumerate(levels):
+            for j, digit in enumerate(reversed(bin(level)[2:])):
+                if digit == "1":
+                    counts[j] += 1 << b
+        return counts
+
+    def reachable(self, sources: Iterable[int], reverse: bool = False) -> bytearray:
+        """Membership mask of bfs(sources, reverse)."""
+        mask = bytearray(len(self.names))
+        for v in self.bfs(sources, reverse):
+            mask[v] = 1
+        return mask
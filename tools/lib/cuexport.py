@@ -0,0 +1,278 @@
+"""Cached, concurrent `cue export` runs.
+
+Every `cue export` re-evaluates its package from scratch. Scripts that
+export several packages (or the same package more than once) can go
+through export() / export_all() instead: results are cached on disk,
+content-addressed by everything the evaluation reads, and independent
+exports run concurrently.
+
+The cache key (see cache_key) covers:
+
+    - the package's .cue files, including same-package files in parent
+      directories up to the module root (CUE unifies those too)
+    - every package reached through imports, transitively: in-module
+      imports resolve to directories under the module root, others to
+      cue.mod/pkg/<module>; stdlib imports ("list", "strings") are skipped
+    - cue.mod/module.cue (dependency versions, language version)
+    - the expression, the -t tags, the output format and the cue binary
+
+so a rebuild with no changes is a few file hashes, not an evaluation.
+
+Usage:
+
+    from lib.cuexport import Target, export_all
+
+    docs, kb = export_all([Target("wiki", "docs"), Target(".kb")])
+    bulk = export(Target("examples/datacenter", "_bulk", tags=("timestamp=now",)))
+
+Results are parsed JSON (text for out="text"), or None when cue fails
+(its stderr is printed). tools/cue_export.py wraps this for shell scripts.
+
+Zero dependencies — stdlib Python only (needs cue on PATH on a miss).
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from lib.cache import ContentCache, default_cache_dir, digest, file_digest
+
+DEFAULT_CACHE_MAX_BYTES = 256 << 20
+
+_PACKAGE_RE = re.compile(r"^\s*package\s+([A-Za-z_$][\w$]*)", re.MULTILINE)
+_IMPORT_RE = re.compile(r"^\s*import\s+(?:[A-Za-z_$][\w$]*\s+)?\"([^\"]+)\"", re.MULTILINE)
+_IMPORT_BLOCK_RE = re.compile(r"^\s*import\s*\(([^)]*)\)", re.MULTILINE)
+_IMPORT_SPEC_RE = re.compile(r"\"([^\"]+)\"")
+_MODULE_RE = re.compile(r"^\s*module:\s*\"([^\"]+)\"", re.MULTILINE)
+
+
+class Target(NamedTuple):
+    """One `cue export <package_dir> [-e expr] [-t tag]... --out <out>`."""
+    package_dir: str
+    expr: str | None = None
+    tags: tuple[str, ...] = ()
+    out: str = "json"
+
+
+def default_cache() -> ContentCache:
+    """$QUICUE_CUE_CACHE, or ~/.cache/quicue/cue-export.
+
+    Bounded by $QUICUE_CUE_CACHE_MAX bytes (default 256 MiB); least
+    recently used exports are evicted first.
+    """
+    max_bytes = os.environ.get("QUICUE_CUE_CACHE_MAX")
+    return ContentCache(
+        os.environ.get("QUICUE_CUE_CACHE") or default_cache_dir("cue-export"),
+        int(max_bytes) if max_bytes else DEFAULT_CACHE_MAX_BYTES,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Transitive inputs
+# ---------------------------------------------------------------------------
+
+def module_root(path: str | Path) -> Path | None:
+    """Nearest directory at or above path holding cue.mod/module.cue."""
+    path = Path(path).resolve()
+    for d in (path, *path.parents):
+        if (d / "cue.mod" / "module.cue").is_file():
+            return d
+    return None
+
+
+def module_path(root: Path) -> str:
+    """The module: path from root's cue.mod/module.cue, without @vN."""
+    m = _MODULE_RE.search((root / "cue.mod" / "module.cue").read_text())
+    return m.group(1).split("@")[0] if m else ""
+
+
+def _cue_files(directory: Path) -> list[Path]:
+    # cue skips files starting with "." or "_" when loading a package.
+    try:
+        return sorted(p for p in directory.glob("*.cue")
+                      if p.name[0] not in "._" and p.is_file())
+    except OSError:
+        return []
+
+
+def _parse(path: Path) -> tuple[str | None, list[str]]:
+    """(package name, import paths) of one .cue file."""
+    text = path.read_text(errors="replace")
+    pkg = _PACKAGE_RE.search(text)
+    imports = _IMPORT_RE.findall(text)
+    for block in _IMPORT_BLOCK_RE.findall(text):
+        imports.extend(_IMPORT_SPEC_RE.findall(block))
+    return (pkg.group(1) if pkg else None), imports
+
+
+class _Inputs:
+    """Walks a package and its imports, collecting every .cue file read."""
+
+    def __init__(self) -> None:
+        self.files: set[Path] = set()
+        self.imports: set[str] = set()
+        self.seen: set[Path] = set()
+        self.modules: dict[Path, str] = {}
+
+    def _module(self, root: Path) -> str:
+        if root not in self.modules:
+            self.modules[root] = module_path(root)
+        return self.modules[root]
+
+    def _add(self, path: Path, imports: list[str]) -> None:
+        self.files.add(path)
+        self.imports.update(imports)
+
+    def add_package(self, directory: Path, root: Path | None,
+                    name: str | None = None) -> None:
+        """Files of the package in directory, plus same-package ancestors."""
+        if directory in self.seen:
+            return
+        self.seen.add(directory)
+        names = set()
+        for f in _cue_files(directory):
+            pkg, imports = _parse(f)
+            if name is None or pkg == name:
+                names.add(pkg)
+                self._add(f, imports)
+        if root is None:
+            return
+        d = directory
+        while d != root and root in d.parents:
+            d = d.parent
+            for f in _cue_files(d):
+                pkg, imports = _parse(f)
+                if pkg is not None and pkg in names:
+                    self._add(f, imports)
+
+    def resolve(self, spec: str, root: Path | None) -> tuple[Path, Path | None, str | None] | None:
+        """Directory, module root and package name for an import path."""
+        path, _, qualifier = spec.partition(":")
+        first = path.split("/", 1)[0]
+        if "." not in first:
+            return None  # stdlib
+        bare = re.sub(r"@v\d+$", "", path)
+        name = qualifier or bare.rsplit("/", 1)[-1]
+        if root is None:
+            return None
+        mod = self._module(root)
+        if mod and (bare == mod or bare.startswith(mod + "/")):
+            return root / bare[len(mod):].lstrip("/"), root, name
+        major = path[len(bare):]  # "@v0" or ""
+        parts = bare.split("/")
+        pkg_dir = root / "cue.mod" / "pkg"
+        for n in range(len(parts), 0, -1):
+            prefix = "/".join(parts[:n])
+            for candidate in (pkg_dir / (prefix + major), pkg_dir / prefix):
+                if candidate.is_dir():
+                    dep_root = candidate if (candidate / "cue.mod").is_dir() else None
+                    return candidate.joinpath(*parts[n:]), dep_root, name
+        return None
+
+
+def input_files(package_dir: str | Path) -> list[Path]:
+    """Every .cue file `cue export` reads for the package, sorted."""
+    root = module_root(package_dir)
+    inputs = _Inputs()
+    inputs.add_package(Path(package_dir).resolve(), root)
+    done: set[str] = set()
+    while inputs.imports - done:
+        for spec in sorted(inputs.imports - done):
+            done.add(spec)
+            resolved = inputs.resolve(spec, root)
+            if resolved is not None:
+                inputs.add_package(*resolved)
+    if root is not None:
+        module_cue = root / "cue.mod" / "module.cue"
+        inputs.files.add(module_cue)
+    return sorted(inputs.files)
+
+
+def cache_key(target: Target) -> str:
+    """Digest of the target's transitive inputs and export options."""
+    cue = shutil.which("cue") or ""
+    try:
+        st = os.stat(cue)
+        cue_id = f"{cue}:{st.st_size}:{st.st_mtime_ns}"
+    except OSError:
+        cue_id = cue
+    return digest(
+        "cue-export", cue_id, str(Path(target.package_dir).resolve()),
+        target.expr or "", target.out, *sorted(target.tags),
+        *(f"{f}:{file_digest(f)}" for f in input_files(target.package_dir)),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def export_bytes(target: Target, cache: ContentCache | None = None) -> bytes | None:
+    """cue's raw stdout for one target, from the cache when inputs are unchanged."""
+    key = cache_key(target) if cache is not None else None
+    if key is not None:
+        hit = cache.get_bytes(key)
+        if hit is not None:
+            return hit
+
+    cmd = ["cue", "export", ".", "--out", target.out]
+    if target.expr:
+        cmd.extend(["-e", target.expr])
+    for tag in target.tags:
+        cmd.extend(["-t", tag])
+    try:
+        result = subprocess.run(cmd, cwd=target.package_dir, capture_output=True)
+    except FileNotFoundError as e:
+        print(f"  ERROR: cannot run cue export in {target.package_dir}: {e}", file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        print(f"  ERROR: cue export in {target.package_dir} failed: "
+              f"{result.stderr.decode('utf-8', 'replace').strip()}", file=sys.stderr)
+        return None
+    if key is not None:
+        cache.put_bytes(key, result.stdout)
+    return result.stdout
+
+
+def export(target: Target, cache: ContentCache | None = None) -> object | None:
+    """Export one target: parsed JSON, or text for out="text"."""
+    data = export_bytes(target, cache)
+    if data is None:
+        return None
+    if target.out == "json":
+        return json.loads(data)
+    return data.decode("utf-8")
+
+
+def _export_many(fn, targets: Iterable[Target], cache: ContentCache | None,
+                 jobs: int | None) -> list:
+    targets = list(targets)
+    unique = list(dict.fromkeys(targets))
+    if len(unique) <= 1 or jobs == 1:
+        results = {t: fn(t, cache) for t in unique}
+    else:
+        with ThreadPoolExecutor(max_workers=jobs or min(len(unique), os.cpu_count() or 1)) as pool:
+            results = dict(zip(unique, pool.map(lambda t: fn(t, cache), unique)))
+    return [results[t] for t in targets]
+
+
+def export_all(targets: Iterable[Target], cache: ContentCache | None = None,
+               jobs: int | None = None) -> list:
+    """Export targets concurrently; results in target order.
+
+    Duplicate targets are evaluated once. cue does the work in its own
+    processes, so a thread per running export is enough.
+    """
+    return _export_many(export, targets, cache, jobs)
+
+
+def export_all_bytes(targets: Iterable[Target], cache: ContentCache | None = None,
+                     jobs: int | None = None) -> list:
+    """export_all() returning cue's raw output bytes."""
+    return _export_many(export_bytes, targets, cache, jobs)
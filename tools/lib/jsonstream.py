@@ -0,0 +1,359 @@
+"""Incremental JSON event parser (stdlib only).
+
+Reads a JSON document in fixed-size chunks and yields parse events, so
+callers can walk a multi-GB file while holding only the items they keep.
+Strings are decoded with the stdlib's C scanstring; only structure is
+handled in Python.
+
+Events are (event, value) pairs:
+
+    start_map, end_map, start_array, end_array   value is None
+    map_key                                      value is the key
+    string, number, boolean, null                value is the scalar
+
+Typical use — skip what you don't need, build what you do:
+
+    events = iter_events(f)
+    for key in iter_map(events):
+        if key == "components":
+            for ev, val in iter_array(events):
+                item = build_value(events, ev, val)
+        else:
+            skip_value(events)
+
+When every entry of a large top-level map is kept, iter_map_items
+decodes entry by entry with the C decoder instead:
+
+    for key, value in iter_map_items(f):
+        ...
+"""
+
+import itertools
+import re
+from json.decoder import JSONDecodeError, JSONDecoder, scanstring
+from typing import IO, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_LITERALS = {"true": ("boolean", True), "false": ("boolean", False), "null": ("null", None)}
+_DECODER = JSONDecoder()
+
+
+def _is_record(value: object) -> bool:
+    """True for a map of fields, not a scalar or a set ({"x": true, ...})."""
+    return isinstance(value, dict) and any(v is not True for v in value.values())
+
+
+class _Tokenizer:
+    """Chunked tokenizer over a text file object."""
+
+    def __init__(self, fp: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, msg: str) -> JSONDecodeError:
+        return JSONDecodeError(msg, self.buf, self.pos)
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        c = self._peek()
+        if not c or c not in chars:
+            raise self._error(f"Expecting one of {chars!r}")
+        self.pos += 1
+        return c
+
+    def value(self) -> object:
+        """Decode the next complete value with the C decoder.
+
+        A value cut off by the chunk boundary is retried with more input,
+        so each value must fit in memory (it is being built anyway).
+        """
+        self._peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+                break
+            except JSONDecodeError:
+                if not self._fill():
+                    raise
+        # A number that ends the buffer may continue in the next chunk.
+        while end == len(self.buf) and self.buf[self.pos] in "-0123456789" and self._fill():
+            obj, end = _DECODER.raw_decode(self.buf, self.pos)
+        self.pos = end
+        return obj
+
+    def _keys(self) -> Iterator[str]:
+        """Keys of the map whose "{" was just consumed.
+
+        Each key is yielded after its ":"; the caller decodes the value
+        before asking for the next key.
+        """
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def map_items(self, unwrap: str | None = None) -> Iterator[tuple[str, object]]:
+        self._expect("{")
+        for i, key in enumerate(self._keys()):
+            if i > 0 or key != unwrap or self._peek() != "{":
+                yield key, self.value()
+                continue
+            # {"<unwrap>": {...}} is a wrapper only if the inner map's
+            # values are records (resources). A scalar or a set
+            # ({"Router": true}) there means the inner map is itself a
+            # record, whose id happens to be unwrap: yield it whole.
+            self.pos += 1
+            inner = self._keys()
+            first = [(k, self.value()) for k in itertools.islice(inner, 1)]
+            if not first or _is_record(first[0][1]):
+                yield from first
+                for k in inner:
+                    yield k, self.value()
+                return
+            value = dict(first)
+            for k in inner:
+                value[k] = self.value()
+            yield key, value
+
+    def tokens(self) -> Iterator[tuple[str, object]]:
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos >= len(self.buf):
+                if not self._fill():
+                    return
+                continue
+
+            c = self.buf[self.pos]
+            if c in "{}[]:,":
+                self.pos += 1
+                yield c, None
+            elif c == '"':
+                while True:
+                    try:
+                        s, end = scanstring(self.buf, self.pos + 1)
+                        break
+                    except JSONDecodeError as e:
+                        # Retry only if the string may run past the buffer
+                        # (unterminated, or an escape cut at the end).
+                        truncated = (e.msg.startswith("Unterminated string")
+                                     or e.pos >= len(self.buf) - 6)
+                        if not truncated or not self._fill():
+                            raise
+                self.pos = end
+                yield "string", s
+            elif c in "-0123456789":
+                # Lookahead so a number split at "1." or "2e" is seen whole.
+                while len(self.buf) - self.pos < 64 and self._fill():
+                    pass
+                m = _NUMBER_RE.match(self.buf, self.pos)
+                while (not m or m.end() == len(self.buf)) and self._fill():
+                    m = _NUMBER_RE.match(self.buf, self.pos)
+                if not m:
+                    raise self._error("Invalid number")
+                text = m.group()
+                self.pos = m.end()
+                if "." in text or "e" in text or "E" in text:
+                    yield "number", float(text)
+                else:
+                    yield "number", int(text)
+            else:
+                while len(self.buf) - self.pos < 5 and self._fill():
+                    pass
+                for word, token in _LITERALS.items():
+                    if self.buf.startswith(word, self.pos):
+                        self.pos += len(word)
+                        yield token
+                        break
+                else:
+                    raise self._error(f"Unexpected character {c!r}")
+
+
+_CLOSE = {"map": "}", "array": "]"}
+_START = {"{": ("map", "start_map"), "[": ("array", "start_array")}
+
+
+def iter_events(fp: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, object]]:
+    """Yield (event, value) pairs for the JSON document in fp.
+
+    The grammar is enforced as the tokens arrive: misplaced or missing
+    commas and colons, trailing commas, data after the top-level value
+    and a document that ends inside a container all raise
+    JSONDecodeError, so a truncated file never reads as a shorter one.
+    """
+    tokenizer = _Tokenizer(fp, chunk_size)
+    stack: list[str] = []  # "map" | "array"
+    # value: a value must come next; key: a property name; colon;
+    # next: "," or the container's closer; done: the document is complete.
+    # key_or_end / value_or_end: just after "{" / "[" (empty is fine).
+    state = "value"
+
+    def fail(msg: str) -> JSONDecodeError:
+        return tokenizer._error(msg)
+
+    for tok, val in tokenizer.tokens():
+        if state == "done":
+            raise fail("Extra data")
+        if state in ("key", "key_or_end"):
+            if tok == "string":
+                state = "colon"
+                yield "map_key", val
+                continue
+            if tok == "}" and state == "key_or_end":
+                stack.pop()
+                state = "next" if stack else "done"
+                yield "end_map", None
+                continue
+            raise fail("Expecting property name enclosed in double quotes")
+        if state == "colon":
+            if tok != ":":
+                raise fail("Expecting ':' delimiter")
+            state = "value"
+            continue
+        if state == "next":
+            if tok == ",":
+                state = "key" if stack[-1] == "map" else "value"
+                continue
+            if tok == _CLOSE[stack[-1]]:
+                yield ("end_map" if stack.pop() == "map" else "end_array"), None
+                state = "next" if stack else "done"
+                continue
+            raise fail("Expecting ',' delimiter")
+        # state is "value" or "value_or_end"
+        if tok in _START:
+            kind, event = _START[tok]
+            stack.append(kind)
+            state = "key_or_end" if kind == "map" else "value_or_end"
+            yield event, None
+        elif tok == "]" and state == "value_or_end":
+            stack.pop()
+            state = "next" if stack else "done"
+            yield "end_array", None
+        elif tok in "{}[]:,":
+            raise fail("Expecting value")
+        else:
+            state = "next" if stack else "done"
+            yield tok, val
+
+    if stack:
+        raise fail(f"Unterminated {'object' if stack[-1] == 'map' else 'array'}")
+    if state != "done":
+        raise fail("Expecting value")
+
+
+def next_event(events: Iterator) -> tuple[str, object]:
+    """next(events), with the end of input reported as a JSONDecodeError."""
+    try:
+        return next(events)
+    except StopIteration:
+        raise JSONDecodeError("Unexpected end of input", "", 0) from None
+
+
+def iter_map_items(fp: IO[str], unwrap: str | None = None,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, object]]:
+    """Yield (key, value) for each entry of the top-level map in fp.
+
+    Each value is decoded whole by the C decoder, several times faster
+    than events + build_value when every entry is kept anyway. If the
+    first key is unwrap and holds a map of records (or an empty map), that
+    map's entries are yielded instead and the rest of the document is
+    not read. A first entry whose fields are scalars or sets is not a
+    wrapper, just an entry named unwrap, and is yielded as is.
+    """
+    yield from _Tokenizer(fp, chunk_size).map_items(unwrap)
+
+
+def build_value(events: Iterator, event: str, value: object) -> object:
+    """Materialize the value that starts with (event, value)."""
+    if event == "start_map":
+        obj = {}
+        for ev, key in events:
+            if ev == "end_map":
+                return obj
+            ev, val = next_event(events)
+            obj[key] = build_value(events, ev, val)
+        raise JSONDecodeError("Unterminated object", "", 0)
+    if event == "start_array":
+        arr = []
+        for ev, val in events:
+            if ev == "end_array":
+                return arr
+            arr.append(build_value(events, ev, val))
+        raise JSONDecodeError("Unterminated array", "", 0)
+    return value
+
+
+def skip_value(events: Iterator, event: str | None = None) -> None:
+    """Consume one value without building it.
+
+    Pass the value's first event if it was already read; otherwise the
+    next event is taken as the start of the value.
+    """
+    if event is None:
+        event, _ = next_event(events)
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for ev, _ in events:
+        if ev in ("start_map", "start_array"):
+            depth += 1
+        elif ev in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def iter_map(events: Iterator, started: bool = False) -> Iterator[str]:
+    """Yield the keys of a map; the caller must consume each key's value."""
+    if not started:
+        ev, _ = next_event(events)
+        if ev != "start_map":
+            raise JSONDecodeError("Expecting object", "", 0)
+    for ev, key in events:
+        if ev == "end_map":
+            return
+        yield key
+
+
+def iter_array(events: Iterator, started: bool = False) -> Iterator[tuple[str, object]]:
+    """Yield the first event of each array element; the caller consumes the rest."""
+    if not started:
+        ev, _ = next_event(events)
+        if ev != "start_array":
+            raise JSONDecodeError("Expecting array", "", 0)
+    for ev, val in events:
+        if ev == "end_array":
+            return
+        yield ev, val
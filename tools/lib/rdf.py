@@ -0,0 +1,168 @@
+"""N-Triples and Turtle for #InfraGraph resources, as a stream.
+
+Emits the triples of patterns/ntriples.cue #NTriplesExport, in the same
+order — per resource: name, one rdf:type per @type, one dependsOn per
+depends_on entry, then ipAddress, description and host when set — but
+line by line from a generator instead of one joined CUE string.
+
+    <BaseIRI><id> <https://quicue.ca/vocab#name> "<id>" .
+
+Literals are escaped per N-Triples (\\\\, \\", \\n, \\r, \\t), which CUE
+string interpolation does not do; for values without those characters
+the output is identical to `cue export -e <nt>.triples --out text`.
+
+Resources come in as (id, resource) pairs, so the same functions serve
+an exported _resources map read with jsonstream.iter_map_items and the
+adapter toolkit's in-memory graph (see graph_resources).
+
+Usage:
+
+    from lib.rdf import iter_ntriples, graph_resources
+
+    for line in iter_ntriples(graph_resources(components, deps)):
+        ...
+
+Zero dependencies — stdlib Python only.
+"""
+
+import collections
+import json
+import re
+from typing import Iterable, Iterator
+
+DEFAULT_BASE_IRI = "https://quicue.ca/resources/"
+VOCAB_IRI = "https://quicue.ca/vocab#"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+# Optional literal fields, in #NTriplesExport order: field -> vocab term.
+LITERAL_FIELDS = {"ip": "ipAddress", "description": "description", "host": "host"}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_ESCAPE_RE = re.compile(r'[\\"\n\r\t]')
+_PN_LOCAL_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+
+
+def _literal(value) -> str | None:
+    """Quoted N-Triples literal for a scalar, as CUE interpolates it."""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (bool, int, float)):
+        text = json.dumps(value)
+    else:
+        return None  # structs and lists cannot be interpolated
+    return '"' + _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group()], text) + '"'
+
+
+def graph_resources(components: dict, deps) -> Iterator[tuple[str, dict]]:
+    """(id, resource) pairs from the toolkit's (components, deps) shape."""
+    for cid, comp in components.items():
+        if cid in deps:
+            yield cid, {**comp, "depends_on": deps[cid]}
+        else:
+            yield cid, comp
+
+
+def resource_triples(rid: str, res: dict, base_iri: str = DEFAULT_BASE_IRI) -> list[str]:
+    """N-Triples lines for one resource (without newlines)."""
+    subj = f"<{base_iri}{rid}>"
+    lines = [f"{subj} <{VOCAB_IRI}name> {_literal(rid)} ."]
+    lines += [f"{subj} <{RDF_TYPE}> <{VOCAB_IRI}{t}> ." for t in res.get("@type") or {}]
+    lines += [f"{subj} <{VOCAB_IRI}dependsOn> <{base_iri}{d}> ."
+              for d in res.get("depends_on") or {}]
+    for field, term in LITERAL_FIELDS.items():
+        lit = _literal(res.get(field))
+        if lit is not None:
+            lines.append(f"{subj} <{VOCAB_IRI}{term}> {lit} .")
+    return lines
+
+
+def iter_ntriples(resources: Iterable[tuple[str, dict]],
+                  base_iri: str = DEFAULT_BASE_IRI) -> Iterator[str]:
+    """Yield each resource's N-Triples, one newline-terminated line per triple."""
+    for rid, res in resources:
+        for line in resource_triples(rid, res, base_iri):
+            yield line + "\n"
+
+
+def _vocab_term(name: str) -> str:
+    return f"quicue:{name}" if _PN_LOCAL_RE.fullmatch(name) else f"<{VOCAB_IRI}{name}>"
+
+
+def turtle_prefixes() -> str:
+    return f"@prefix quicue: <{VOCAB_IRI}> .\n\n"
+
+
+def resource_turtle(rid: str, res: dict, base_iri: str = DEFAULT_BASE_IRI) -> str:
+    """One Turtle subject block with the same triples as resource_triples."""
+    preds = []
+    types = [_vocab_term(t) for t in res.get("@type") or {}]
+    if types:
+        preds.append("a " + ", ".join(types))
+    preds.append(f"quicue:name {_literal(rid)}")
+    deps = [f"<{base_iri}{d}>" for d in res.get("depends_on") or {}]
+    if deps:
+        preds.append("quicue:dependsOn " + ", ".join(deps))
+    for field, term in LITERAL_FIELDS.items():
+        lit = _literal(res.get(field))
+        if lit is not None:
+            preds.append(f"quicue:{term} {lit}")
+    return f"<{base_iri}{rid}> " + " ;\n    ".join(preds) + " .\n\n"
+
+
+def iter_turtle(resources: Iterable[tuple[str, dict]],
+                base_iri: str = DEFAULT_BASE_IRI) -> Iterator[str]:
+    """Yield a Turtle document: the prefix header, then one block per resource."""
+    yield turtle_prefixes()
+    for rid, res in resources:
+        yield resource_turtle(rid, res, base_iri)
+
+
+# ---------------------------------------------------------------------------
+# Parallel chunked rendering
+# ---------------------------------------------------------------------------
+
+def render_chunk(batch: list, base_iri: str = DEFAULT_BASE_IRI, turtle: bool = False) -> str:
+    """Render a batch of (id, resource) pairs to one string (no Turtle header)."""
+    if turtle:
+        return "".join(resource_turtle(rid, res, base_iri) for rid, res in batch)
+    return "".join(iter_ntriples(batch, base_iri))
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_rendered(resources: Iterable[tuple[str, dict]], base_iri: str = DEFAULT_BASE_IRI,
+                  turtle: bool = False, jobs: int = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """N-Triples (or Turtle) in chunks of chunk_size resources, in input order.
+
+    With jobs > 1 chunks render in a process pool. At most 2 * jobs
+    chunks are in flight, so memory stays bounded however large the
+    input stream is.
+    """
+    if turtle:
+        yield turtle_prefixes()
+    if jobs <= 1:
+        for batch in _batches(resources, chunk_size):
+            yield render_chunk(batch, base_iri, turtle)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: collections.deque = collections.deque()
+        for batch in _batches(resources, chunk_size):
+            pending.append(pool.submit(render_chunk, batch, base_iri, turtle))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,88 @@
+"""Incremental writes into a generated output directory.
+
+Build scripts that regenerate a whole tree (server/build_static_api.py,
+operator/split_bulk.py) only rewrite files whose bytes changed, so
+mtimes, rsync and CDN caches see real changes only. A changed file is
+written to a temporary name in its directory and renamed into place, so
+readers never see a partial file. Each script records what it generated
+in a JSON manifest; prune() removes what the previous run generated and
+this one did not.
+
+Zero dependencies — stdlib Python only.
+"""
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+
+
+def read_bytes(path: str) -> bytes | None:
+    """The file's contents, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_atomic(path: str, content: bytes, mode: int = 0o644) -> None:
+    """Write content to a temporary file next to path and rename it over path."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def remove(path: str) -> bool:
+    """Unlink path; False if it was already gone."""
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def load_manifest(path: str) -> dict | None:
+    """The JSON manifest at path, or None if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def prune(out_dir: str, stale: Iterable[str], suffixes: Iterable[str] = (),
+          root: str | None = None) -> int:
+    """Remove stale files, their suffixed siblings, and directories left empty.
+
+    stale holds paths relative to out_dir; for each, path + suffix is
+    removed too (e.g. ".gz"). Empty parent directories are removed up to,
+    but not including, root (default out_dir). Returns the number of
+    stale files removed.
+    """
+    suffixes = tuple(suffixes)
+    root = os.path.abspath(root or out_dir)
+    removed = 0
+    for rel in sorted(stale):
+        path = os.path.join(out_dir, rel)
+        if remove(path):
+            removed += 1
+        for suffix in suffixes:
+            remove(path + suffix)
+        parent = os.path.dirname(os.path.abspath(path))
+        while parent.startswith(root + os.sep):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+    return removed
@@ -0,0 +1,155 @@
+"""TOON codec matching patterns/toon.cue #TOONExport.
+
+encode() renders the same text as #TOONExport.TOON: resources grouped
+by field signature (the Fields present on each resource, "types"
+always), one table per group with rows sorted, tables sorted, then the
+sorted dependency edge table:
+
+    resources[2]{name,types,ip}:
+      dns,DNSServer|LXCContainer,10.0.0.1
+      web,WebFrontend,10.0.0.2
+
+    dependencies[1]{from,to}:
+      web,dns
+
+Resources are consumed from an iterator in a single pass; only the
+rendered rows and edge pairs are kept until the tables are sorted.
+
+decode() parses that text back into a _resources map. Values carry no
+quoting in TOON, so a value containing the field separator (or a type
+containing the type separator) cannot be round-tripped; decode raises
+ValueError when a row does not split into its header's fields.
+
+Usage:
+
+    from lib.toon import decode, encode
+
+    text = encode(resources.items(), fields=["name", "types", "ip"])
+    resources = decode(text)
+
+Zero dependencies — stdlib Python only.
+"""
+
+import json
+import re
+from typing import Iterable
+
+DEFAULT_FIELDS = ("name", "types", "ip", "host")
+
+# #TOONExport declares these `int | string`; digit-only cells decode as ints.
+INT_FIELDS = ("container_id", "vm_id")
+
+_HEADER_RE = re.compile(r"(resources|dependencies)\[(\d+)\]\{([^}]*)\}:")
+_INT_RE = re.compile(r"-?(?:0|[1-9]\d*)")
+
+
+def _cell(rid: str, field: str, value) -> str:
+    """A field value as CUE string interpolation renders it."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, int, float)):
+        return json.dumps(value)
+    raise ValueError(f"{rid}.{field}: cannot interpolate {type(value).__name__} into a TOON row")
+
+
+class TOONEncoder:
+    """Accumulates resources one at a time; render() returns the TOON text."""
+
+    def __init__(self, fields: Iterable[str] = DEFAULT_FIELDS, include_deps: bool = True,
+                 field_separator: str = ",", type_separator: str = "|") -> None:
+        self.fields = list(fields)
+        self.include_deps = include_deps
+        self.field_separator = field_separator
+        self.type_separator = type_separator
+        self.groups: dict[str, list[str]] = {}
+        self.edges: list[tuple[str, str]] = []
+
+    def add(self, rid: str, res: dict) -> None:
+        present = [f for f in self.fields if f == "types" or f in res]
+        row = self.field_separator.join(
+            self.type_separator.join(res.get("@type") or {}) if f == "types"
+            else _cell(rid, f, res[f])
+            for f in present
+        )
+        self.groups.setdefault(",".join(present), []).append(row)
+        self.edges.extend((rid, dep) for dep in res.get("depends_on") or {})
+
+    def render(self) -> str:
+        tables = sorted(
+            f"resources[{len(rows)}]{{{sig}}}:\n" + "\n".join("  " + r for r in sorted(rows))
+            for sig, rows in self.groups.items() if sig
+        )
+        dep_table = ""
+        if self.include_deps and self.edges:
+            dep_table = f"dependencies[{len(self.edges)}]{{from,to}}:\n" + "\n".join(
+                f"  {a},{b}" for a, b in sorted(self.edges))
+        return "\n\n".join(["\n\n".join(tables), dep_table]).strip()
+
+
+def encode(resources: Iterable[tuple[str, dict]], fields: Iterable[str] = DEFAULT_FIELDS,
+           include_deps: bool = True, field_separator: str = ",",
+           type_separator: str = "|") -> str:
+    """#TOONExport.TOON for (id, resource) pairs."""
+    enc = TOONEncoder(fields, include_deps, field_separator, type_separator)
+    for rid, res in resources:
+        enc.add(rid, res)
+    return enc.render()
+
+
+def decode(text: str, field_separator: str = ",", type_separator: str = "|",
+           int_fields: Iterable[str] = INT_FIELDS) -> dict:
+    """Parse TOON text back into {name: resource}.
+
+    Tables need a "name" column to key resources. "types" becomes
+    "@type": {type: true} and the dependency table becomes depends_on.
+    """
+    int_fields = set(int_fields)
+    resources: dict = {}
+    edges: list[tuple[str, str]] = []
+    kind, fields, expected, seen = None, [], 0, 0
+
+    def close(lineno: int) -> None:
+        if kind is not None and seen != expected:
+            raise ValueError(f"line {lineno}: {kind} table declares {expected} rows, has {seen}")
+
+    lines = text.splitlines()
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if not line.startswith("  "):
+            m = _HEADER_RE.fullmatch(line.strip())
+            if not m:
+                raise ValueError(f"line {lineno}: expected a table header, got {line!r}")
+            close(lineno)
+            kind, expected, seen = m.group(1), int(m.group(2)), 0
+            fields = m.group(3).split(",")
+            if kind == "resources" and "name" not in fields:
+                raise ValueError(f"line {lineno}: resources table has no name column")
+            continue
+        if kind is None:
+            raise ValueError(f"line {lineno}: row outside a table")
+        # #TOONExport always joins edge rows with ",".
+        cells = line[2:].split("," if kind == "dependencies" else field_separator)
+        if len(cells) != len(fields):
+            raise ValueError(f"line {lineno}: {len(cells)} cells for {len(fields)} fields "
+                             f"({','.join(fields)})")
+        seen += 1
+        if kind == "dependencies":
+            edges.append((cells[0], cells[1]))
+            continue
+        res: dict = {}
+        for f, cell in zip(fields, cells):
+            if f == "types":
+                res["@type"] = dict.fromkeys(cell.split(type_separator) if cell else [], True)
+            elif f in int_fields and _INT_RE.fullmatch(cell):
+                res[f] = int(cell)
+            else:
+                res[f] = cell
+        resources[res["name"]] = res
+    close(len(lines) + 1)
+
+    for src, dst in edges:
+        if src not in resources:
+            raise ValueError(f"dependency from unknown resource {src!r}")
+        resources[src].setdefault("depends_on", {})[dst] = True
+    return resources
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Export an #InfraGraph as N-Triples (or Turtle) without cue.
+
+Produces the same triples, in the same order, as
+patterns.#NTriplesExport (see lib/rdf.py), reading the exported
+_resources map one resource at a time, so memory stays bounded for
+graphs with millions of triples.
+
+Usage:
+    # Pipe from cue export
+    cue export ./examples/datacenter/ -e _resources | \\
+        python3 tools/ntriples.py - --base-iri https://infra.example.com/resources/
+
+    # Adapter --json output or a _resources JSON file, gzipped
+    python3 tools/ntriples.py resources.json --gzip -o graph.nt.gz
+
+    # Turtle, rendered on 8 processes
+    python3 tools/ntriples.py resources.json --turtle -j 8 -o graph.ttl
+
+Zero dependencies — stdlib Python only (cue is only needed for .cue input).
+"""
+
+import argparse
+import os
+import sys
+
+from lib.adapter import write_output
+from lib.rdf import DEFAULT_BASE_IRI, DEFAULT_CHUNK_SIZE, iter_rendered
+from toposort import iter_resources
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export #InfraGraph resources as N-Triples or Turtle",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input",
+                        help="_resources JSON file, '-' for stdin, or a CUE package/file")
+    parser.add_argument("-e", "--expr", default="_resources",
+                        help="Expression to export for CUE input (default: _resources)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--base-iri", default=DEFAULT_BASE_IRI,
+                        help=f"Resource IRI prefix (default: {DEFAULT_BASE_IRI})")
+    parser.add_argument("--turtle", action="store_true", help="Turtle instead of N-Triples")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Render chunks on N processes (0 = CPU count; default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Resources per rendered chunk (default: {DEFAULT_CHUNK_SIZE})")
+
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    jobs = args.jobs or os.cpu_count() or 1
+
+    chunks = iter_rendered(iter_resources(args.input, args.expr), args.base_iri,
+                           args.turtle, jobs, args.chunk_size)
+    try:
+        write_output(chunks, args.output, args.gzip)
+    except (OSError, ValueError) as e:  # JSONDecodeError is a ValueError
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.output:
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
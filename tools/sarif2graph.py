@@ -32,6 +32,9 @@ Usage:
     # Print statistics
     python tools/sarif2graph.py report.sarif --stats
 
+    # Merge many inputs (directories, globs) parsed in parallel
+    python tools/sarif2graph.py reports/ -o examples/security/resources.cue
+
 Output:
     CUE file with _resources (graph input) and _precomputed (depths),
     ready to wire into patterns.#InfraGraph.
@@ -52,6 +55,7 @@ class SarifAdapter(BaseAdapter):
     name = "sarif"
     description = "Convert SARIF 2.1.0 results to #InfraGraph"
     metadata_fields = ["severity", "ruleId", "message", "location"]
+    input_patterns = ("*.sarif", "*.sarif.json")
 
     def parse(self, path: str, args) -> tuple[dict, dict]:
         """Parse a SARIF JSON file and extract components and dependencies.
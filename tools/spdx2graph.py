@@ -24,6 +24,12 @@ Usage:
     # Print stats
     python tools/spdx2graph.py sbom.spdx.json --stats
 
+    # Merge many inputs (directories, globs) parsed in parallel
+    python tools/spdx2graph.py 'sboms/**/*.spdx.json' -j 16 -o merged.cue
+
+    # Reuse parsed SBOMs and output across runs (re-parse only changed files)
+    python tools/spdx2graph.py sboms/ --cache -o merged.cue
+
 Output:
     CUE file with _resources (graph input) and _precomputed (depths),
     ready to wire into patterns.#InfraGraph.
@@ -63,6 +69,7 @@ class SpdxAdapter(BaseAdapter):
     name = "spdx"
     description = "Convert SPDX 2.3 SBOM (JSON) to #InfraGraph"
     metadata_fields = ["spdxId", "version", "license", "supplier", "downloadLocation"]
+    input_patterns = ("*.spdx.json",)
 
     def parse(self, path: str, args: argparse.Namespace) -> tuple[dict, dict]:
         """Parse SPDX JSON SBOM and extract components + dependencies.
@@ -0,0 +1,401 @@
+"""Tests for the adapter toolkit renderers."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from lib.adapter import (
+    BaseAdapter,
+    compute_closure,
+    compute_depths,
+    expand_inputs,
+    iter_cue,
+    iter_json,
+    merge_graphs,
+    parse_inputs,
+    render_cue,
+    render_json,
+    render_jsonld,
+    write_jsonld_chunks,
+    write_output,
+)
+from lib.csr import CSRGraph
+
+
+def _graph(n: int = 200, seed: int = 7) -> tuple[dict, dict]:
+    rng = random.Random(seed)
+    components, deps = {}, {}
+    for i in range(n):
+        cid = f"node-{i}"
+        components[cid] = {
+            "name": cid,
+            "@type": {"Service": True} if i % 3 else {"Database": True, "Stateful": True},
+            "version": f"1.{i}",
+            "note": 'quote " and tab \t and é',
+        }
+        if i:
+            deps[cid] = dict.fromkeys(
+                (f"node-{j}" for j in rng.sample(range(i), min(i, 3))), True
+            )
+    return components, deps
+
+
+def _naive_closure(components: dict, deps: dict) -> tuple[dict, dict]:
+    """Ancestors and dependents by a DFS from every node."""
+    def reach(start, edges):
+        seen, stack = set(), [start]
+        while stack:
+            for nxt in edges.get(stack.pop(), ()):
+                if nxt in components and nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        seen.discard(start)
+        return seen
+
+    reverse: dict[str, list[str]] = {}
+    for cid, dep_map in deps.items():
+        for dep in dep_map:
+            reverse.setdefault(dep, []).append(cid)
+    forward = {cid: [c for c in reverse.get(cid, ()) if c in components] for cid in components}
+    return ({cid: reach(cid, deps) for cid in components},
+            {cid: reach(cid, forward) for cid in components})
+
+
+def _reference_json(components, deps, depths, closure=None) -> dict:
+    output = {"resources": {}, "precomputed": {"depth": depths}}
+    if closure is not None:
+        output["precomputed"]["ancestors"] = closure[0]
+        output["precomputed"]["dependents"] = closure[1]
+    for cid, comp in components.items():
+        entry = {"name": cid, "@type": comp["@type"]}
+        if cid in deps:
+            entry["depends_on"] = deps[cid]
+        for k, v in comp.items():
+            if k not in ("name", "@type"):
+                entry[k] = v
+        output["resources"][cid] = entry
+    return output
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_closure_matches_naive_dfs_on_cyclic_graphs(seed: int) -> None:
+    rng = random.Random(seed)
+    n = rng.randint(1, 60)
+    components = {f"n{i}": {"name": f"n{i}"} for i in range(n)}
+    deps = {}
+    for cid in components:
+        # Any node, earlier or later (cycles, self-loops), plus dangling ids.
+        targets = [f"n{rng.randrange(n)}" for _ in range(rng.randint(0, 3))]
+        targets += [f"missing-{rng.randrange(5)}" for _ in range(rng.randint(0, 1))]
+        if targets:
+            deps[cid] = dict.fromkeys(targets, True)
+    deps["not-a-component"] = {"n0": True}
+
+    ancestors, dependents = compute_closure(components, deps)
+    want_anc, want_dep = _naive_closure(components, deps)
+    assert {c: set(a) for c, a in ancestors.items()} == want_anc
+    assert {c: set(d) for c, d in dependents.items()} == want_dep
+
+    csr = CSRGraph.from_graph(components, deps)
+    assert compute_closure(components, csr) == (ancestors, dependents)
+
+
+def test_json_is_byte_identical_to_json_dumps() -> None:
+    components, deps = _graph()
+    depths = compute_depths(components, deps)
+    closure = compute_closure(components, deps)
+    for c in (None, closure):
+        expected = json.dumps(_reference_json(components, deps, depths, c), indent=2) + "\n"
+        assert render_json(components, deps, depths, closure=c) == expected
+
+
+def test_json_empty_graph() -> None:
+    expected = json.dumps(_reference_json({}, {}, {}), indent=2) + "\n"
+    assert render_json({}, {}, {}) == expected
+
+
+def test_compact_json_round_trips() -> None:
+    components, deps = _graph(50)
+    depths = compute_depths(components, deps)
+    closure = compute_closure(components, deps)
+    text = render_json(components, deps, depths, closure=closure, compact=True)
+    assert "\n" not in text.rstrip("\n")
+    assert json.loads(text) == _reference_json(components, deps, depths, closure)
+    assert json.loads(render_json({}, {}, {}, compact=True)) == _reference_json({}, {}, {})
+
+
+def test_cue_matches_expected_layout() -> None:
+    components = {
+        "db": {"name": "db", "@type": {"Database": True}, "port": 5432},
+        "web": {"name": "web", "@type": {"WebServer": True, "Service": True}},
+    }
+    deps = {"web": {"db": True}}
+    depths = compute_depths(components, deps)
+    closure = compute_closure(components, deps)
+    text = render_cue(components, deps, depths, "demo", "in.json",
+                      header_lines=["extra"], metadata_fields=["port"], closure=closure)
+    assert text == (
+        "// demo — generated from in.json\n"
+        "// extra\n"
+        "//\n"
+        "// Components: 2\n"
+        "// Generated by: quicue.ca adapter toolkit\n"
+        "\n"
+        "package demo\n"
+        "\n"
+        "import (\n"
+        '\t"quicue.ca/patterns@v0"\n'
+        ")\n"
+        "\n"
+        "_resources: {\n"
+        '\t"db": {\n'
+        '\t\tname: "db"\n'
+        '\t\t"@type": {Database: true}\n'
+        "\t\tport: 5432\n"
+        "\t}\n"
+        '\t"web": {\n'
+        '\t\tname: "web"\n'
+        '\t\t"@type": {Service: true, WebServer: true}\n'
+        '\t\tdepends_on: {"db": true}\n'
+        "\t}\n"
+        "}\n"
+        "\n"
+        "_precomputed: {\n"
+        "\tdepth: {\n"
+        '\t\t"db": 0\n'
+        '\t\t"web": 1\n'
+        "\t}\n"
+        "\tancestors: {\n"
+        '\t\t"db": {}\n'
+        '\t\t"web": {"db": true}\n'
+        "\t}\n"
+        "\tdependents: {\n"
+        '\t\t"db": {"web": true}\n'
+        '\t\t"web": {}\n'
+        "\t}\n"
+        "}\n"
+        "\n"
+        "infra: patterns.#InfraGraph & {\n"
+        "\tInput:       _resources\n"
+        "\tPrecomputed: _precomputed\n"
+        "}\n"
+    )
+
+
+def test_iter_cue_yields_whole_lines() -> None:
+    components, deps = _graph(30)
+    depths = compute_depths(components, deps)
+    chunks = list(iter_cue(components, deps, depths, "p", "src", metadata_fields=["version"]))
+    assert all(c.endswith("\n") and c.count("\n") == 1 for c in chunks)
+
+
+def test_write_output_plain_and_gzip(tmp_path) -> None:
+    components, deps = _graph(100)
+    depths = compute_depths(components, deps)
+    expected = render_json(components, deps, depths)
+
+    plain = tmp_path / "out" / "graph.json"
+    write_output(iter_json(components, deps, depths), str(plain))
+    assert plain.read_text() == expected
+
+    gz = tmp_path / "graph.json.gz"
+    write_output(iter_json(components, deps, depths), str(gz), compress=True)
+    assert gzip.decompress(gz.read_bytes()).decode() == expected
+
+    # No timestamp in the header: same input, same bytes.
+    first = gz.read_bytes()
+    write_output(iter_json(components, deps, depths), str(gz), compress=True)
+    assert gz.read_bytes() == first
+
+
+def _parse_fixture(path: str, suffix: str) -> tuple[dict, dict]:
+    data = json.loads(Path(path).read_text())
+    components = {
+        cid: {"name": cid, "@type": {t: True}, "origin": data["origin"] + suffix}
+        for cid, t in data["types"].items()
+    }
+    return components, {cid: dict.fromkeys(ds, True) for cid, ds in data["deps"].items()}
+
+
+def test_expand_inputs_is_sorted_and_deduplicated(tmp_path) -> None:
+    (tmp_path / "b").mkdir()
+    for name in ("b/2.json", "b/1.json", "a.json", "skip.txt"):
+        (tmp_path / name).write_text("{}")
+    paths = expand_inputs([str(tmp_path / "b"), str(tmp_path / "*.json"),
+                           str(tmp_path / "b" / "1.json")])
+    assert paths == [str(tmp_path / "b" / "1.json"), str(tmp_path / "b" / "2.json"),
+                     str(tmp_path / "a.json")]
+    assert expand_inputs([str(tmp_path)], ("*.txt",)) == [str(tmp_path / "skip.txt")]
+
+
+def test_merge_graphs_unions_sets_and_first_field_wins() -> None:
+    first = (
+        {"lib": {"name": "lib", "@type": {"SoftwareLibrary": True}, "version": "1"}},
+        {"lib": {"base": True}},
+    )
+    second = (
+        {
+            "lib": {"name": "lib", "@type": {"Stateful": True}, "version": "2", "license": "MIT"},
+            "app": {"name": "app", "@type": {"SoftwareApplication": True}},
+        },
+        {"lib": {"zlib": True}, "app": {"lib": True}},
+    )
+    components, deps, conflicts = merge_graphs([first, second])
+    assert list(components) == ["lib", "app"]
+    assert components["lib"] == {
+        "name": "lib",
+        "@type": {"SoftwareLibrary": True, "Stateful": True},
+        "version": "1",
+        "license": "MIT",
+    }
+    assert deps == {"lib": {"base": True, "zlib": True}, "app": {"lib": True}}
+    assert conflicts == 1
+    # Inputs are not mutated.
+    assert first[0]["lib"]["@type"] == {"SoftwareLibrary": True}
+    assert first[1]["lib"] == {"base": True}
+
+
+def test_parallel_parse_matches_serial(tmp_path) -> None:
+    paths = []
+    for i in range(12):
+        path = tmp_path / f"in{i:02}.json"
+        path.write_text(json.dumps({
+            "origin": path.name,
+            "types": {f"svc{i}": "Service", "shared": "Database"},
+            "deps": {f"svc{i}": ["shared"]},
+        }))
+        paths.append(str(path))
+    serial = merge_graphs(parse_inputs(_parse_fixture, paths, "!", jobs=1))
+    parallel = merge_graphs(parse_inputs(_parse_fixture, paths, "!", jobs=4))
+    assert serial == parallel
+    components, deps, conflicts = parallel
+    assert components["shared"]["origin"] == "in00.json!"
+    assert conflicts == 1
+    assert len(components) == 13
+
+
+def test_parse_error_names_the_input(tmp_path) -> None:
+    bad = tmp_path / "bad.json"
+    bad.write_text("{")
+    with pytest.raises(RuntimeError, match="bad.json"):
+        list(parse_inputs(_parse_fixture, [str(bad)], ""))
+
+
+def test_jsonld_matches_vocab_projection() -> None:
+    components, deps = _graph(30)
+    components["node-1"]["ip"] = "10.0.0.1"
+    doc = render_jsonld(components, deps, "https://x.test/r/")
+    parsed = json.loads(doc)
+    assert doc == json.dumps(parsed, indent=2) + "\n"
+    assert json.loads(render_jsonld(components, deps, "https://x.test/r/", compact=True)) == parsed
+
+    ctx = parsed["@context"]
+    assert ctx["@base"] == "https://x.test/r/"
+    assert ctx["depends_on"] == {"@id": "dcterms:requires", "@type": "@id"}
+    assert all(ctx[t] == f"quicue:{t}" for c in components.values() for t in c["@type"])
+    nodes = {n["@id"]: n for n in parsed["@graph"]}
+    assert len(nodes) == len(components)
+    r1 = nodes["https://x.test/r/node-1"]
+    assert r1["ip"] == "10.0.0.1" and r1["@type"] == list(components["node-1"]["@type"])
+    for cid, dep_map in deps.items():
+        assert nodes[f"https://x.test/r/{cid}"]["depends_on"] == list(dep_map)
+
+
+def test_jsonld_chunks_cover_the_graph(tmp_path) -> None:
+    components, deps = _graph(25)
+    index = write_jsonld_chunks(components, deps, str(tmp_path / "ld"), 10)
+    assert [c["nodes"] for c in index["chunks"]] == [10, 10, 5]
+    assert json.loads((tmp_path / "ld" / "index.json").read_text()) == index
+    whole = json.loads(render_jsonld(components, deps))
+    assert json.loads((tmp_path / "ld" / "context.jsonld").read_text()) == \
+        {"@context": whole["@context"]}
+    graph = []
+    for chunk in index["chunks"]:
+        doc = json.loads((tmp_path / "ld" / chunk["file"]).read_text())
+        assert doc["@context"] == "context.jsonld"
+        graph += doc["@graph"]
+    assert graph == whole["@graph"]
+
+
+class _GoldenAdapter(BaseAdapter):
+    name = "golden"
+
+    def parse(self, path, args):
+        data = json.loads(Path(path).read_text())
+        return ({n: {"name": n, "@type": {"Service": True}} for n in data},
+                {n: dict.fromkeys(ds, True) for n, ds in data.items() if ds})
+
+
+# Output of the adapter toolkit before the closure existed.
+GOLDEN_CUE = """\
+// g — generated from g.json
+//
+// Components: 4
+// Generated by: quicue.ca adapter toolkit
+
+package g
+
+import (
+\t"quicue.ca/patterns@v0"
+)
+
+_resources: {
+\t"db": {
+\t\tname: "db"
+\t\t"@type": {Service: true}
+\t}
+\t"cache": {
+\t\tname: "cache"
+\t\t"@type": {Service: true}
+\t}
+\t"api": {
+\t\tname: "api"
+\t\t"@type": {Service: true}
+\t\tdepends_on: {"cache": true, "db": true}
+\t}
+\t"web": {
+\t\tname: "web"
+\t\t"@type": {Service: true}
+\t\tdepends_on: {"api": true}
+\t}
+}
+
+_precomputed: {
+\tdepth: {
+\t\t"cache": 0
+\t\t"db": 0
+\t\t"api": 1
+\t\t"web": 2
+\t}
+}
+
+infra: patterns.#InfraGraph & {
+\tInput:       _resources
+\tPrecomputed: _precomputed
+}
+"""
+
+
+def test_default_run_output_is_unchanged(tmp_path, monkeypatch, capsysbinary) -> None:
+    path = tmp_path / "g.json"
+    path.write_text(json.dumps({"web": ["api"], "api": ["db", "cache"], "db": [], "cache": []}))
+
+    def run(*flags: str) -> str:
+        monkeypatch.setattr(sys, "argv", ["golden", str(path), *flags])
+        _GoldenAdapter().run()
+        return capsysbinary.readouterr().out.decode("utf-8")
+
+    assert run() == GOLDEN_CUE
+    data = json.loads(run("--json"))
+    assert data["precomputed"] == {"depth": {"db": 0, "cache": 0, "api": 1, "web": 2}}
+
+    closure = json.loads(run("--json", "--closure"))["precomputed"]
+    assert closure["ancestors"]["web"] == {"api": True, "cache": True, "db": True}
+    assert closure["dependents"]["db"] == {"api": True, "web": True}
+    assert "ancestors: {" in run("--closure")
@@ -0,0 +1,175 @@
+"""Analytics must agree with the comprehensions in patterns/graph.cue."""
+
+from __future__ import annotations
+
+import random
+
+from lib.adapter import compute_depths
+from lib.analytics import (
+    GraphIndex,
+    articulation_points,
+    blast_radius,
+    blast_summaries,
+    criticality,
+    dominator_counts,
+    dominators,
+    single_points_of_failure,
+)
+
+
+def _graph(n: int = 120, seed: int = 3) -> tuple[dict, dict]:
+    rng = random.Random(seed)
+    types = ["DNSServer", "Database", "WebServer", "LoadBalancer"]
+    components, deps = {}, {}
+    for i in range(n):
+        cid = f"r{i}"
+        components[cid] = {"name": cid, "@type": {t: True for t in rng.sample(types, rng.randint(1, 2))}}
+        if i:
+            deps[cid] = dict.fromkeys((f"r{j}" for j in rng.sample(range(i), min(i, rng.randint(0, 2)))), True)
+    return components, deps
+
+
+def _ancestors(deps: dict, cid: str) -> set:
+    seen, stack = set(), list(deps.get(cid, {}))
+    while stack:
+        d = stack.pop()
+        if d not in seen:
+            seen.add(d)
+            stack.extend(deps.get(d, {}))
+    return seen
+
+
+def test_matches_naive_cue_semantics() -> None:
+    components, deps = _graph()
+    depths = compute_depths(components, deps)
+    anc = {cid: _ancestors(deps, cid) for cid in components}
+    g = GraphIndex(components, deps, depths)
+
+    # #CriticalityRank: count resources whose _ancestors contain rname.
+    naive_crit = [
+        {"name": c, "dependents": sum(1 for r in components if c in anc[r])}
+        for c in components
+    ]
+    assert criticality(g) == naive_crit
+
+    # #SinglePointsOfFailure: same type at same depth is a peer.
+    groups: dict = {}
+    for c in components:
+        for t in components[c]["@type"]:
+            groups.setdefault(t, []).append(c)
+    risks = []
+    for c in naive_crit:
+        if c["dependents"] == 0:
+            continue
+        name = c["name"]
+        has_peer = any(
+            peer != name and depths[peer] == depths[name]
+            for t in components[name]["@type"] for peer in groups[t]
+        )
+        if not has_peer:
+            risks.append({"name": name, "dependents": c["dependents"],
+                          "types": components[name]["@type"], "depth": depths[name]})
+    spof = single_points_of_failure(g)
+    assert spof["risks"] == risks
+    assert spof["summary"] == {
+        "spof_count": len(risks),
+        "total_with_deps": sum(1 for c in naive_crit if c["dependents"] > 0),
+    }
+
+    # #BlastRadius, for every target.
+    summaries = blast_summaries(g)
+    for target in components:
+        affected = [r for r in components if target in anc[r]]
+        rollback = sorted(affected, key=lambda r: -depths[r]) + [target]
+        safe = [r for r in components
+                if depths[r] == depths[target] and r != target and r not in affected]
+        br = blast_radius(g, target)
+        assert list(br["affected"]) == affected
+        assert br["rollback_order"] == rollback
+        assert br["startup_order"] == rollback[::-1]
+        assert list(br["safe_peers"]) == safe
+        assert summaries[target] == {
+            "affected_count": len(affected),
+            "rollback_steps": len(rollback),
+            "safe_peer_count": len(safe),
+        }
+
+
+def _reachable(succ: dict, starts: list, removed: str | None = None) -> set:
+    seen = set()
+    stack = [s for s in starts if s != removed]
+    while stack:
+        v = stack.pop()
+        if v in seen:
+            continue
+        seen.add(v)
+        stack.extend(w for w in succ.get(v, ()) if w != removed)
+    return seen
+
+
+def test_structural_matches_brute_force() -> None:
+    for seed in range(25):
+        rng = random.Random(seed)
+        n = rng.randint(2, 30)
+        components = {f"v{i}": {"name": f"v{i}", "@type": {"T": True}} for i in range(n)}
+        deps = {}
+        for i in range(n):
+            # Mostly a DAG, with the occasional back edge to form cycles.
+            picks = rng.sample(range(n), rng.randint(0, 2))
+            ds = {f"v{j}": True for j in picks if j < i or rng.random() < 0.1}
+            ds.pop(f"v{i}", None)
+            if ds:
+                deps[f"v{i}"] = ds
+
+        und: dict = {v: set() for v in components}
+        succ: dict = {v: [] for v in components}
+        for v, ds in deps.items():
+            for d in ds:
+                und[v].add(d)
+                und[d].add(v)
+                succ[d].append(v)
+
+        def components_count(removed=None, cut_edge=None):
+            seen, count = set(), 0
+            for v in components:
+                if v == removed or v in seen:
+                    continue
+                count += 1
+                stack = [v]
+                while stack:
+                    x = stack.pop()
+                    if x in seen:
+                        continue
+                    seen.add(x)
+                    for y in und[x]:
+                        if y != removed and {x, y} != cut_edge:
+                            stack.append(y)
+            return count
+
+        base = components_count()
+        cut, bridges = articulation_points(components, deps)
+        assert set(cut) == {v for v in components if components_count(removed=v) > base}
+        want = {frozenset((d, v)) for v, ds in deps.items() for d in ds
+                if v not in deps.get(d, {}) and components_count(cut_edge={d, v}) > base}
+        assert {frozenset(b) for b in bridges} == want
+
+        # Dominance from the same virtual-root entry set dominators() uses.
+        idom = dominators(components, deps)
+        entries = [v for v in components if not deps.get(v)]
+        reach = _reachable(succ, entries)
+        for v in components:
+            if v not in reach:
+                entries.append(v)
+                reach |= _reachable(succ, [v])
+        doms = {
+            v: {d for d in components if d != v and v not in _reachable(succ, entries, removed=d)}
+            for v in components
+        }
+        for v, d in idom.items():
+            if d is None:
+                assert not doms[v]
+            else:
+                # The immediate dominator is the dominator every other one dominates.
+                assert d in doms[v] and doms[v] - {d} <= doms[d]
+        counts = dominator_counts(idom)
+        assert counts == {d: sum(1 for v in components if d in doms[v]) for d in components}
@@ -0,0 +1,98 @@
+"""Tests for the content-addressed cache and adapter --cache mode."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from lib.adapter import BaseAdapter
+from lib.cache import ContentCache, digest
+
+
+def test_digest_separates_parts() -> None:
+    assert digest("ab", "c") != digest("a", "bc")
+    assert digest("x") == digest(b"x")
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path) -> None:
+    cache = ContentCache(tmp_path, max_bytes=250)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put_bytes(key, b"x" * 100)
+        os.utime(cache.path(key), (1000 + i, 1000 + i))
+    # "c" pushed the total to 300 > 250, evicting the oldest ("a").
+    assert cache.get("a") is None
+    assert cache.get_bytes("b") == b"x" * 100  # refreshes b
+    cache.put_bytes("d", b"y" * 100)
+    assert cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".tmp-")]
+
+
+
+def test_puts_do_not_rescan_the_directory(tmp_path, monkeypatch) -> None:
+    scans = []
+    scan = ContentCache._scan
+    monkeypatch.setattr(ContentCache, "_scan", lambda self: scans.append(1) or scan(self))
+    cache = ContentCache(tmp_path, max_bytes=100 * 1000)
+    for i in range(1000):
+        cache.put_bytes(f"k{i}", b"x" * 50)
+    assert len(scans) == 1  # the first write sizes the existing entries
+    for i in range(1000, 1500):
+        cache.put_bytes(f"k{i}", b"x" * 200)
+    # Each eviction frees 10% of max_bytes: a handful of scans, not 500.
+    assert 1 < len(scans) < 20
+    total = sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert total <= cache.max_bytes
+    cache.put_bytes("k0", b"x" * 10)  # replacing an entry adjusts the total
+    assert cache._total == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+class _CountingAdapter(BaseAdapter):
+    name = "counting"
+    calls: list[str] = []
+
+    def parse(self, path, args):
+        type(self).calls.append(path)
+        data = json.loads(open(path).read())
+        components = {n: {"name": n, "@type": {"Service": True}} for n in data}
+        return components, {n: dict.fromkeys(ds, True) for n, ds in data.items()}
+
+
+def _run(monkeypatch, *argv: str) -> None:
+    monkeypatch.setattr(sys, "argv", ["counting", *argv])
+    _CountingAdapter().run()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "a.json").write_text(json.dumps({"web": ["db"], "db": []}))
+    (tmp_path / "in" / "b.json").write_text(json.dumps({"api": ["db"]}))
+    _CountingAdapter.calls = []
+    return tmp_path
+
+
+def test_unchanged_inputs_skip_parse_and_render(inputs, monkeypatch) -> None:
+    cache_dir, out = str(inputs / "cache"), inputs / "out.cue"
+    _run(monkeypatch, str(inputs / "in"), "-j", "1", "--cache-dir", cache_dir, "-o", str(out))
+    assert len(_CountingAdapter.calls) == 2
+    first = out.read_bytes()
+    out.unlink()
+
+    _run(monkeypatch, str(inputs / "in"), "-j", "1", "--cache-dir", cache_dir, "-o", str(out))
+    assert len(_CountingAdapter.calls) == 2
+    assert out.read_bytes() == first
+
+    # A render-only flag reuses parsed inputs but renders again.
+    _run(monkeypatch, str(inputs / "in"), "-j", "1", "--cache-dir", cache_dir,
+         "--json", "-o", str(inputs / "out.json"))
+    assert len(_CountingAdapter.calls) == 2
+    assert set(json.loads((inputs / "out.json").read_text())["resources"]) == {"web", "db", "api"}
+
+    # Changing one input re-parses only that input.
+    (inputs / "in" / "b.json").write_text(json.dumps({"api": ["web"]}))
+    _run(monkeypatch, str(inputs / "in"), "-j", "1", "--cache-dir", cache_dir, "-o", str(out))
+    assert _CountingAdapter.calls[2:] == [str(inputs / "in" / "b.json")]
+    assert 'depends_on: {"web": true}' in out.read_text()
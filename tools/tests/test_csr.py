@@ -0,0 +1,82 @@
+"""CSRGraph must be a drop-in for the deps dict."""
+
+from __future__ import annotations
+
+import random
+
+from lib.adapter import (
+    compute_closure,
+    compute_depths,
+    render_cue,
+    render_json,
+    topological_order,
+)
+from lib.csr import CSRGraph
+
+
+def _graph(seed: int, n: int = 80) -> tuple[dict, dict]:
+    rng = random.Random(seed)
+    components = {f"c{i}": {"name": f"c{i}", "@type": {"Service": True}} for i in range(n)}
+    deps = {}
+    for i in rng.sample(range(n), n * 3 // 4):  # shuffled entry order
+        ds = {f"c{j}": True for j in rng.sample(range(n), rng.randint(0, 3))
+              if j < i or rng.random() < 0.05}
+        if rng.random() < 0.1:
+            ds["external-ref"] = True  # dangling reference
+        deps[f"c{i}"] = ds
+    return components, deps
+
+
+def test_mapping_round_trip() -> None:
+    components, deps = _graph(1)
+    graph = CSRGraph.from_graph(components, deps)
+    assert graph.to_deps() == deps
+    assert list(graph) == list(deps)
+    assert all(list(graph[k]) == list(deps[k]) for k in deps)
+    assert "c0" in graph or "c0" not in deps
+    assert graph.get("missing") is None
+    assert graph.edge_count == sum(len(d) for d in deps.values())
+
+
+def test_depths_and_renderers_match_dicts() -> None:
+    for seed in range(20):
+        components, deps = _graph(seed)
+        graph = CSRGraph.from_graph(components, deps)
+        depths = compute_depths(components, deps)
+        # Same values and the same key order (render_json emits it).
+        assert list(graph.depths().items()) == list(depths.items())
+        assert compute_closure(components, graph) == compute_closure(components, deps)
+        closure = compute_closure(components, deps)
+        assert render_json(components, graph, depths, closure) == \
+            render_json(components, deps, depths, closure)
+        assert render_cue(components, graph, depths, "p", "s", closure=closure) == \
+            render_cue(components, deps, depths, "p", "s", closure=closure)
+
+
+def test_traversal() -> None:
+    components = {k: {"name": k, "@type": {"T": True}} for k in ("net", "db", "app", "web", "batch")}
+    deps = {"db": {"net": True}, "app": {"db": True}, "web": {"app": True}, "batch": {"db": True}}
+    graph = CSRGraph.from_graph(components, deps)
+    ix, names = graph.index, graph.names
+
+    order, cyclic = graph.topological_order()
+    assert [names[i] for i in order] == topological_order(components, deps)[0]
+    assert cyclic == []
+
+    assert [names[i] for i in graph.bfs([ix["db"]], reverse=True)] == ["db", "app", "batch", "web"]
+    assert [names[i] for i in graph.bfs([ix["web"]])] == ["web", "app", "db", "net"]
+    mask = graph.reachable([ix["app"]], reverse=True)
+    assert {names[i] for i, m in enumerate(mask) if m} == {"app", "web"}
+    assert graph.nbytes() < 200
+
+
+def test_dependent_counts_match_bfs() -> None:
+    for seed in range(5):
+        components, deps = _graph(seed)
+        deps["not-a-component"] = {"c0": True}
+        graph = CSRGraph.from_graph(components, deps)
+        rng = random.Random(seed)
+        ids = rng.sample(range(len(graph.names)), 30) + [0, 0]
+        want = [sum(1 for _ in graph.bfs([i], reverse=True)) - 1 for i in ids]
+        assert graph.dependent_counts(ids) == want
+    assert graph.dependent_counts([]) == []
@@ -0,0 +1,120 @@
+"""Tests for the cached cue export runner (lib/cuexport.py)."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from lib.cache import ContentCache
+from lib.cuexport import Target, cache_key, export, export_all, input_files
+
+FAKE_CUE = """#!{python}
+import json, os, sys
+with open({calls!r}, "a") as f:
+    f.write(os.getcwd() + " " + " ".join(sys.argv[1:]) + "\\n")
+if "fail" in sys.argv:
+    sys.stderr.write("evaluation failed\\n")
+    sys.exit(1)
+print(json.dumps({{"args": sys.argv[1:]}}))
+"""
+
+
+@pytest.fixture
+def fake_cue(tmp_path, monkeypatch):
+    """A cue on PATH that records its calls; returns the call log path."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls.log"
+    cue = bin_dir / "cue"
+    cue.write_text(FAKE_CUE.format(python=sys.executable, calls=str(calls)))
+    cue.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return calls
+
+
+@pytest.fixture
+def module(tmp_path):
+    """A module with an app package importing lib and a vendored dep."""
+    root = tmp_path / "mod"
+    (root / "cue.mod" / "pkg" / "dep.example@v0" / "util").mkdir(parents=True)
+    (root / "cue.mod" / "module.cue").write_text('module: "example.com"\n')
+    (root / "cue.mod" / "pkg" / "dep.example@v0" / "util" / "util.cue").write_text(
+        "package util\nx: 1\n")
+    (root / "lib").mkdir()
+    (root / "lib" / "lib.cue").write_text('package lib\n\nimport "strings"\n\ny: 2\n')
+    (root / "app").mkdir()
+    (root / "app" / "app.cue").write_text(
+        'package app\n\nimport (\n\t"example.com/lib"\n\tu "dep.example/util@v0"\n)\n\nz: 3\n')
+    (root / "app" / "_scratch.cue").write_text("package app\n")
+    (root / "root.cue").write_text("package app\n")
+    (root / "other.cue").write_text("package other\n")
+    (root / "unused").mkdir()
+    (root / "unused" / "u.cue").write_text("package unused\n")
+    return root
+
+
+def _calls(log) -> int:
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_input_files_follow_imports_and_ancestors(module) -> None:
+    names = {p.relative_to(module).as_posix() for p in input_files(module / "app")}
+    assert names == {
+        "app/app.cue",
+        "root.cue",  # same package in a parent directory
+        "lib/lib.cue",
+        "cue.mod/pkg/dep.example@v0/util/util.cue",
+        "cue.mod/module.cue",
+    }
+
+
+def test_key_changes_with_imports_tags_and_deps(module, fake_cue) -> None:
+    target = Target(str(module / "app"), "z")
+    key = cache_key(target)
+    assert cache_key(target) == key
+    assert cache_key(target._replace(tags=("a=1",))) != key
+    assert cache_key(target._replace(tags=("a=1", "b=2"))) == \
+        cache_key(target._replace(tags=("b=2", "a=1")))
+
+    (module / "unused" / "u.cue").write_text("package unused\nchanged: true\n")
+    assert cache_key(target) == key
+
+    (module / "lib" / "lib.cue").write_text("package lib\ny: 5\n")
+    key2 = cache_key(target)
+    assert key2 != key
+
+    (module / "cue.mod" / "module.cue").write_text(
+        'module: "example.com"\ndeps: "dep.example@v0": v: "v0.0.2"\n')
+    assert cache_key(target) != key2
+
+
+def test_export_is_cached(module, fake_cue, tmp_path) -> None:
+    cache = ContentCache(tmp_path / "cache")
+    target = Target(str(module / "app"), "z", ("timestamp=now",))
+    first = export(target, cache)
+    assert first == {"args": ["export", ".", "--out", "json", "-e", "z", "-t", "timestamp=now"]}
+    assert export(target, cache) == first
+    assert _calls(fake_cue) == 1
+
+    (module / "app" / "app.cue").write_text("package app\nz: 4\n")
+    export(target, cache)
+    assert _calls(fake_cue) == 2
+
+
+def test_export_all_dedupes_and_reports_failures(module, fake_cue, tmp_path, capsys) -> None:
+    cache = ContentCache(tmp_path / "cache")
+    app = str(module / "app")
+    results = export_all(
+        [Target(app, "a"), Target(app, "b"), Target(app, "a"), Target(app, "fail")],
+        cache, jobs=4)
+    assert results[0] == results[2]
+    assert results[1]["args"][-1] == "b"
+    assert results[3] is None
+    assert "evaluation failed" in capsys.readouterr().err
+    assert _calls(fake_cue) == 3
+
+    text = export(Target(app, "a", out="text"), cache)
+    assert json.loads(text)["args"][3] == "text"
@@ -0,0 +1,113 @@
+"""Tests for gitlab-ci2graph pipeline parsing."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "gitlab_ci2graph", Path(__file__).resolve().parent.parent / "gitlab-ci2graph.py"
+)
+gitlab = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gitlab)
+
+
+def test_implicit_stage_edges() -> None:
+    ci = {
+        "stages": ["build", "test"],
+        "a": {"stage": "build", "script": ["x"]},
+        "b": {"stage": "build", "trigger": "other/project"},
+        "c": {"stage": "test", "script": ["x"]},
+        "d": {"stage": "test", "script": ["x"], "needs": []},
+    }
+    components, deps = gitlab.parse_pipeline(ci)
+    assert deps["c"] == {"a": True, "b": True, "stage-test": True}
+    assert deps["d"] == {"stage-test": True}
+    _, dag = gitlab.parse_pipeline(ci, dag_only=True)
+    assert dag["c"] == {"stage-test": True}
+
+
+def test_extends_chain_and_precedence() -> None:
+    ci = {
+        "stages": ["build", "deploy"],
+        ".base": {"stage": "deploy", "image": "alpine", "variables": {"A": "1", "B": "1"}},
+        ".k8s": {"extends": ".base", "image": {"name": "kubectl"}, "variables": {"B": "2"}},
+        ".manual": {"when": "manual"},
+        "compile": {"stage": "build", "script": ["make"]},
+        "ship": {"extends": [".k8s", ".manual"], "script": ["kubectl apply"],
+                 "environment": {"name": "prod"}},
+    }
+    resolved = gitlab.resolve_extends(ci)
+    assert resolved["ship"]["variables"] == {"A": "1", "B": "2"}
+    assert "extends" not in resolved["ship"]
+
+    components, deps = gitlab.parse_pipeline(ci)
+    assert components["ship"] == {
+        "name": "ship", "@type": {"CIJob": True},
+        "environment": "prod", "manual": True, "image": "kubectl",
+    }
+    # Stage inherited from the template drives implicit ordering.
+    assert deps["ship"] == {"compile": True, "stage-deploy": True}
+
+
+def test_extends_cycle_is_an_error() -> None:
+    ci = {".a": {"extends": ".b"}, ".b": {"extends": ".a"}, "j": {"extends": ".a"}}
+    with pytest.raises(ValueError, match="circular"):
+        gitlab.resolve_extends(ci)
+
+
+def test_unknown_template_is_skipped(capsys) -> None:
+    ci = {"stages": ["test"], "j": {"extends": ".from-include", "script": ["x"]}}
+    components, _ = gitlab.parse_pipeline(ci)
+    assert "j" in components
+    assert ".from-include" in capsys.readouterr().err
+
+
+def test_parallel_matrix_expansion_and_needs() -> None:
+    ci = {
+        "stages": ["build", "test", "package"],
+        "build": {
+            "stage": "build",
+            "script": ["x"],
+            "parallel": {"matrix": [{"OS": ["linux", "mac"], "ARCH": "amd64"},
+                                    {"OS": "win", "ARCH": ["arm64"]}]},
+        },
+        "shard": {"stage": "test", "script": ["x"], "parallel": 3},
+        "pkg_linux": {
+            "stage": "package",
+            "script": ["x"],
+            "needs": [{"job": "build", "parallel": {"matrix": [{"OS": "linux"}]}}],
+        },
+        "pkg_all": {"stage": "package", "script": ["x"], "needs": ["build", "lint"]},
+    }
+    components, deps = gitlab.parse_pipeline(ci)
+    builds = ["build-linux-amd64", "build-mac-amd64", "build-win-arm64"]
+    shards = ["shard-1-3", "shard-2-3", "shard-3-3"]
+    assert all(b in components for b in builds + shards)
+    assert "build" not in components
+    for s in shards:
+        assert deps[s] == {**dict.fromkeys(builds, True), "stage-test": True}
+    assert deps["pkg_linux"] == {"build-linux-amd64": True, "stage-package": True}
+    assert deps["pkg_all"] == {**dict.fromkeys(builds, True), "lint": True,
+                               "stage-package": True}
+
+
+def test_closure_is_rendered_on_request() -> None:
+    ci = {
+        "stages": ["build", "test"],
+        "a": {"stage": "build", "script": ["x"]},
+        "b": {"stage": "test", "script": ["x"]},
+    }
+    components, deps = gitlab.parse_pipeline(ci)
+    depths = gitlab.compute_depths(components, deps)
+    assert "ancestors" not in gitlab.render_cue(components, deps, depths, "ci", "x", False)
+    closure = gitlab.compute_closure(components, deps)
+    assert closure[1]["a"] == {"b": True}
+
+    cue = gitlab.render_cue(components, deps, depths, "ci", "x", False, closure)
+    assert '\t\t"b": {"a": true, "stage-build": true, "stage-test": true}\n' in cue
+    pre = json.loads(gitlab.render_json(components, deps, depths, closure))["precomputed"]
+    assert pre["dependents"]["a"] == {"b": True}
@@ -0,0 +1,167 @@
+"""graphdiff must agree with #GraphDiff semantics, whatever the run size."""
+
+from __future__ import annotations
+
+import json
+import random
+
+from graphdiff import diff_files
+from lib.adapter import render_json
+
+
+def _snapshot(n: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    types = ["DNSServer", "Database", "WebServer", "LoadBalancer"]
+    resources = {}
+    for i in rng.sample(range(n + 20), n):
+        rid = f"r{i:03d}"
+        res = {"name": rid, "@type": {t: True for t in rng.sample(types, rng.randint(1, 2))}}
+        deps = [f"r{j:03d}" for j in rng.sample(range(n + 20), rng.randint(0, 3)) if j != i]
+        if deps:
+            res["depends_on"] = dict.fromkeys(deps, True)
+        res["ip"] = f"10.0.0.{rng.randint(1, 3)}"
+        resources[rid] = res
+    return resources
+
+
+def _dependents(resources: dict, rid: str) -> int:
+    seen, stack = set(), [rid]
+    while stack:
+        cur = stack.pop()
+        for other, r in resources.items():
+            if cur in r.get("depends_on", {}) and other not in seen and other != rid:
+                seen.add(other)
+                stack.append(other)
+    return len(seen)
+
+
+def _naive(before: dict, after: dict) -> dict:
+    added = {n: r["@type"] for n, r in after.items() if n not in before}
+    removed = {n: r["@type"] for n, r in before.items() if n not in after}
+    edges = lambda g: {(d, n) for n, r in g.items() for d in r.get("depends_on", {})}  # noqa: E731
+    meta = {}
+    for n in before.keys() & after.keys():
+        if before[n]["ip"] != after[n]["ip"]:
+            meta[n] = {"ip": {"before": before[n]["ip"], "after": after[n]["ip"]}}
+    touched = set(added) | set(removed) | set(meta)
+    touched |= {n for n in before.keys() & after.keys() if before[n]["@type"] != after[n]["@type"]}
+    for d, n in edges(before) ^ edges(after):
+        touched |= {d, n}
+    blast = {}
+    for n in touched:
+        b, a = _dependents(before, n), _dependents(after, n)
+        if a != b:
+            blast[n] = {"before": b, "after": a, "delta": a - b}
+    return {
+        "added": added, "removed": removed, "meta": meta, "blast": blast,
+        "added_edges": edges(after) - edges(before),
+        "removed_edges": edges(before) - edges(after),
+    }
+
+
+def test_matches_naive_diff(tmp_path):
+    before, after = _snapshot(80, 1), _snapshot(80, 2)
+    (tmp_path / "before.json").write_text(json.dumps(before))
+    (tmp_path / "after.json").write_text(json.dumps(after))
+    expected = _naive(before, after)
+
+    results = [diff_files(str(tmp_path / "before.json"), str(tmp_path / "after.json"), run_size=rs)
+               for rs in (7, 1000)]
+    assert results[0] == results[1]
+    got = results[0]
+    assert got["added_nodes"] == expected["added"]
+    assert got["removed_nodes"] == expected["removed"]
+    assert got["metadata_changes"] == expected["meta"]
+    assert {(e["source"], e["target"]) for e in got["added_edges"]} == expected["added_edges"]
+    assert {(e["source"], e["target"]) for e in got["removed_edges"]} == expected["removed_edges"]
+    assert got["blast_radius"] == expected["blast"]
+    assert got["summary"]["total_previous"] == 80
+    assert got["summary"]["has_changes"]
+
+
+def test_blast_counts_for_thousands_of_touched_nodes(tmp_path):
+    from graphdiff import _EdgeRows
+
+    before, after = _snapshot(3000, 3), _snapshot(3000, 4)
+    (tmp_path / "before.json").write_text(json.dumps(before))
+    (tmp_path / "after.json").write_text(json.dumps(after))
+    got = diff_files(str(tmp_path / "before.json"), str(tmp_path / "after.json"))
+    assert not got["summary"]["blast_radius_skipped"]
+
+    touched = {e["source"] for e in got["added_edges"] + got["removed_edges"]}
+    touched |= set(got["added_nodes"]) | set(got["removed_nodes"])
+    touched |= {m["resourceName"] for m in got["modified"]}
+    assert len(touched) > 2000
+
+    def bfs_counts(snapshot: dict) -> dict:
+        rows = _EdgeRows()
+        for rid in sorted(snapshot):
+            rows.add(rid, snapshot[rid].get("depends_on", {}))
+        graph = rows.graph()
+        return {rid: sum(1 for _ in graph.bfs([graph.index[rid]], reverse=True)) - 1
+                for rid in touched if rid in graph.index}
+
+    b, a = bfs_counts(before), bfs_counts(after)
+    expected = {}
+    for rid in touched:
+        nb, na = b.get(rid, 0), a.get(rid, 0)
+        if nb != na:
+            expected[rid] = {"before": nb, "after": na, "delta": na - nb}
+    assert got["blast_radius"] == expected
+
+
+def test_adapter_output_and_type_changes(tmp_path):
+    components = {
+        "dns": {"name": "dns", "@type": {"DNSServer": True}},
+        "web": {"name": "web", "@type": {"WebServer": True}},
+    }
+    (tmp_path / "a.json").write_text(render_json(components, {"web": {"dns": True}}, {"dns": 0, "web": 1}))
+    components["dns"] = {"name": "dns", "@type": {"DNSServer": True, "CriticalInfra": True}}
+    (tmp_path / "b.json").write_text(json.dumps(components))
+
+    got = diff_files(str(tmp_path / "a.json"), str(tmp_path / "b.json"))
+    assert got["type_changes"] == {"dns": {"added_types": {"CriticalInfra": True}, "removed_types": {}}}
+    assert got["removed_edges"] == [{"source": "dns", "target": "web"}]
+    assert got["blast_radius"] == {"dns": {"before": 1, "after": 0, "delta": -1}}
+    assert [m["resourceName"] for m in got["modified"]] == ["dns", "web"]
+
+    same = diff_files(str(tmp_path / "b.json"), str(tmp_path / "b.json"))
+    assert not same["summary"]["has_changes"]
+
+
+def test_resource_named_resources_is_not_unwrapped(tmp_path):
+    snapshot = {
+        "resources": {"@type": {"Database": True}, "depends_on": {"dns": True}, "ip": "10.0.0.1"},
+        "dns": {"name": "dns", "@type": {"DNSServer": True}, "ip": "10.0.0.2"},
+    }
+    (tmp_path / "a.json").write_text(json.dumps(snapshot))
+    (tmp_path / "b.json").write_text(render_json(snapshot, {"resources": {"dns": True}},
+                                                 {"dns": 0, "resources": 1}))
+    got = diff_files(str(tmp_path / "a.json"), str(tmp_path / "b.json"))
+    assert not got["summary"]["has_changes"]
+    assert got["summary"]["total_previous"] == 2
+
+    # Fields first, in any order: still a resource, not the wrapper.
+    snapshot["resources"] = {"name": "resources", **snapshot["resources"]}
+    (tmp_path / "a.json").write_text(json.dumps(snapshot))
+    got = diff_files(str(tmp_path / "a.json"), str(tmp_path / "b.json"))
+    assert got["added_nodes"] == {} and got["removed_nodes"] == {}
+
+
+def test_iter_map_items_across_chunk_boundaries():
+    import io
+
+    from lib.jsonstream import iter_map_items
+
+    doc = {"resources": {"a": {"n": 12345, "f": -1.5e3, "s": "x\\u00e9y", "t": True, "z": None}},
+           "precomputed": {"depth": {"a": 0}}}
+    text = json.dumps(doc)
+    for size in (1, 2, 3, 7):
+        assert dict(iter_map_items(io.StringIO(text), chunk_size=size)) == doc
+        assert dict(iter_map_items(io.StringIO(text), "resources", size)) == doc["resources"]
+    assert list(iter_map_items(io.StringIO(" { } "))) == []
+    empty = '{"resources": {}, "precomputed": {"depth": {}}}'
+    assert list(iter_map_items(io.StringIO(empty), "resources")) == []
+    named = {"resources": {"@type": {"X": True}, "n": 1}, "b": {"n": 2}}
+    for size in (1, 5, 64):
+        assert dict(iter_map_items(io.StringIO(json.dumps(named)), "resources", size)) == named
@@ -0,0 +1,114 @@
+"""The event parser must accept exactly what json.load accepts."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+
+import pytest
+
+from cyclonedx2graph import extract_components, extract_dependencies, stream_bom
+from lib.jsonstream import build_value, iter_events
+
+
+def _load(text: str, chunk_size: int = 7) -> object:
+    events = iter_events(io.StringIO(text), chunk_size)
+    ev, val = next(events)
+    value = build_value(events, ev, val)
+    for _ in events:
+        pass
+    return value
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": [1, 2.5, -3e2, "x\\u00e9\\n", true, false, null], "b": {}, "c": []}',
+    '[[], [{}], {"k": [{"k": {"k": 1}}]}]',
+    '  "top"  ',
+    "0",
+])
+def test_events_match_json_load(text) -> None:
+    for chunk_size in (1, 3, 7, 1 << 16):
+        assert _load(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", [
+    "[1 2]", '{"a" 1}', "[1,]", '{"a": 1,}', '{"a": 1 "b": 2}', "[,1]", "{,}",
+    '{"a": 1}}', "[1] [2]", '{1: 2}', '[1:2]', '{"a"}', "",
+    '{"a": [1, 2', '[{"a": 1}, {"b"', '{"a": 1, ', "[",
+])
+def test_malformed_and_truncated_input_raise(text) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        _load(text)
+
+
+def _bom(n: int) -> dict:
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.5",
+        "metadata": {"component": {"bom-ref": "app", "name": "app", "type": "application"}},
+        "components": [
+            {"bom-ref": f"pkg:npm/lib{i}@1.0", "name": f"lib{i}", "type": "library",
+             "version": "1.0", "licenses": [{"license": {"id": "MIT"}}]}
+            for i in range(n)
+        ],
+        "dependencies": [
+            {"ref": "app", "dependsOn": [f"pkg:npm/lib{i}@1.0" for i in range(0, n, 3)]},
+            *({"ref": f"pkg:npm/lib{i}@1.0", "dependsOn": [f"pkg:npm/lib{i - 1}@1.0"]}
+              for i in range(1, n)),
+        ],
+    }
+
+
+def test_stream_bom_matches_load(tmp_path) -> None:
+    bom = _bom(50)
+    path = tmp_path / "bom.json"
+    path.write_text(json.dumps(bom, indent=1))
+    components, ref_to_id = extract_components(bom)
+    deps = extract_dependencies(bom, ref_to_id)
+    s_components, s_ref_to_id, s_deps = stream_bom(str(path))
+    assert s_components == components
+    assert s_ref_to_id == ref_to_id
+    assert s_deps == deps
+
+
+def test_stream_bom_rejects_truncated_file(tmp_path) -> None:
+    text = json.dumps(_bom(50), indent=1)
+    path = tmp_path / "bom.json"
+    # Cut at an element boundary (before component 25) and mid-value.
+    cuts = [text.index('{\n   "bom-ref": "pkg:npm/lib25@1.0"'), len(text) // 2, len(text) - 2]
+    for cut in cuts:
+        path.write_text(text[:cut])
+        with pytest.raises(json.JSONDecodeError):
+            stream_bom(str(path))
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(text[:cut])
+
+
+def test_stream_bom_rejects_trailing_data(tmp_path) -> None:
+    path = tmp_path / "bom.json"
+    path.write_text(json.dumps(_bom(3)) + ' {"x": 1}')
+    with pytest.raises(json.JSONDecodeError):
+        stream_bom(str(path))
+
+
+def test_cyclonedx_closure_flag(tmp_path, monkeypatch, capsys) -> None:
+    import cyclonedx2graph
+
+    path = tmp_path / "bom.json"
+    path.write_text(json.dumps(_bom(6)))
+
+    def run(*flags: str) -> str:
+        monkeypatch.setattr(sys, "argv", ["cyclonedx2graph.py", str(path), *flags])
+        cyclonedx2graph.main()
+        return capsys.readouterr().out
+
+    assert "ancestors" not in run() and "ancestors" not in run("--json")
+    pre = json.loads(run("--json", "--closure", "--stream"))["precomputed"]
+    assert pre["ancestors"]["pkg-npm-lib2-1.0"] == {"pkg-npm-lib0-1.0": True,
+                                                   "pkg-npm-lib1-1.0": True}
+    assert pre["dependents"]["pkg-npm-lib4-1.0"] == {"pkg-npm-lib5-1.0": True}
+
+    cue = run("--closure")
+    assert '\t\t"pkg-npm-lib5-1.0": {}\n\t}\n}\n' in cue  # dependents block closes _precomputed
+    assert '\t\t"app": {"pkg-npm-lib0-1.0": true, "pkg-npm-lib1-1.0": true' in cue
@@ -0,0 +1,68 @@
+"""N-Triples must match patterns/ntriples.cue #NTriplesExport line for line."""
+
+from __future__ import annotations
+
+import io
+
+from lib.jsonstream import iter_map_items
+from lib.rdf import graph_resources, iter_ntriples, iter_rendered, iter_turtle
+
+BASE = "https://infra.example.com/resources/"
+V = "https://quicue.ca/vocab#"
+T = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+RESOURCES = {
+    "router": {"name": "router", "@type": {"Router": True}, "ip": "10.0.0.1"},
+    "dns": {"name": "dns", "@type": {"DNSServer": True, "CriticalInfra": True},
+            "depends_on": {"router": True}, "host": "pve-1", "description": "Primary DNS",
+            "ssh_user": "root"},
+    "web": {"name": "web", "@type": {"WebServer": True},
+            "depends_on": {"dns": True, "router": True}, "ip": "10.0.0.3"},
+}
+
+# Transcribed from #NTriplesExport for RESOURCES with BaseIRI = BASE.
+EXPECTED = f"""<{BASE}router> <{V}name> "router" .
+<{BASE}router> <{T}> <{V}Router> .
+<{BASE}router> <{V}ipAddress> "10.0.0.1" .
+<{BASE}dns> <{V}name> "dns" .
+<{BASE}dns> <{T}> <{V}DNSServer> .
+<{BASE}dns> <{T}> <{V}CriticalInfra> .
+<{BASE}dns> <{V}dependsOn> <{BASE}router> .
+<{BASE}dns> <{V}description> "Primary DNS" .
+<{BASE}dns> <{V}host> "pve-1" .
+<{BASE}web> <{V}name> "web" .
+<{BASE}web> <{T}> <{V}WebServer> .
+<{BASE}web> <{V}dependsOn> <{BASE}dns> .
+<{BASE}web> <{V}dependsOn> <{BASE}router> .
+<{BASE}web> <{V}ipAddress> "10.0.0.3" .
+"""
+
+
+def test_matches_ntriples_export():
+    assert "".join(iter_ntriples(RESOURCES.items(), BASE)) == EXPECTED
+
+
+def test_adapter_graph_and_chunking_agree():
+    components = {rid: {k: v for k, v in r.items() if k != "depends_on"}
+                  for rid, r in RESOURCES.items()}
+    deps = {rid: r["depends_on"] for rid, r in RESOURCES.items() if "depends_on" in r}
+    assert "".join(iter_ntriples(graph_resources(components, deps), BASE)) == EXPECTED
+    for jobs in (1, 2):
+        assert "".join(iter_rendered(RESOURCES.items(), BASE, jobs=jobs, chunk_size=1)) == EXPECTED
+
+
+def test_streamed_json_and_escaping():
+    import json
+
+    doc = json.dumps({"resources": {"x": {"name": "x", "@type": {"VM": True},
+                                          "description": 'say "hi"\n'}}, "precomputed": {}})
+    lines = list(iter_ntriples(iter_map_items(io.StringIO(doc), unwrap="resources")))
+    assert lines[-1] == f'<https://quicue.ca/resources/x> <{V}description> "say \\"hi\\"\\n" .\n'
+
+
+def test_turtle_has_the_same_triples():
+    ttl = "".join(iter_turtle(RESOURCES.items(), BASE))
+    assert ttl.startswith(f"@prefix quicue: <{V}> .")
+    assert f"<{BASE}dns> a quicue:DNSServer, quicue:CriticalInfra ;" in ttl
+    assert f"quicue:dependsOn <{BASE}dns>, <{BASE}router> ;" in ttl
+    assert ttl.count(" .\n") == 1 + len(RESOURCES)
@@ -0,0 +1,40 @@
+"""Tests for incremental output-directory writes (lib/syncdir.py)."""
+
+from __future__ import annotations
+
+import os
+
+from lib.syncdir import load_manifest, prune, read_bytes, write_atomic
+
+
+def test_write_atomic_replaces_and_sets_mode(tmp_path) -> None:
+    path = tmp_path / "a" / "b.txt"
+    write_atomic(str(path), b"one")
+    write_atomic(str(path), b"two", 0o755)
+    assert read_bytes(str(path)) == b"two"
+    assert os.stat(path).st_mode & 0o777 == 0o755
+    assert [p.name for p in path.parent.iterdir()] == ["b.txt"]
+    assert read_bytes(str(tmp_path / "missing")) is None
+
+
+def test_load_manifest(tmp_path) -> None:
+    path = tmp_path / "manifest.json"
+    assert load_manifest(str(path)) is None
+    path.write_text("{not json")
+    assert load_manifest(str(path)) is None
+    path.write_text('{"a": 1}')
+    assert load_manifest(str(path)) == {"a": 1}
+
+
+def test_prune_removes_siblings_and_empty_dirs_below_root(tmp_path) -> None:
+    for rel in ("wiki/x/old.md", "wiki/x/old.md.gz", "wiki/keep.md", "wiki/y/old.md"):
+        write_atomic(str(tmp_path / rel), b"")
+    stale = ["wiki/x/old.md", "wiki/y/old.md", "wiki/gone.md"]
+    assert prune(str(tmp_path), stale, suffixes=(".gz",)) == 2
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*")) == \
+        ["wiki", "wiki/keep.md"]
+
+    write_atomic(str(tmp_path / "wiki/z/old.md"), b"")
+    (tmp_path / "wiki/keep.md").unlink()
+    prune(str(tmp_path), ["wiki/z/old.md"], root=str(tmp_path / "wiki"))
+    assert (tmp_path / "wiki").is_dir() and not any((tmp_path / "wiki").iterdir())
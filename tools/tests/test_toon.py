@@ -0,0 +1,96 @@
+"""TOON codec must reproduce #TOONExport on examples/toon-export and round-trip."""
+
+from __future__ import annotations
+
+import pytest
+
+from lib.toon import decode, encode
+
+# examples/toon-export/toon-export.cue _resources (minus the derived @id).
+RESOURCES = {
+    "dns-primary": {"@type": {"DNSServer": True, "LXCContainer": True},
+                    "ip": "198.51.100.10", "host": "pve-node-1", "container_id": 100},
+    "dns-secondary": {"@type": {"DNSServer": True, "LXCContainer": True},
+                      "ip": "198.51.100.11", "host": "pve-node-2", "container_id": 101,
+                      "depends_on": {"dns-primary": True}},
+    "web-server": {"@type": {"WebFrontend": True, "LXCContainer": True},
+                   "ip": "198.51.100.20", "host": "pve-node-2", "container_id": 102,
+                   "depends_on": {"dns-primary": True}},
+    "proxy": {"@type": {"ReverseProxy": True, "DockerContainer": True},
+              "ip": "198.51.100.30", "host": "docker-host",
+              "depends_on": {"web-server": True, "dns-primary": True}},
+    "db-primary": {"@type": {"Database": True, "VM": True, "CriticalInfra": True},
+                   "ip": "198.51.100.50", "host": "pve-node-1", "vm_id": 200,
+                   "depends_on": {"dns-primary": True}},
+    "db-replica": {"@type": {"Database": True, "VM": True},
+                   "ip": "198.51.100.51", "host": "pve-node-3", "vm_id": 201,
+                   "depends_on": {"db-primary": True, "dns-primary": True}},
+    "monitoring": {"@type": {"MonitoringServer": True},
+                   "ip": "198.51.100.100", "host": "obs-host",
+                   "depends_on": {"dns-primary": True}},
+}
+for _name, _r in RESOURCES.items():
+    _r["name"] = _name
+
+FULL_FIELDS = ["name", "types", "ip", "host", "container_id", "vm_id"]
+
+# The example's `toon` value.
+TOON = """\
+resources[2]{name,types,ip,host,vm_id}:
+  db-primary,Database|VM|CriticalInfra,198.51.100.50,pve-node-1,200
+  db-replica,Database|VM,198.51.100.51,pve-node-3,201
+
+resources[2]{name,types,ip,host}:
+  monitoring,MonitoringServer,198.51.100.100,obs-host
+  proxy,ReverseProxy|DockerContainer,198.51.100.30,docker-host
+
+resources[3]{name,types,ip,host,container_id}:
+  dns-primary,DNSServer|LXCContainer,198.51.100.10,pve-node-1,100
+  dns-secondary,DNSServer|LXCContainer,198.51.100.11,pve-node-2,101
+  web-server,WebFrontend|LXCContainer,198.51.100.20,pve-node-2,102
+
+dependencies[8]{from,to}:
+  db-primary,dns-primary
+  db-replica,db-primary
+  db-replica,dns-primary
+  dns-secondary,dns-primary
+  monitoring,dns-primary
+  proxy,dns-primary
+  proxy,web-server
+  web-server,dns-primary"""
+
+# The example's `toon_minimal` value.
+TOON_MINIMAL = """\
+resources[7]{name,ip}:
+  db-primary,198.51.100.50
+  db-replica,198.51.100.51
+  dns-primary,198.51.100.10
+  dns-secondary,198.51.100.11
+  monitoring,198.51.100.100
+  proxy,198.51.100.30
+  web-server,198.51.100.20"""
+
+
+def test_encode_matches_toon_export():
+    assert encode(RESOURCES.items(), fields=FULL_FIELDS) == TOON
+    assert encode(RESOURCES.items(), fields=["name", "ip"], include_deps=False) == TOON_MINIMAL
+
+
+def test_round_trip():
+    decoded = decode(TOON)
+    assert decoded == RESOURCES
+    assert encode(decoded.items(), fields=FULL_FIELDS) == TOON
+    assert decode(TOON_MINIMAL)["proxy"] == {"name": "proxy", "ip": "198.51.100.30"}
+
+
+def test_custom_separators_round_trip():
+    text = encode(RESOURCES.items(), fields=FULL_FIELDS, field_separator="\t", type_separator=";")
+    assert "  db-replica\tDatabase;VM\t" in text
+    assert decode(text, field_separator="\t", type_separator=";") == RESOURCES
+
+
+def test_decode_rejects_ambiguous_rows():
+    with pytest.raises(ValueError, match="cells"):
+        decode("resources[1]{name,ip}:\n  a,1.2.3.4,extra")
+    with pytest.raises(ValueError, match="declares 2 rows"):
+        decode("resources[2]{name,ip}:\n  a,1.2.3.4")
@@ -0,0 +1,130 @@
+"""Tests for precomputed #InfraGraph topology (toposort.py)."""
+
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+import toposort
+from toposort import check, parse_precomputed, precompute, render_cue, render_json
+
+# dns <- db <- app <- lb, plus dns <- cache <- app; "edge" stands alone.
+RESOURCES = {
+    "lb": {"name": "lb", "depends_on": {"app": True}},
+    "app": {"name": "app", "depends_on": {"db": True, "cache": True}},
+    "dns": {"name": "dns", "@type": {"DNSServer": True}},
+    "db": {"name": "db", "depends_on": {"dns": True}},
+    "edge": {"name": "edge"},
+    "cache": {"name": "cache", "depends_on": {"dns": True}},
+}
+
+
+def _write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_precompute_layers_follow_depth_then_input_order() -> None:
+    pre = precompute(RESOURCES)
+    assert list(pre["depth"]) == ["dns", "edge", "db", "cache", "app", "lb"]
+    assert pre["layers"] == {
+        "layer_0": {"dns": True, "edge": True},
+        "layer_1": {"db": True, "cache": True},
+        "layer_2": {"app": True},
+        "layer_3": {"lb": True},
+    }
+    assert list(pre["ancestors"]["lb"]) == ["app", "cache", "db", "dns"]
+    assert list(pre["dependents"]["dns"]) == ["app", "cache", "db", "lb"]
+    assert pre["ancestors"]["edge"] == {} and pre["dependents"]["edge"] == {}
+
+
+def test_output_is_byte_stable() -> None:
+    first = render_cue(precompute(RESOURCES), "main", "cmd")
+    again = render_cue(precompute(json.loads(json.dumps(RESOURCES))), "main", "cmd")
+    assert first == again
+    assert render_json(precompute(RESOURCES)) == render_json(precompute(RESOURCES))
+
+
+def test_render_cue_round_trips_through_parse(tmp_path) -> None:
+    pre = precompute(RESOURCES)
+    path = _write(tmp_path, "precomputed.cue", render_cue(pre, "datacenter", "cmd"))
+    parsed = parse_precomputed(path)
+    assert parsed == {k: pre[k] for k in ("depth", "ancestors", "dependents")}
+    assert check(pre, path) == []
+
+    path = _write(tmp_path, "precomputed.json", render_json(pre))
+    assert check(pre, path) == []
+
+
+def test_check_reports_stale_missing_and_changed_entries(tmp_path) -> None:
+    old = dict(RESOURCES, gone={"name": "gone"})
+    del old["edge"]
+    old["lb"] = {"name": "lb"}
+    path = _write(tmp_path, "precomputed.cue", render_cue(precompute(old), "main", "cmd"))
+
+    problems = check(precompute(RESOURCES), path)
+    assert "depth: missing edge" in problems
+    assert "depth: stale entry gone" in problems
+    assert "depth: lb differs" in problems
+    assert "ancestors: lb differs" in problems
+    assert "dependents: app differs" in problems
+
+
+def test_check_depth_only_file(tmp_path) -> None:
+    pre = precompute(RESOURCES)
+    depth = "".join(f'\t\t"{rid}": {d}\n' for rid, d in pre["depth"].items())
+    path = _write(tmp_path, "depth.cue", f"package main\n\n_precomputed: {{\n\tdepth: {{\n{depth}\t}}\n}}\n")
+    assert set(parse_precomputed(path)) == {"depth"}
+    assert check(pre, path) == []
+
+    pre["ancestors"]["lb"] = {}
+    assert check(pre, path) == []
+    pre["depth"]["lb"] = 9
+    assert check(pre, path) == ["depth: lb differs"]
+
+    empty = _write(tmp_path, "empty.cue", "package main\n")
+    assert check(pre, empty) == [f"no _precomputed depth block found in {empty}"]
+
+
+def _main(monkeypatch, *argv: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["toposort.py", *argv])
+    try:
+        toposort.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def test_check_flag_exit_codes(tmp_path, monkeypatch, capsys) -> None:
+    resources = _write(tmp_path, "resources.json", json.dumps(RESOURCES))
+    out = str(tmp_path / "precomputed.cue")
+    assert _main(monkeypatch, resources, "-o", out) == 0
+    assert _main(monkeypatch, resources, "--check", out) == 0
+    assert "is current (6 resources)" in capsys.readouterr().err
+
+    stale = dict(RESOURCES, extra={"name": "extra", "depends_on": {"lb": True}})
+    stale_input = _write(tmp_path, "stale.json", json.dumps(stale))
+    assert _main(monkeypatch, stale_input, "--check", out) == 1
+    err = capsys.readouterr().err
+    assert "is stale" in err and "depth: missing extra" in err
+
+    # Adapter --json output is accepted as input too.
+    adapter = _write(tmp_path, "adapter.json",
+                     json.dumps({"resources": RESOURCES, "precomputed": {}}))
+    assert _main(monkeypatch, adapter, "--check", out) == 0
+
+    missing_depth = _write(tmp_path, "other.cue", "package main\n")
+    assert _main(monkeypatch, resources, "--check", missing_depth) == 1
+
+
+@pytest.mark.parametrize("fmt", ["--cue", "--json"])
+def test_regenerating_unchanged_graph_is_a_noop(tmp_path, monkeypatch, fmt) -> None:
+    resources = _write(tmp_path, "resources.json", json.dumps(RESOURCES))
+    out = tmp_path / ("out.json" if fmt == "--json" else "out.cue")
+    assert _main(monkeypatch, resources, fmt, "-o", str(out)) == 0
+    first = out.read_bytes()
+    assert _main(monkeypatch, resources, fmt, "-o", str(out)) == 0
+    assert out.read_bytes() == first
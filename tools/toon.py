@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Encode a _resources map as TOON, or decode TOON back to JSON.
+
+Produces the same text as patterns.#TOONExport (see lib/toon.py)
+without evaluating the CUE comprehensions, streaming the input one
+resource at a time.
+
+Usage:
+    # Pipe from cue export
+    cue export ./examples/toon-export/ -e _resources | python3 tools/toon.py -
+
+    # Choose columns, drop the dependency table
+    python3 tools/toon.py resources.json --fields name,types,ip --no-deps -o inventory.toon
+
+    # Back to a _resources JSON map
+    python3 tools/toon.py --decode inventory.toon -o resources.json
+
+Zero dependencies — stdlib Python only (cue is only needed for .cue input).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from lib.toon import DEFAULT_FIELDS, TOONEncoder, decode
+from toposort import iter_resources
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert #InfraGraph resources to and from TOON",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input",
+                        help="_resources JSON file (TOON with --decode), '-' for stdin, "
+                             "or a CUE package/file")
+    parser.add_argument("-e", "--expr", default="_resources",
+                        help="Expression to export for CUE input (default: _resources)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-d", "--decode", action="store_true", help="TOON in, JSON out")
+    parser.add_argument("--fields", default=",".join(DEFAULT_FIELDS),
+                        help=f"Columns, comma-separated (default: {','.join(DEFAULT_FIELDS)})")
+    parser.add_argument("--no-deps", action="store_true", help="Omit the dependencies table")
+    parser.add_argument("--field-separator", default=",", help="Cell separator (default: ,)")
+    parser.add_argument("--type-separator", default="|", help="@type separator (default: |)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.decode:
+            text = sys.stdin.read() if args.input == "-" else Path(args.input).read_text()
+            resources = decode(text, args.field_separator, args.type_separator)
+            output = json.dumps(resources, indent=2) + "\n"
+        else:
+            enc = TOONEncoder(args.fields.split(","), not args.no_deps,
+                              args.field_separator, args.type_separator)
+            for rid, res in iter_resources(args.input, args.expr):
+                enc.add(rid, res)
+            output = enc.render() + "\n"
+    except (OSError, ValueError) as e:  # JSONDecodeError is a ValueError
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Precompute #InfraGraph topology for hand-written CUE graphs.
+
+Reads an exported _resources map and writes the _precomputed block
+(depth, transitive ancestors, transitive dependents) that
+patterns.#InfraGraph accepts, plus _layers (depth → members) for
+consumers that want topology layers without evaluating the graph.
+
+Usage:
+    # Pipe from cue export
+    cue export ./examples/datacenter/ -e _resources | python3 tools/toposort.py - --cue
+
+    # Read a JSON file (a _resources map, or adapter --json output)
+    python3 tools/toposort.py resources.json -o precomputed.cue
+
+    # Export a CUE package directly (needs cue on PATH)
+    python3 tools/toposort.py ./examples/datacenter/ -o examples/datacenter/precomputed.cue
+
+    # JSON output
+    python3 tools/toposort.py resources.json --json
+
+    # Verify a checked-in precomputed file is current (exit 1 if stale)
+    cue export ./examples/datacenter/ -e _resources | \\
+        python3 tools/toposort.py - --check examples/datacenter/precomputed.cue
+
+Zero dependencies — stdlib Python only (cue is only needed for .cue input).
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from lib.adapter import compute_closure, compute_depths
+from lib.jsonstream import iter_map_items
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+
+def load_resources(source: str, expr: str = "_resources") -> dict:
+    """Load a _resources map from stdin ("-"), a JSON file, or a CUE package."""
+    if source == "-":
+        data = json.load(sys.stdin)
+    elif source.endswith(".cue") or Path(source).is_dir():
+        proc = subprocess.run(
+            ["cue", "export", source, "-e", expr, "--out", "json"],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            sys.exit(proc.returncode)
+        data = json.loads(proc.stdout)
+    else:
+        with open(source) as f:
+            data = json.load(f)
+
+    # Accept adapter --json output ({"resources": ..., "precomputed": ...})
+    if isinstance(data, dict) and isinstance(data.get("resources"), dict) \
+            and "precomputed" in data:
+        data = data["resources"]
+    if not isinstance(data, dict):
+        print("ERROR: expected a JSON object of resources", file=sys.stderr)
+        sys.exit(2)
+    return data
+
+
+def iter_resources(source: str, expr: str = "_resources") -> Iterator[tuple[str, dict]]:
+    """(id, resource) pairs like load_resources, streaming JSON input.
+
+    Stdin and JSON files are read one resource at a time; CUE input goes
+    through cue export and is loaded whole.
+    """
+    if source != "-" and (source.endswith(".cue") or Path(source).is_dir()):
+        for rid, res in load_resources(source, expr).items():
+            if isinstance(res, dict):
+                yield rid, res
+        return
+    f = sys.stdin if source == "-" else open(source)
+    try:
+        for rid, res in iter_map_items(f, unwrap="resources"):
+            if isinstance(res, dict):
+                yield rid, res
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def graph_from_resources(resources: dict) -> tuple[dict, dict]:
+    """Split a _resources map into adapter-style (components, deps)."""
+    components = {rid: r for rid, r in resources.items() if isinstance(r, dict)}
+    deps = {
+        rid: dict.fromkeys(r.get("depends_on") or {}, True)
+        for rid, r in components.items()
+    }
+    return components, deps
+
+
+# ---------------------------------------------------------------------------
+# Topology
+# ---------------------------------------------------------------------------
+
+def precompute(resources: dict) -> dict:
+    """Compute depth, ancestors, dependents and layers.
+
+    Nodes are ordered by depth, then input order (cue export preserves
+    field order), so regenerating an unchanged graph is byte-stable.
+    """
+    components, deps = graph_from_resources(resources)
+    depths = compute_depths(components, deps)
+    ancestors, dependents = compute_closure(components, deps)
+
+    order = sorted(components, key=lambda k: depths[k])
+    layers: dict[str, dict] = {}
+    for rid in order:
+        layers.setdefault(f"layer_{depths[rid]}", {})[rid] = True
+
+    return {
+        "depth": {rid: depths[rid] for rid in order},
+        "ancestors": {rid: dict.fromkeys(sorted(ancestors[rid]), True) for rid in order},
+        "dependents": {rid: dict.fromkeys(sorted(dependents[rid]), True) for rid in order},
+        "layers": layers,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _cue_set(members: dict) -> str:
+    return "{" + ", ".join(f'"{m}": true' for m in members) + "}"
+
+
+def render_cue(pre: dict, package: str, command: str) -> str:
+    """Render _precomputed (schema-shaped) and _layers as a CUE file."""
+    lines = [
+        f"// Generated by: {command}",
+        "// DO NOT EDIT — regenerate when _resources changes",
+        f"package {package}",
+        "",
+        "_precomputed: {",
+        "\tdepth: {",
+    ]
+    for rid, d in pre["depth"].items():
+        lines.append(f'\t\t"{rid}": {d}')
+    lines.append("\t}")
+    for section in ("ancestors", "dependents"):
+        lines.append(f"\t{section}: {{")
+        for rid, members in pre[section].items():
+            lines.append(f'\t\t"{rid}": {_cue_set(members)}')
+        lines.append("\t}")
+    lines.append("}")
+    lines.append("")
+    # Kept outside _precomputed: #InfraGraph.Precomputed is a closed schema.
+    lines.append("_layers: {")
+    for layer, members in pre["layers"].items():
+        lines.append(f'\t"{layer}": {_cue_set(members)}')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def render_json(pre: dict) -> str:
+    return json.dumps(pre, indent=2) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Check mode
+# ---------------------------------------------------------------------------
+
+_SECTION_RE = re.compile(r"^\t(depth|ancestors|dependents): \{$")
+_ENTRY_RE = re.compile(r'^\t\t"([^"]+)": (.+)$')
+_MEMBER_RE = re.compile(r'"([^"]+)": true')
+
+
+def parse_precomputed(path: str) -> dict:
+    """Read depth/ancestors/dependents back from a generated file.
+
+    Accepts JSON (toposort --json or adapter --json) or the CUE layout
+    this tool and the adapter toolkit emit.
+    """
+    text = Path(path).read_text()
+    if path.endswith(".json"):
+        data = json.loads(text)
+        data = data.get("precomputed", data)
+        return {k: data[k] for k in ("depth", "ancestors", "dependents") if k in data}
+
+    result: dict[str, dict] = {}
+    section = None
+    for line in text.splitlines():
+        m = _SECTION_RE.match(line)
+        if m:
+            section = m.group(1)
+            result.setdefault(section, {})
+            continue
+        if line.startswith("\t}") or not line.startswith("\t\t"):
+            section = None
+            continue
+        m = _ENTRY_RE.match(line) if section else None
+        if not m:
+            continue
+        rid, value = m.groups()
+        if section == "depth":
+            result["depth"][rid] = int(value)
+        else:
+            result[section][rid] = dict.fromkeys(_MEMBER_RE.findall(value), True)
+    return result
+
+
+def check(pre: dict, path: str) -> list[str]:
+    """Return human-readable differences between pre and the file at path.
+
+    Only sections present in the file are compared, so a depth-only
+    file is checked for depth alone.
+    """
+    existing = parse_precomputed(path)
+    if "depth" not in existing:
+        return [f"no _precomputed depth block found in {path}"]
+    problems = []
+    for section in ("depth", "ancestors", "dependents"):
+        if section not in existing:
+            continue
+        want, have = pre[section], existing[section]
+        for rid in sorted(set(want) - set(have)):
+            problems.append(f"{section}: missing {rid}")
+        for rid in sorted(set(have) - set(want)):
+            problems.append(f"{section}: stale entry {rid}")
+        for rid in sorted(set(want) & set(have)):
+            if want[rid] != have[rid]:
+                problems.append(f"{section}: {rid} differs")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute #InfraGraph depth/ancestors/dependents from _resources",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input",
+                        help="_resources JSON file, '-' for stdin, or a CUE package/file")
+    parser.add_argument("-e", "--expr", default="_resources",
+                        help="Expression to export for CUE input (default: _resources)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-p", "--package", default="main",
+                        help="CUE package name (default: main)")
+    fmt = parser.add_mutually_exclusive_group()
+    fmt.add_argument("--cue", action="store_true", help="CUE output (default)")
+    fmt.add_argument("--json", action="store_true", help="JSON output")
+    parser.add_argument("--check", metavar="FILE",
+                        help="Verify FILE is current instead of writing output")
+    parser.add_argument("--stats", action="store_true", help="Print stats to stderr")
+
+    args = parser.parse_args()
+
+    resources = load_resources(args.input, args.expr)
+    pre = precompute(resources)
+
+    if args.stats:
+        depths = pre["depth"]
+        n_edges = sum(len(r.get("depends_on") or {}) for r in resources.values()
+                      if isinstance(r, dict))
+        print(f"Resources: {len(depths)}", file=sys.stderr)
+        print(f"Edges: {n_edges}", file=sys.stderr)
+        print(f"Layers: {len(pre['layers'])}", file=sys.stderr)
+
+    if args.check:
+        problems = check(pre, args.check)
+        if problems:
+            print(f"{args.check} is stale ({len(problems)} differences):", file=sys.stderr)
+            for p in problems[:50]:
+                print(f"  {p}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{args.check} is current ({len(pre['depth'])} resources)", file=sys.stderr)
+        return
+
+    if args.json:
+        output = render_json(pre)
+    else:
+        if args.input == "-":
+            command = "cue export -e _resources | python3 tools/toposort.py - --cue"
+        else:
+            command = f"python3 tools/toposort.py {args.input} --cue"
+        output = render_cue(pre, args.package, command)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+        print(f"Wrote {args.output} ({len(pre['depth'])} resources)", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
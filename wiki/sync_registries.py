@@ -8,40 +8,43 @@ Usage:
     python3 wiki/sync_registries.py              # report drift
     python3 wiki/sync_registries.py --diff       # show per-entry details
     python3 wiki/sync_registries.py --generate   # emit replacement CUE blocks
+    python3 wiki/sync_registries.py --no-cache   # re-evaluate every package
+
+Exports run concurrently and are cached by the content of each package's
+.cue files (see tools/lib/cuexport.py), so an unchanged tree needs no
+CUE evaluation at all.
 """
 
 import json
 import os
-import subprocess
 import sys
 
-
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+from lib.cuexport import Target, default_cache, export_all  # noqa: E402
+
+WIKI_DIR = os.path.join(REPO_ROOT, "wiki")
+KB_DIR = os.path.join(REPO_ROOT, ".kb")
 
-def cue_export(cwd, expr=None):
-    """Run cue export in a directory, optionally with -e expr."""
-    cmd = ["cue", "export", ".", "--out", "json"]
-    if expr:
-        cmd.extend(["-e", expr])
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"  ERROR: cue export in {cwd} failed: {result.stderr.strip()}", file=sys.stderr)
-        return None
-    return json.loads(result.stdout)
+# .kb/ packages holding the registries: root (modules, downstream, sites)
+# and one package each for decisions, patterns and insights.
+KB_TARGETS = {
+    "root": Target(KB_DIR),
+    "decisions": Target(os.path.join(KB_DIR, "decisions")),
+    "patterns": Target(os.path.join(KB_DIR, "patterns")),
+    "insights": Target(os.path.join(KB_DIR, "insights")),
+}
 
 
-def get_docs_stats():
-    """Export docs.stats from wiki/."""
-    wiki_dir = os.path.join(REPO_ROOT, "wiki")
-    return cue_export(wiki_dir, "docs.stats")
+def run_exports(targets):
+    """Export {name: Target} concurrently through the shared cue export cache."""
+    cache = None if "--no-cache" in sys.argv else default_cache()
+    return dict(zip(targets, export_all(targets.values(), cache)))
 
 
-def get_docs_keys():
-    """Export docs registry keys from wiki/ for per-entry comparison."""
-    wiki_dir = os.path.join(REPO_ROOT, "wiki")
-    # Export full docs to get actual keys
-    data = cue_export(wiki_dir, "docs")
+def docs_keys(data):
+    """Registry keys of an exported wiki docs value."""
     if not data:
         return {}
     return {
@@ -54,33 +57,17 @@ def get_docs_keys():
     }
 
 
-def get_kb_keys():
-    """Export registry keys from .kb/ sources."""
-    kb = os.path.join(REPO_ROOT, ".kb")
+def kb_keys(kb):
+    """Registry keys from exported .kb/ packages (see KB_TARGETS)."""
     result = {}
-
-    # Modules, downstream, sites from .kb/ root
-    root = cue_export(kb)
+    root = kb.get("root")
     if root:
         result["modules"] = set(root.get("modules", {}).keys())
         result["downstream"] = set(root.get("downstream", {}).keys())
         result["sites"] = set(root.get("sites", {}).keys())
-
-    # Decisions from .kb/decisions/
-    dec = cue_export(os.path.join(kb, "decisions"))
-    if dec:
-        result["decisions"] = set(dec.keys())
-
-    # Patterns from .kb/patterns/
-    pat = cue_export(os.path.join(kb, "patterns"))
-    if pat:
-        result["patterns"] = set(pat.keys())
-
-    # Insights from .kb/insights/
-    ins = cue_export(os.path.join(kb, "insights"))
-    if ins:
-        result["insights"] = set(ins.keys())
-
+    for registry in ("decisions", "patterns", "insights"):
+        if kb.get(registry):
+            result[registry] = set(kb[registry].keys())
     return result
 
 
@@ -88,13 +75,19 @@ def report_drift(show_diff=False):
     """Compare .kb/ registries against wiki/docs_export.cue and report drift."""
     print("Syncing .kb/ registries → wiki/docs_export.cue\n")
 
-    stats = get_docs_stats()
+    # One evaluation of docs serves both the stats and, with --diff, the
+    # per-entry keys; all exports run concurrently.
+    targets = dict(KB_TARGETS)
+    targets["docs"] = Target(WIKI_DIR, "docs" if show_diff else "docs.stats")
+    exported = run_exports(targets)
+    docs = exported.pop("docs")
+    stats = docs.get("stats") if show_diff and docs else docs
     if not stats:
         print("ERROR: Could not export docs.stats from wiki/", file=sys.stderr)
         return 1
 
-    kb_keys = get_kb_keys()
-    docs_keys = get_docs_keys() if show_diff else {}
+    kb = kb_keys(exported)
+    docs_reg = docs_keys(docs) if show_diff else {}
 
     stat_map = {
         "modules":    ("total_modules",    ".kb/modules.cue"),
@@ -108,7 +101,7 @@ def report_drift(show_diff=False):
     drifted = False
     for registry, (stat_key, source) in stat_map.items():
         docs_count = stats.get(stat_key, 0)
-        kb_count = len(kb_keys.get(registry, set()))
+        kb_count = len(kb.get(registry, set()))
 
         if docs_count == kb_count:
             status = "OK"
@@ -118,9 +111,9 @@ def report_drift(show_diff=False):
 
         print(f"  {registry:12s}  docs={docs_count:3d}  kb={kb_count:3d}  [{status}]  ({source})")
 
-        if show_diff and registry in docs_keys and registry in kb_keys:
-            dk = docs_keys[registry]
-            kk = kb_keys[registry]
+        if show_diff and registry in docs_reg and registry in kb:
+            dk = docs_reg[registry]
+            kk = kb[registry]
             missing = kk - dk
             extra = dk - kk
             if missing:
@@ -197,32 +190,32 @@ def generate_block(registry_name, data, entry_indent=1):
 
 def generate_replacement():
     """Generate replacement CUE source blocks from .kb/ registries."""
-    kb = os.path.join(REPO_ROOT, ".kb")
+    kb = run_exports(KB_TARGETS)
     print("// Generated by wiki/sync_registries.py — do not edit manually\n")
 
     # Modules
-    root = cue_export(kb)
+    root = kb["root"]
     if root and "modules" in root:
         print("_modules: {")
         print(generate_block("modules", root["modules"]))
         print("}\n")
 
     # Decisions
-    dec = cue_export(os.path.join(kb, "decisions"))
+    dec = kb["decisions"]
     if dec:
         print("_decisions: {")
         print(generate_block("decisions", dec))
         print("}\n")
 
     # Patterns
-    pat = cue_export(os.path.join(kb, "patterns"))
+    pat = kb["patterns"]
     if pat:
         print("_patterns: {")
         print(generate_block("patterns", pat))
         print("}\n")
 
     # Insights
-    ins = cue_export(os.path.join(kb, "insights"))
+    ins = kb["insights"]
     if ins:
         print("_insights: {")
         print(generate_block("insights", ins))